@@ -0,0 +1,51 @@
+"""
+Measure ex_create_records throughput for increasing worker counts against
+a local stub server that answers every request after a fixed latency.
+
+    python benchmarks/bench_bulk.py [records] [latency_ms]
+"""
+import json
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stubserver import StubServer  # noqa: E402
+from libcloud.dns.base import Zone  # noqa: E402
+from libcloud_dnsimple_v2_driver import DNSimpleV2DNSDriver  # noqa: E402
+
+
+def latency_handler(latency):
+    def handler(method, path, headers, data):
+        time.sleep(latency)
+        record = dict(json.loads(data), id=1, zone_id="example.com", ttl=3600)
+        return 201, {"Content-Type": "application/json"}, json.dumps({"data": record}).encode("utf-8")
+
+    return handler
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 20) / 1000
+    warnings.simplefilter("ignore")
+    items = [{"name": "host{}".format(i), "type": "A", "data": "127.0.0.1"} for i in range(count)]
+
+    with StubServer(latency_handler(latency)) as server:
+        DNSimpleV2DNSDriver.host = server.host
+        for workers in (1, 2, 4, 8, 16, 32):
+            driver = DNSimpleV2DNSDriver("1", "token", bulk_workers=workers)
+            zone = Zone("example.com", "example.com", "master", 3600, driver)
+            start = time.perf_counter()
+            results = driver.ex_create_records(zone, items)
+            elapsed = time.perf_counter() - start
+            errors = sum(1 for result in results if result.error)
+            driver.connection.close()
+            print("workers={:<3} records={} errors={} total={:.3f}s throughput={:.1f}/s".format(
+                workers, count, errors, elapsed, count / elapsed,
+            ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Compare memory per record and construction time of regular and compact
+records built from the same decoded page.
+
+    python benchmarks/bench_compact.py [records]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_compression import large_page  # noqa: E402
+from libcloud_dnsimple_v2_driver import DNSimpleV2DNSDriver  # noqa: E402
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    data = large_page(size)["data"]
+    for compact in (False, True):
+        driver = DNSimpleV2DNSDriver("1", "token", compact=compact)
+        zone = driver._to_zone({"name": "example.com"})
+
+        elapsed = None
+        for _ in range(5):
+            start = time.perf_counter()
+            driver._to_records(data, zone)
+            elapsed = min(elapsed or float("inf"), time.perf_counter() - start)
+
+        tracemalloc.start()
+        records = driver._to_records(data, zone)
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        for record in records:
+            record.extra
+        extra = time.perf_counter() - start
+
+        print("compact={!s:<5} records={} bytes/record={} best_build={:.3f}s per_record={:.2f}us "
+              "first_extra_access={:.3f}s".format(
+                  compact, len(records), current // len(records), elapsed, elapsed / len(records) * 1e6, extra,
+              ))
+
+
+if __name__ == "__main__":
+    main()
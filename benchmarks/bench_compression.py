@@ -0,0 +1,77 @@
+"""
+Compare bytes on the wire and time to parsed records for a full page of
+records with and without response compression.
+
+    python benchmarks/bench_compression.py [requests]
+"""
+import gzip
+import json
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stubserver import StubServer  # noqa: E402
+from libcloud.dns.base import Zone  # noqa: E402
+from libcloud_dnsimple_v2_driver import DNSimpleV2DNSDriver  # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "libcloud_dnsimple_v2_driver", "fixtures")
+
+
+def large_page(size=100):
+    with open(os.path.join(FIXTURES, "list_records.json")) as f:
+        template = json.load(f)["data"][1]
+    data = [dict(template, id=i, name="host{}".format(i), content="192.0.2.{}".format(i % 255), type="A")
+            for i in range(size)]
+    return {
+        "data": data,
+        "pagination": {"current_page": 1, "per_page": size, "total_entries": size, "total_pages": 1},
+    }
+
+
+def page_handler(page):
+    body = json.dumps(page).encode("utf-8")
+    compressed = gzip.compress(body)
+
+    def handler(method, path, headers, data):
+        if "gzip" in headers.get("Accept-Encoding", ""):
+            return 200, {"Content-Type": "application/json", "Content-Encoding": "gzip"}, compressed
+        return 200, {"Content-Type": "application/json"}, body
+
+    return handler
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    warnings.simplefilter("ignore")
+    with StubServer(page_handler(large_page())) as server:
+        DNSimpleV2DNSDriver.host = server.host
+        for compress in (False, True):
+            driver = DNSimpleV2DNSDriver("1", "token", compress=compress)
+            zone = Zone("example.com", "example.com", "master", 3600, driver)
+            body = driver.connection.request("/v2/1/zones/example.com/records").read()
+            server.reset()
+
+            start = time.perf_counter()
+            for _ in range(count):
+                records = driver.list_records(zone)
+            elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(count):
+                driver._to_records(json.loads(body).get("data"), zone)
+            parse = time.perf_counter() - start
+            driver.connection.close()
+
+            print("compress={!s:<5} records/page={} bytes/page={} total={:.3f}s per_page={:.2f}ms "
+                  "parse_per_page={:.2f}ms".format(
+                      compress, len(records), server.bytes_sent // count, elapsed, elapsed / count * 1000,
+                      parse / count * 1000,
+                  ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Compare reading the records of every zone zone by zone with the
+concurrent ex_iterate_all_records crawl at several worker counts.
+
+    python benchmarks/bench_crawl.py [zones] [records per zone] [latency ms]
+"""
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mockapi import MockDNSimpleAPI  # noqa: E402
+from benchmarks.stubserver import StubServer  # noqa: E402
+from libcloud_dnsimple_v2_driver import DNSimpleV2DNSDriver  # noqa: E402
+
+
+def serial(driver):
+    return sum(1 for zone in driver.iterate_zones() for _ in driver.iterate_records(zone))
+
+
+def crawl(workers):
+    def operation(driver):
+        return sum(1 for _ in driver.ex_iterate_all_records(max_workers=workers))
+
+    return operation
+
+
+def main():
+    zones = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    records = int(sys.argv[2]) if len(sys.argv) > 2 else 250
+    latency = float(sys.argv[3]) if len(sys.argv) > 3 else 20
+    warnings.simplefilter("ignore")
+
+    api = MockDNSimpleAPI(zones=zones, records_per_zone=records, latency=latency / 1000)
+    scenarios = [("serial", serial)] + [("crawl workers={}".format(n), crawl(n)) for n in (1, 4, 16)]
+    with StubServer(api) as server:
+        DNSimpleV2DNSDriver.host = server.host
+        for name, operation in scenarios:
+            driver = DNSimpleV2DNSDriver("1", "token", pool_maxsize=16)
+            start = time.perf_counter()
+            count = operation(driver)
+            elapsed = time.perf_counter() - start
+            driver.connection.close()
+            print("{:<18} records={} {:.3f}s {:.0f}/s".format(name, count, elapsed, count / elapsed))
+
+
+if __name__ == "__main__":
+    main()
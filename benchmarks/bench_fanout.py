@@ -0,0 +1,58 @@
+"""
+Compare crawling several accounts one after another in this process with
+AccountFanOut at several process counts.
+
+    python benchmarks/bench_fanout.py [accounts] [zones] [records per zone]
+"""
+import multiprocessing
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mockapi import MockDNSimpleAPI  # noqa: E402
+from benchmarks.stubserver import StubServer  # noqa: E402
+from libcloud_dnsimple_v2_driver.dnsimple import DNSimpleV2DNSDriver  # noqa: E402
+from libcloud_dnsimple_v2_driver.fanout import AccountFanOut, RecordBatch  # noqa: E402
+
+
+def serial(accounts):
+    count = 0
+    for user_id, key in accounts:
+        driver = DNSimpleV2DNSDriver(user_id, key, rate_limit=False)
+        count += sum(1 for zone in driver.iterate_zones() for _ in driver.iterate_records(zone))
+        driver.connection.close()
+    return count
+
+
+def fanout(workers):
+    def operation(accounts):
+        executor = AccountFanOut(max_workers=workers, mp_context=multiprocessing.get_context("fork"),
+                                 rate_limit=False)
+        return sum(len(item.records) for item in executor.iterate_records(accounts) if isinstance(item, RecordBatch))
+
+    return operation
+
+
+def main():
+    accounts = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    zones = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    records = int(sys.argv[3]) if len(sys.argv) > 3 else 2000
+    warnings.simplefilter("ignore")
+
+    # Every account sees the same zones of the mock API
+    api = MockDNSimpleAPI(zones=zones, records_per_zone=records)
+    scenarios = [("serial", serial)] + [("fanout workers={}".format(n), fanout(n)) for n in (1, 2, 4)]
+    with StubServer(api) as server:
+        DNSimpleV2DNSDriver.host = server.host
+        for name, operation in scenarios:
+            start = time.perf_counter()
+            count = operation([(str(n), "token") for n in range(accounts)])
+            elapsed = time.perf_counter() - start
+            print("{:<20} records={} {:.3f}s {:.0f}/s".format(name, count, elapsed, count / elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Measure the import time of the package in fresh interpreters and list the
+heavy dependencies each step loads.
+
+    python benchmarks/bench_import.py [--runs 10] [--max-ms 20]
+
+With ``--max-ms`` the run exits with status 1 when importing the package
+takes longer than that, which catches imports made eager again.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ("libcloud", "requests", "urllib3", "asyncio", "aiohttp")
+
+STEPS = [
+    ("import package", "import libcloud_dnsimple_v2_driver"),
+    ("create driver", "import libcloud_dnsimple_v2_driver as p; p.DNSimpleV2DNSDriver('1', 'token')"),
+    ("create async driver", "import libcloud_dnsimple_v2_driver as p; p.AsyncDNSimpleV2DNSDriver('1', 'token')"),
+]
+
+_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+{}
+elapsed = time.perf_counter() - start
+print(elapsed, ",".join(m for m in {!r} if m in sys.modules))
+"""
+
+
+def measure(code, runs):
+    timings = []
+    loaded = ""
+    for _ in range(runs):
+        output = subprocess.check_output([sys.executable, "-c", _SCRIPT.format(code, HEAVY_MODULES)], cwd=ROOT)
+        elapsed, _, loaded = output.decode("utf-8").strip().partition(" ")
+        timings.append(float(elapsed))
+    timings.sort()
+    return timings[len(timings) // 2], loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="interpreters started per step, the median is kept")
+    parser.add_argument("--max-ms", type=float, default=None, help="budget for importing the package")
+    args = parser.parse_args()
+
+    results = {}
+    for name, code in STEPS:
+        elapsed, loaded = measure(code, args.runs)
+        results[name] = elapsed
+        print("{:<20} {:8.1f}ms  loaded: {}".format(name, elapsed * 1000, loaded or "-"))
+
+    if args.max_ms is not None and results["import package"] * 1000 > args.max_ms:
+        print("importing the package took longer than {}ms".format(args.max_ms))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
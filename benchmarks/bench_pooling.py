@@ -0,0 +1,72 @@
+"""
+Count TLS handshakes and wall time for a series of driver requests.
+
+Compares the pooled session owned by the connection with the previous
+behaviour of calling ``requests.request()`` for every request.
+
+    python benchmarks/bench_pooling.py [requests]
+"""
+import os
+import sys
+import time
+import warnings
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stubserver import StubServer, json_handler  # noqa: E402
+from libcloud_dnsimple_v2_driver import DNSimpleV2DNSDriver  # noqa: E402
+
+PAYLOAD = {
+    "data": {"id": 1, "name": "example.com", "account_id": 1, "state": "hosted"},
+}
+
+
+class UnpooledDriver(DNSimpleV2DNSDriver):
+    """
+    Driver whose connection opens a new HTTP connection for every request.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.connection._create_session = _one_shot_session
+
+
+class _OneShotSession(object):
+    def request(self, **kwargs):
+        return requests.request(**kwargs)
+
+    def close(self):
+        pass
+
+
+def _one_shot_session():
+    return _OneShotSession()
+
+
+def run(driver_cls, server, count):
+    driver_cls.host = server.host
+    driver = driver_cls("1", "token")
+    server.reset()
+    start = time.perf_counter()
+    for _ in range(count):
+        driver.get_zone("example.com")
+    elapsed = time.perf_counter() - start
+    driver.connection.close()
+    return server.connections, elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    warnings.simplefilter("ignore")
+    with StubServer(json_handler(PAYLOAD)) as server:
+        for label, driver_cls in (("unpooled", UnpooledDriver), ("pooled", DNSimpleV2DNSDriver)):
+            handshakes, elapsed = run(driver_cls, server, count)
+            print("{:<10} requests={} handshakes={} total={:.3f}s per_request={:.2f}ms".format(
+                label, count, handshakes, elapsed, elapsed / count * 1000,
+            ))
+
+
+if __name__ == "__main__":
+    main()
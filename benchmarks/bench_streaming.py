@@ -0,0 +1,59 @@
+"""
+Compare peak memory and time to the first record when iterating one large
+page of records, parsed whole or while it is being downloaded.
+
+    python benchmarks/bench_streaming.py [records]
+"""
+import json
+import os
+import sys
+import time
+import tracemalloc
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_compression import large_page, page_handler  # noqa: E402
+from benchmarks.stubserver import StubServer  # noqa: E402
+from libcloud.dns.base import Zone  # noqa: E402
+from libcloud_dnsimple_v2_driver import DNSimpleV2DNSDriver  # noqa: E402
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    warnings.simplefilter("ignore")
+    page = large_page(size)
+    body_size = len(json.dumps(page))
+    with StubServer(page_handler(page)) as server:
+        DNSimpleV2DNSDriver.host = server.host
+        for stream_pages in (False, True):
+            driver = DNSimpleV2DNSDriver("1", "token", stream_pages=stream_pages)
+            zone = Zone("example.com", "example.com", "master", 3600, driver)
+            # Open the pooled connection outside of the measurement
+            driver.connection.request("/v2/1/domains").read()
+
+            start = time.perf_counter()
+            first = None
+            count = 0
+            for _ in driver.iterate_records(zone):
+                if first is None:
+                    first = time.perf_counter() - start
+                count += 1
+            elapsed = time.perf_counter() - start
+
+            # Tracing slows allocations down, so memory is measured apart
+            tracemalloc.start()
+            for _ in driver.iterate_records(zone):
+                pass
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            driver.connection.close()
+
+            print("stream_pages={!s:<5} records={} body={:.1f}MB peak={:.1f}MB first_record={:.1f}ms "
+                  "total={:.3f}s".format(
+                      stream_pages, count, body_size / 1e6, peak / 1e6, first * 1000, elapsed,
+                  ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Benchmark the main driver operations against the mock DNSimple API and
+store the results, so runs of different versions can be compared.
+
+    python benchmarks/bench_suite.py --output before.json
+    python benchmarks/bench_suite.py --compare before.json
+
+Without ``--output`` results go to ``benchmarks/results/<label>.json``.
+With ``--compare`` the run exits with status 1 when the throughput of a
+scenario dropped by more than ``--threshold`` percent.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.mockapi import MockDNSimpleAPI  # noqa: E402
+from benchmarks.stubserver import StubServer  # noqa: E402
+from libcloud_dnsimple_v2_driver import DNSimpleV2DNSDriver  # noqa: E402
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+
+def measure(driver, operation):
+    """
+    Run ``operation(driver)``, which returns the number of items it
+    handled, and summarise throughput and request latencies.
+    """
+    latencies = []
+    driver.connection.add_hook(lambda event: latencies.append(event.latency))
+    start = time.perf_counter()
+    items = operation(driver)
+    seconds = time.perf_counter() - start
+    driver.connection.close()
+    return {
+        "items": items,
+        "requests": len(latencies),
+        "seconds": round(seconds, 4),
+        "throughput": round(items / seconds, 1),
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+def iterate_zones(driver):
+    return sum(1 for _ in driver.iterate_zones())
+
+
+def iterate_records(driver):
+    zone = driver.get_zone("zone0.example.com")
+    return sum(1 for _ in driver.iterate_records(zone))
+
+
+def get_record(lookups, records_per_zone):
+    def operation(driver):
+        # Record IDs are handed out zone after zone, starting at 1
+        for _ in range(lookups):
+            driver.get_record("zone0.example.com", str(random.randint(1, records_per_zone)))
+        return lookups
+
+    return operation
+
+
+def bulk_create(count):
+    def operation(driver):
+        zone = driver.get_zone("zone1.example.com")
+        items = [{"name": "bulk{}".format(i), "type": "A", "data": "192.0.2.1"} for i in range(count)]
+        results = driver.ex_create_records(zone, items)
+        return sum(1 for result in results if result.error is None)
+
+    return operation
+
+
+def run(args):
+    scenarios = [
+        ("iterate_zones", {}, iterate_zones),
+        ("iterate_records", {}, iterate_records),
+        ("iterate_records_prefetch", {"prefetch_workers": 8}, iterate_records),
+        ("get_record", {}, get_record(args.lookups, args.records)),
+        ("bulk_create", {}, bulk_create(args.creates)),
+    ]
+    api = MockDNSimpleAPI(zones=args.zones, records_per_zone=args.records, latency=args.latency / 1000,
+                          rate_limit=args.rate_limit, rate_limit_window=args.rate_limit_window)
+    results = {}
+    with StubServer(api, tls=not args.no_tls) as server:
+        DNSimpleV2DNSDriver.host = server.host
+        for name, options, operation in scenarios:
+            # Keep the fastest run to damp scheduling noise
+            runs = [
+                measure(DNSimpleV2DNSDriver("1", "token", secure=not args.no_tls, **options), operation)
+                for _ in range(args.repeat)
+            ]
+            results[name] = max(runs, key=lambda result: result["throughput"])
+    return {"meta": metadata(args, throttled=api.throttled), "results": results}
+
+
+def metadata(args, throttled):
+    try:
+        revision = subprocess.check_output(["git", "describe", "--always", "--dirty"], cwd=ROOT,
+                                           stderr=subprocess.DEVNULL).decode("utf-8").strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {
+        "label": args.label,
+        "revision": revision,
+        "python": platform.python_version(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {
+            "zones": args.zones, "records": args.records, "latency_ms": args.latency,
+            "rate_limit": args.rate_limit, "rate_limit_window": args.rate_limit_window,
+            "lookups": args.lookups, "creates": args.creates, "tls": not args.no_tls, "repeat": args.repeat,
+        },
+        "throttled": throttled,
+    }
+
+
+def compare(baseline, current, threshold):
+    """
+    Print the change of every scenario and return the names of those
+    whose throughput dropped by more than ``threshold`` percent.
+    """
+    regressions = []
+    print("{:<26} {:>12} {:>12} {:>8} {:>10} {:>10}".format(
+        "scenario", "base/s", "now/s", "change", "base p95", "now p95"))
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        change = (result["throughput"] - before["throughput"]) / before["throughput"] * 100
+        flag = ""
+        if change < -threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print("{:<26} {:>12.1f} {:>12.1f} {:>7.1f}% {:>8.2f}ms {:>8.2f}ms{}".format(
+            name, before["throughput"], result["throughput"], change, before["p95_ms"], result["p95_ms"], flag))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--zones", type=int, default=250)
+    parser.add_argument("--records", type=int, default=1000, help="records per zone")
+    parser.add_argument("--latency", type=float, default=5, help="server latency in ms")
+    parser.add_argument("--rate-limit", type=int, default=None, help="requests per rate limit window")
+    parser.add_argument("--rate-limit-window", type=float, default=3600, help="rate limit window in seconds")
+    parser.add_argument("--lookups", type=int, default=200, help="get_record calls")
+    parser.add_argument("--creates", type=int, default=200, help="records created in bulk")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per scenario, the fastest is kept")
+    parser.add_argument("--no-tls", action="store_true", help="serve plain HTTP")
+    parser.add_argument("--label", default=time.strftime("%Y%m%d-%H%M%S"))
+    parser.add_argument("--output", help="file to store the results in")
+    parser.add_argument("--compare", help="results of an earlier run")
+    parser.add_argument("--threshold", type=float, default=20, help="allowed throughput drop in percent")
+    args = parser.parse_args()
+    warnings.simplefilter("ignore")
+
+    current = run(args)
+    for name, result in current["results"].items():
+        print("{:<26} items={items:<6} requests={requests:<5} {seconds:.3f}s {throughput:.1f}/s "
+              "p50={p50_ms}ms p95={p95_ms}ms p99={p99_ms}ms".format(name, **result))
+
+    output = args.output or os.path.join(ROOT, "benchmarks", "results", "{}.json".format(args.label))
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(current, f, indent=2, sort_keys=True)
+    print("results written to {}".format(output))
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(baseline, current, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+In-memory stand-in for the DNSimple v2 domains, zones and records
+endpoints, to be served by :class:`benchmarks.stubserver.StubServer`.
+
+    api = MockDNSimpleAPI(zones=20, records_per_zone=500, latency=0.02, rate_limit=2400)
+    with StubServer(api) as server:
+        DNSimpleV2DNSDriver.host = server.host
+        ...
+"""
+import json
+import re
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+_ROUTES = [
+    (re.compile(r"^/v2/(?P<account>[^/]+)/domains$"), "domains"),
+    (re.compile(r"^/v2/(?P<account>[^/]+)/domains/(?P<zone>[^/]+)$"), "domain"),
+    (re.compile(r"^/v2/(?P<account>[^/]+)/zones/(?P<zone>[^/]+)/records$"), "records"),
+    (re.compile(r"^/v2/(?P<account>[^/]+)/zones/(?P<zone>[^/]+)/records/(?P<record>[^/]+)$"), "record"),
+]
+
+_TIMESTAMP = "2016-03-22T10:20:53Z"
+
+
+class MockDNSimpleAPI(object):
+    """
+    Handler for :class:`StubServer` serving generated zones and records.
+
+    Every response is delayed by ``latency`` seconds. With ``rate_limit``
+    set, responses carry ``X-RateLimit-*`` headers for a window of
+    ``rate_limit_window`` seconds and requests over the budget are
+    answered with ``429``.
+    """
+
+    def __init__(self, zones=10, records_per_zone=100, latency=0.0, rate_limit=None, rate_limit_window=3600,
+                 max_per_page=100):
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        self.max_per_page = max_per_page
+        self.throttled = 0
+        self._lock = threading.Lock()
+        self._window_start = time.time()
+        self._window_requests = 0
+        self._next_id = 1
+        self._zones = {}
+        self._records = {}
+        for zone_number in range(zones):
+            name = "zone{}.example.com".format(zone_number)
+            self._zones[name] = self._zone_data(zone_number + 1, name)
+            self._records[name] = {}
+            for record_number in range(records_per_zone):
+                self._add_record(name, {
+                    "name": "host{}".format(record_number),
+                    "type": "A",
+                    "content": "192.0.2.{}".format(record_number % 254 + 1),
+                })
+
+    def _zone_data(self, id, name):
+        return {
+            "id": id, "account_id": 1, "registrant_id": None, "name": name, "unicode_name": name,
+            "state": "hosted", "auto_renew": False, "private_whois": False, "expires_on": None,
+            "created_at": _TIMESTAMP, "updated_at": _TIMESTAMP,
+        }
+
+    def _add_record(self, zone, data):
+        record = {
+            "id": self._next_id, "zone_id": zone, "parent_id": None, "name": data.get("name", ""),
+            "content": data.get("content"), "ttl": data.get("ttl", 3600), "priority": data.get("priority"),
+            "type": data.get("type"), "regions": ["global"], "system_record": False,
+            "created_at": _TIMESTAMP, "updated_at": _TIMESTAMP,
+        }
+        self._records[zone][str(self._next_id)] = record
+        self._next_id += 1
+        return record
+
+    def __call__(self, method, path, headers, data):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            allowed, rate_headers = self._take_rate_limit()
+            if not allowed:
+                self.throttled += 1
+                return self._response(429, {"message": "Rate limit exceeded"}, rate_headers)
+            status, payload = self._dispatch(method, path, data)
+        return self._response(status, payload, rate_headers)
+
+    def _take_rate_limit(self):
+        """
+        Count a request against the budget, return whether it is allowed
+        and the rate limit headers for its response.
+        """
+        if self.rate_limit is None:
+            return True, None
+        now = time.time()
+        if now - self._window_start >= self.rate_limit_window:
+            self._window_start = now
+            self._window_requests = 0
+        allowed = self._window_requests < self.rate_limit
+        if allowed:
+            self._window_requests += 1
+        return allowed, {
+            "X-RateLimit-Limit": str(self.rate_limit),
+            "X-RateLimit-Remaining": str(self.rate_limit - self._window_requests),
+            "X-RateLimit-Reset": str(self._window_start + self.rate_limit_window),
+        }
+
+    def _response(self, status, payload, headers=None):
+        headers = dict(headers or {}, **{"Content-Type": "application/json"})
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        return status, headers, body
+
+    def _dispatch(self, method, path, data):
+        url = urlsplit(path)
+        query = dict((key, values[0]) for key, values in parse_qs(url.query).items())
+        for pattern, name in _ROUTES:
+            match = pattern.match(url.path)
+            if match is not None:
+                return getattr(self, "_{}_{}".format(method.lower(), name), self._not_found)(
+                    query=query, data=data, **match.groupdict())
+        return self._not_found()
+
+    def _not_found(self, **kwargs):
+        return 404, {"message": "Not found"}
+
+    def _page(self, items, query):
+        per_page = min(int(query.get("per_page", 30)), self.max_per_page)
+        page = int(query.get("page", 1))
+        total_pages = max((len(items) + per_page - 1) // per_page, 1)
+        return 200, {
+            "data": items[(page - 1) * per_page:page * per_page],
+            "pagination": {"current_page": page, "per_page": per_page, "total_entries": len(items),
+                           "total_pages": total_pages},
+        }
+
+    def _get_domains(self, query, data, account):
+        return self._page(list(self._zones.values()), query)
+
+    def _get_domain(self, query, data, account, zone):
+        if zone not in self._zones:
+            return self._not_found()
+        return 200, {"data": self._zones[zone]}
+
+    def _get_records(self, query, data, account, zone):
+        if zone not in self._records:
+            return self._not_found()
+        records = list(self._records[zone].values())
+        if "name" in query:
+            records = [record for record in records if record["name"] == query["name"]]
+        if "name_like" in query:
+            records = [record for record in records if query["name_like"] in record["name"]]
+        if "type" in query:
+            records = [record for record in records if record["type"] == query["type"]]
+        return self._page(records, query)
+
+    def _post_records(self, query, data, account, zone):
+        if zone not in self._records:
+            return self._not_found()
+        return 201, {"data": self._add_record(zone, json.loads(data))}
+
+    def _get_record(self, query, data, account, zone, record):
+        found = self._records.get(zone, {}).get(record)
+        if found is None:
+            return self._not_found()
+        return 200, {"data": found}
+
+    def _delete_record(self, query, data, account, zone, record):
+        if self._records.get(zone, {}).pop(record, None) is None:
+            return self._not_found()
+        return 204, None
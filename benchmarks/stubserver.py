@@ -0,0 +1,140 @@
+"""
+Local HTTP(S) stand-in used by the benchmarks.
+
+The server answers every request through a user supplied ``handler``
+callable and counts accepted connections, which for HTTPS equals the
+number of TLS handshakes clients had to perform.
+"""
+import json
+import os
+import shutil
+import ssl
+import subprocess
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def json_handler(payload):
+    """
+    Return a handler answering every request with ``payload`` as JSON.
+    """
+    body = json.dumps(payload).encode("utf-8")
+
+    def handler(method, path, headers, data):
+        return 200, {"Content-Type": "application/json"}, body
+
+    return handler
+
+
+def _self_signed_context(directory):
+    cert = os.path.join(directory, "cert.pem")
+    key = os.path.join(directory, "key.pem")
+    subprocess.check_call(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=127.0.0.1", "-keyout", key, "-out", cert],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    return context
+
+
+class _CountingServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address, handler_class, handler, context=None):
+        super().__init__(address, handler_class)
+        self.handler = handler
+        self.context = context
+        self.connections = 0
+        self.requests = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+
+    def get_request(self):
+        sock, address = super().get_request()
+        with self._lock:
+            self.connections += 1
+        if self.context is not None:
+            # handshake lazily in the handler thread, not the accept loop
+            sock = self.context.wrap_socket(sock, server_side=True, do_handshake_on_connect=False)
+        return sock, address
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _dispatch(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        data = self.rfile.read(length) if length else b""
+        with self.server._lock:
+            self.server.requests += 1
+        status, headers, body = self.server.handler(self.command, self.path, self.headers, data)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with self.server._lock:
+            self.server.bytes_sent += len(body)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _dispatch
+
+
+class StubServer(object):
+    """
+    Run ``handler`` behind a threaded HTTP server on a random local port.
+
+    ``handler(method, path, headers, data)`` returns a
+    ``(status, headers, body)`` tuple.
+    """
+
+    def __init__(self, handler, tls=True):
+        self._tmpdir = tempfile.mkdtemp() if tls else None
+        context = _self_signed_context(self._tmpdir) if tls else None
+        self.server = _CountingServer(("127.0.0.1", 0), _Handler, handler, context)
+        self.tls = tls
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def host(self):
+        return "127.0.0.1:{}".format(self.server.server_address[1])
+
+    @property
+    def connections(self):
+        return self.server.connections
+
+    @property
+    def requests(self):
+        return self.server.requests
+
+    @property
+    def bytes_sent(self):
+        """
+        Response body bytes written to the wire.
+        """
+        return self.server.bytes_sent
+
+    def reset(self):
+        with self.server._lock:
+            self.server.connections = 0
+            self.server.requests = 0
+            self.server.bytes_sent = 0
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+        if self._tmpdir:
+            shutil.rmtree(self._tmpdir, ignore_errors=True)
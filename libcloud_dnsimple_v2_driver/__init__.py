@@ -1,3 +1,33 @@
-from .dnsimple import DNSimpleV2DNSDriver
-from .dnsimple import DNSimpleV2DNSConnection
-from .dnsimple import DEFAULT_ZONE_TTL
+import importlib
+import importlib.util
+
+# Public names and the modules defining them. Modules are imported on
+# first access, so importing the package doesn't load libcloud, requests
+# or aiohttp.
+_EXPORTS = {
+    'DNSimpleV2DNSDriver': '.dnsimple',
+    'DNSimpleV2DNSConnection': '.dnsimple',
+    'DEFAULT_ZONE_TTL': '.dnsimple',
+    'AsyncDNSimpleV2DNSDriver': '.async_dnsimple',
+}
+
+__all__ = list(_EXPORTS)
+# aiohttp is optional, keep ``import *`` working without it
+if importlib.util.find_spec('aiohttp') is None:
+    __all__.remove('AsyncDNSimpleV2DNSDriver')
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+    try:
+        value = getattr(importlib.import_module(module, __name__), name)
+    except ImportError as error:  # aiohttp is not installed
+        raise AttributeError("module {!r} has no attribute {!r} ({})".format(__name__, name, error)) from error
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
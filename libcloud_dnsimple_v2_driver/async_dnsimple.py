@@ -0,0 +1,562 @@
+# Licensed to the Apache Software Foundation (ASF) under one or more
+# contributor license agreements.  See the NOTICE file distributed with
+# this work for additional information regarding copyright ownership.
+# The ASF licenses this file to You under the Apache License, Version 2.0
+# (the "License"); you may not use this file except in compliance with
+# the License.  You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+DNSimple v2 DNS Driver for asyncio
+"""
+
+import asyncio
+import time
+from collections import deque
+
+import aiohttp
+from libcloud.dns.base import Zone
+
+from libcloud_dnsimple_v2_driver.cache import ResponseCache
+from libcloud_dnsimple_v2_driver.connection import (
+    DEFAULT_POOL_IDLE_TIMEOUT,
+    DEFAULT_POOL_MAXSIZE,
+    DEFAULT_RESPONSE_CACHE_SIZE,
+    LibCloudResponse,
+)
+from libcloud_dnsimple_v2_driver.dnsimple import DEFAULT_ZONE_TTL, BaseDNSimpleV2DNSDriver, DNSimpleV2Error
+from libcloud_dnsimple_v2_driver.metrics import emit
+from libcloud_dnsimple_v2_driver.pagination import MAX_PAGE_SIZE
+from libcloud_dnsimple_v2_driver.ratelimit import RateLimiter
+from libcloud_dnsimple_v2_driver.retry import DEFAULT_BACKOFF, DEFAULT_MAX_RETRIES, DEFAULT_RETRY_DELAY, RetryPolicy
+from libcloud_dnsimple_v2_driver.singleflight import AsyncSingleFlight
+from libcloud_dnsimple_v2_driver.zonefile import parse_zone_file
+
+__all__ = [
+    'AsyncDNSimpleV2DNSDriver'
+]
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+DEFAULT_CONCURRENCY = 10
+
+
+class AsyncDNSimpleV2DNSConnection(object):
+    """
+    Non-blocking counterpart of :class:`DNSimpleV2DNSConnection` built on
+    a shared ``aiohttp`` connection pool.
+    """
+    user_id = None
+    key = None
+
+    def __init__(self, user_id, key, secure=True, host=None, port=None,
+                 url=None, timeout=None, proxy_url=None,
+                 backoff=None, retry_delay=None,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 pool_idle_timeout=DEFAULT_POOL_IDLE_TIMEOUT,
+                 concurrency=DEFAULT_CONCURRENCY,
+                 rate_limit=True,
+                 max_retries=DEFAULT_MAX_RETRIES,
+                 compress=True,
+                 response_cache_size=DEFAULT_RESPONSE_CACHE_SIZE,
+                 response_cache_ttl=None,
+                 coalesce=True):
+        """
+        :param pool_maxsize: Maximum number of connections kept open.
+        :type pool_maxsize: ``int``
+
+        :param pool_idle_timeout: Seconds an unused connection is kept alive.
+        :type pool_idle_timeout: ``float``
+
+        :param concurrency: Maximum number of requests in flight at once.
+        :type concurrency: ``int``
+
+        :param rate_limit: Pace requests by the ``X-RateLimit-*`` headers,
+                           see :class:`RateLimiter`.
+        :type rate_limit: ``bool``
+
+        :param max_retries: How many times idempotent requests are retried,
+                            see :class:`RetryPolicy`.
+        :type max_retries: ``int``
+
+        :param compress: Ask for compressed responses, which aiohttp
+                         decodes transparently.
+        :type compress: ``bool``
+
+        :param response_cache_size: Number of ``GET`` responses kept for
+                                    conditional requests, see
+                                    :class:`ResponseCache`. ``0``, the
+                                    default, disables the cache.
+        :type response_cache_size: ``int``
+
+        :param response_cache_ttl: Seconds a cached response is kept.
+        :type response_cache_ttl: ``float``
+
+        :param coalesce: Let concurrent identical ``GET`` requests share one
+                         HTTP request, see :class:`AsyncSingleFlight`.
+        :type coalesce: ``bool``
+        """
+        self.timeout = timeout
+        self.user_id = user_id
+        self.key = key
+        self.host = "{}://{}".format("https" if secure else "http", host)
+        self.pool_maxsize = pool_maxsize
+        self.pool_idle_timeout = pool_idle_timeout
+        self.concurrency = concurrency
+        self.compress = compress
+        self._session = None
+        self._semaphore = None
+        self.rate_limiter = RateLimiter.for_account(self.host, key) if rate_limit else None
+        self.retry_policy = RetryPolicy(
+            max_retries=max_retries,
+            retry_delay=DEFAULT_RETRY_DELAY if retry_delay is None else retry_delay,
+            backoff=DEFAULT_BACKOFF if backoff is None else backoff,
+        )
+        self.response_cache = ResponseCache(maxsize=response_cache_size, ttl=response_cache_ttl)
+        self.single_flight = AsyncSingleFlight() if coalesce else None
+        self.hooks = []
+
+    def add_hook(self, hook):
+        """
+        Call ``hook`` with a :class:`RequestEvent` after every request, see
+        :meth:`LibCloudRequest.add_hook`.
+        """
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook):
+        self.hooks.remove(hook)
+
+    def connect(self):
+        pass
+
+    def _get_session(self):
+        # aiohttp sessions and semaphores have to be created inside the
+        # running event loop, so both are set up on first use
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.pool_maxsize,
+                keepalive_timeout=self.pool_idle_timeout,
+                ssl=False,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._session
+
+    async def request(self, action, params=None, data=None, headers=None,
+                      method='GET'):
+        if self.single_flight is not None and method.upper() == 'GET':
+            key = (action, frozenset((headers or {}).items()))
+            response = await self.single_flight.do(key, lambda: self._observed_request(action, data, headers, method))
+        else:
+            response = await self._observed_request(action, data, headers, method)
+
+        if response.status >= 400:
+            raise DNSimpleV2Error(response.object.get("message"), response.status, driver=self.driver)
+        return response
+
+    async def _observed_request(self, action, data, headers, method):
+        if not self.hooks:
+            response = await self._request(action, data, headers, method)
+        else:
+            start = time.perf_counter()
+            try:
+                response = await self._request(action, data, headers, method)
+            except Exception as error:
+                emit(self.hooks, method, action, start, time.perf_counter(), error=error)
+                raise
+            emit(self.hooks, method, action, start, time.perf_counter(), response)
+        return response
+
+    async def _request(self, action, data, headers, method):
+        if not headers:
+            headers = {}
+        self.add_default_headers(headers)
+        if not self.compress:
+            headers['Accept-Encoding'] = 'identity'
+        session = self._get_session()
+
+        url = "".join([self.host, action])
+        cacheable = method.upper() == 'GET'
+        cached = self.response_cache.validate(url, headers) if cacheable else None
+
+        attempt = 0
+        while True:
+            try:
+                async with self._semaphore:
+                    if self.rate_limiter is not None:
+                        await self.rate_limiter.acquire_async()
+                    async with session.request(method, url, data=data,
+                                               headers=headers) as response:
+                        body = await response.read()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if not self.retry_policy.can_retry(method, attempt):
+                    self.retry_policy.record(attempt, exhausted=attempt > 0)
+                    raise
+                delay = self.retry_policy.get_delay(attempt)
+            else:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.update(response.headers, response.status)
+                if not self.retry_policy.should_retry_status(response.status):
+                    self.retry_policy.record(attempt)
+                    break
+                if not self.retry_policy.can_retry(method, attempt, response.status):
+                    self.retry_policy.record(attempt, exhausted=attempt > 0)
+                    break
+                delay = self.retry_policy.get_delay(attempt, response.headers.get("Retry-After"))
+            attempt += 1
+            await asyncio.sleep(delay)
+
+        if cached is not None and response.status == 304:
+            self.response_cache.record_not_modified()
+            return LibCloudResponse(cached.status, cached.headers, cached.body, retries=attempt, parsed=cached.object)
+        response = LibCloudResponse(response.status, response.headers, body, retries=attempt)
+        if cacheable:
+            self.response_cache.store(url, response)
+        return response
+
+    def add_default_headers(self, headers):
+        """
+        Add headers that are necessary for every request
+
+        This method adds ``token`` to the request.
+        """
+        headers['Authorization'] = 'Bearer {}'.format(self.key)
+        headers['Accept'] = 'application/json'
+        headers['Content-Type'] = 'application/json'
+        return headers
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class AsyncDNSimpleV2DNSDriver(BaseDNSimpleV2DNSDriver):
+    """
+    asyncio variant of :class:`DNSimpleV2DNSDriver`.
+
+    Iterators are async generators and every other method is a coroutine.
+    Zones and records are parsed by the same code as in the blocking
+    driver.
+
+        async with AsyncDNSimpleV2DNSDriver("AUTH_ID", "API_KEY") as driver:
+            async for zone in driver.iterate_zones():
+                ...
+    """
+    connectionCls = AsyncDNSimpleV2DNSConnection
+
+    connection_options = (
+        'pool_maxsize',
+        'pool_idle_timeout',
+        'concurrency',
+        'rate_limit',
+        'max_retries',
+        'compress',
+        'response_cache_size',
+        'response_cache_ttl',
+        'coalesce',
+    )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """
+        Close the connection pool.
+        """
+        await self.connection.close()
+
+    async def iterate_zones(self):
+        """
+        Return an async generator of zones.
+
+        :rtype: ``async generator`` of :class:`Zone`
+        """
+        async for page in self._iterate_pages('/v2/{}/domains'.format(self.connection.user_id)):
+            for zone in self._to_zones(page.get("data", [])):
+                yield zone
+
+    async def list_zones(self):
+        """
+        :return: ``list`` of :class:`Zone`
+        """
+        return [zone async for zone in self.iterate_zones()]
+
+    async def iterate_records(self, zone):
+        """
+        Return an async generator of records for the provided zone.
+
+        :param zone: Zone to list records for.
+        :type zone: :class:`Zone`
+
+        :rtype: ``async generator`` of :class:`Record`
+        """
+        records = self.record_cache.find(zone.id)
+        if records is not None:
+            for record in records:
+                yield record
+            return
+
+        listed = [] if self.record_cache.maxsize else None
+        # Writes made while the listing runs keep it from completing the zone
+        version = self.record_cache.version(zone.id)
+        path = '/v2/{}/zones/{}/records'.format(self.connection.user_id, zone.id)
+        async for page in self._iterate_pages(path):
+            for record in self._to_records(page.get("data"), zone):
+                if listed is not None:
+                    listed.append(record)
+                yield record
+        if listed is not None:
+            self.record_cache.set_zone(zone.id, listed, version)
+
+    async def list_records(self, zone):
+        """
+        :param zone: Zone to list records for.
+        :type zone: :class:`Zone`
+
+        :return: ``list`` of :class:`Record`
+        """
+        return [record async for record in self.iterate_records(zone)]
+
+    async def ex_iterate_records(self, zone, name=None, type=None, name_like=None):
+        """
+        Return an async generator of the records of a zone matching the
+        filters, see :meth:`DNSimpleV2DNSDriver.ex_iterate_records`.
+
+        :rtype: ``async generator`` of :class:`Record`
+        """
+        params = self._record_filters(name=name, type=type, name_like=name_like)
+        records = self.record_cache.find(zone.id, name=name, type=params.get('type'), name_like=name_like)
+        if records is not None:
+            for record in records:
+                yield record
+            return
+
+        path = '/v2/{}/zones/{}/records'.format(self.connection.user_id, zone.id)
+        async for page in self._iterate_pages(path, params):
+            for record in self._to_records(page.get("data"), zone):
+                self.record_cache.set(record)
+                yield record
+
+    async def ex_export_zone_file(self, zone):
+        """
+        Return the whole zone in BIND format, see
+        :meth:`DNSimpleV2DNSDriver.ex_export_zone_file`.
+
+        :rtype: ``str``
+        """
+        response = await self.connection.request('/v2/{}/zones/{}/file'.format(self.connection.user_id, zone.id))
+        return response.object.get("data", {}).get("zone", "")
+
+    async def ex_iterate_records_from_zone_file(self, zone):
+        """
+        Return an async generator of the records of a zone read from its
+        zone file, see
+        :meth:`DNSimpleV2DNSDriver.ex_iterate_records_from_zone_file`.
+
+        :rtype: ``async generator`` of :class:`Record`
+        """
+        for item in parse_zone_file(await self.ex_export_zone_file(zone), zone.domain):
+            yield self._to_record(item, zone=zone)
+
+    async def _iterate_pages(self, path, params=None):
+        """
+        Yield the decoded body of every page of a paginated endpoint.
+
+        Once the first page tells how many pages there are, the remaining
+        ones are requested concurrently and yielded in page order.
+        """
+        per_page = self._get_page_size(path)
+        page = await self._get_page(path, 1, params, per_page)
+        yield page
+
+        pagination = page.get("pagination")
+        if pagination["current_page"] >= pagination["total_pages"]:
+            return
+
+        page_numbers = iter(range(pagination["current_page"] + 1, pagination["total_pages"] + 1))
+        window = self.connection.concurrency * 2
+        pending = deque()
+
+        try:
+            for page_number in page_numbers:
+                pending.append(asyncio.ensure_future(self._get_page(path, page_number, params, per_page)))
+                if len(pending) >= window:
+                    break
+
+            while pending:
+                page = await pending.popleft()
+
+                for page_number in page_numbers:
+                    pending.append(asyncio.ensure_future(self._get_page(path, page_number, params, per_page)))
+                    break
+
+                yield page
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _get_page(self, path, page_number, params=None, per_page=MAX_PAGE_SIZE):
+        start = time.perf_counter()
+        response = await self.connection.request(self._page_url(path, page_number, params, per_page))
+        self._observe_page(path, response.object, time.perf_counter() - start, len(response.body or b""))
+        return response.object
+
+    async def get_zone(self, zone_id):
+        """
+        Return a Zone instance.
+
+        :param zone_id: ID of the required zone
+        :type  zone_id: ``str``
+
+        :rtype: :class:`Zone`
+        """
+        if self.record_cache.maxsize:
+            zone = self.zone_cache.get(zone_id)
+            if zone is not None:
+                return zone
+        response = await self.connection.request('/v2/{}/domains/{}'.format(self.connection.user_id, zone_id))
+        return self._to_zone(response.object.get("data"))
+
+    async def get_record(self, zone_id, record_id):
+        """
+        Return a Record instance.
+
+        The record gets the cached zone, or else a zone built from
+        ``zone_id`` alone with an empty ``extra``, so a lookup costs a
+        single request. Use :meth:`get_zone` for the zone's metadata.
+
+        :param zone_id: ID of the required zone
+        :type  zone_id: ``str``
+
+        :param record_id: ID of the required record
+        :type  record_id: ``str``
+
+        :rtype: :class:`Record`
+        """
+        record = self.record_cache.get(zone_id, record_id)
+        if record is not None:
+            return record
+        response = await self.connection.request('/v2/{}/zones/{}/records/{}'.format(
+            self.connection.user_id,
+            zone_id,
+            record_id,
+        ))
+        zone = self.zone_cache.get(zone_id)
+        if zone is None:
+            # A lazy zone would fetch its metadata with a blocking request
+            zone = Zone(id=zone_id, domain=zone_id, type='master', ttl=DEFAULT_ZONE_TTL, driver=self, extra={})
+        record = self._to_record(response.object.get("data"), zone=zone)
+        self.record_cache.set(record)
+        return record
+
+    async def create_zone(self, domain, type='master', ttl=None, extra=None):
+        """
+        Create a new zone, see :meth:`DNSimpleV2DNSDriver.create_zone`.
+
+        :rtype: :class:`Zone`
+        """
+        r_data = json.dumps({'name': domain})
+
+        response = await self.connection.request(
+            '/v2/{}/domains'.format(self.connection.user_id), method='POST', data=r_data)
+        return self._to_zone(response.object.get("data"))
+
+    async def create_record(self, name, zone, type, data, extra=None):
+        """
+        Create a new record, see :meth:`DNSimpleV2DNSDriver.create_record`.
+
+        :rtype: :class:`Record`
+        """
+        r_json = {
+            'name': name,
+            'type': type,
+            'content': data
+        }
+
+        if extra is not None:
+            r_json.update(extra)
+
+        response = await self.connection.request(
+            '/v2/{}/zones/{}/records'.format(
+                self.connection.user_id,
+                zone.id
+            ),
+            method='POST',
+            data=json.dumps(r_json),
+        )
+        record = self._to_record(response.object.get("data"), zone=zone)
+        self.record_cache.set(record)
+        return record
+
+    async def update_record(self, record, name, type, data, extra=None):
+        """
+        Update an existing record, see
+        :meth:`DNSimpleV2DNSDriver.update_record`.
+
+        :rtype: :class:`Record`
+        """
+        zone = record.zone
+
+        r_json = {
+            'name': name,
+            'content': data
+        }
+
+        if extra is not None:
+            r_json.update(extra)
+
+        response = await self.connection.request(
+            '/v2/{}/zones/{}/records/{}'.format(
+                self.connection.user_id,
+                zone.id,
+                record.id
+            ),
+            method='PUT',
+            data=json.dumps({'record': r_json}),
+        )
+        self.record_cache.discard(zone.id, record.id)
+        record = self._to_record(response.object.get("data"), zone=zone)
+        self.record_cache.set(record)
+        return record
+
+    async def delete_zone(self, zone):
+        """
+        Delete a zone and all of its records.
+
+        :rtype: ``bool``
+        """
+        await self.connection.request('/v2/{}/domains/{}'.format(self.connection.user_id, zone.id),
+                                      method='DELETE')
+        self.zone_cache.pop(zone.id)
+        self.record_cache.discard_zone(zone.id)
+        return True
+
+    async def delete_record(self, record):
+        """
+        Delete a record.
+
+        :rtype: ``bool``
+        """
+        await self.connection.request('/v2/{}/zones/{}/records/{}'.format(
+            self.connection.user_id,
+            record.zone.id,
+            record.id,
+        ), method='DELETE')
+        self.record_cache.discard(record.zone.id, record.id)
+        return True
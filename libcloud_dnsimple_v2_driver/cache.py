@@ -0,0 +1,320 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache(object):
+    """
+    Thread-safe mapping with least-recently-used eviction and an optional
+    time-to-live for its entries.
+
+    Lookups are counted in ``hits`` and ``misses``.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None):
+        """
+        :param maxsize: Maximum number of entries, ``0`` disables the cache.
+        :type maxsize: ``int``
+
+        :param ttl: Seconds an entry stays valid, ``None`` means forever.
+        :type ttl: ``float``
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[1] > self.ttl:
+                del self._data[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value):
+        if not self.maxsize:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    @property
+    def stats(self):
+        """
+        :rtype: ``dict`` with ``hits``, ``misses`` and ``size`` keys
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
+
+
+class ResponseCache(LRUCache):
+    """
+    LRU cache of ``GET`` responses which carry an ``ETag`` or a
+    ``Last-Modified`` header, keyed by URL.
+
+    A cached response is revalidated with ``If-None-Match`` and
+    ``If-Modified-Since`` and reused as long as the server answers
+    ``304 Not Modified``, which skips both the download and the parsing of
+    the body. ``hits`` counts conditional requests and ``not_modified``
+    how many of them returned ``304``.
+    """
+
+    def __init__(self, maxsize=256, ttl=None):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self.not_modified = 0
+
+    def validate(self, url, headers):
+        """
+        Return the cached response for ``url`` and add the conditional
+        headers for it to ``headers``.
+
+        :rtype: :class:`LibCloudResponse` or ``None``
+        """
+        if not self.maxsize:
+            return None
+        cached = self.get(url)
+        if cached is not None:
+            etag = cached.headers.get("ETag")
+            last_modified = cached.headers.get("Last-Modified")
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        return cached
+
+    def store(self, url, response):
+        """
+        Remember ``response`` if it can be revalidated later.
+        """
+        if response.status == 200 and (response.headers.get("ETag") or response.headers.get("Last-Modified")):
+            self.set(url, response)
+
+    def record_not_modified(self):
+        with self._lock:
+            self.not_modified += 1
+
+    @property
+    def stats(self):
+        """
+        :rtype: ``dict`` with ``hits``, ``misses``, ``size`` and
+                ``not_modified`` keys
+        """
+        stats = super().stats
+        stats["not_modified"] = self.not_modified
+        return stats
+
+
+class _ZoneRecords(object):
+    __slots__ = ('records', 'by_name_type', 'complete', 'created')
+
+    def __init__(self):
+        self.records = {}
+        self.by_name_type = {}
+        self.complete = False
+        self.created = time.monotonic()
+
+    def add(self, record):
+        record_id = str(record.id)
+        self.remove(record_id)
+        self.records[record_id] = record
+        self.by_name_type.setdefault((record.name, record.type), {})[record_id] = record
+
+    def remove(self, record_id):
+        record = self.records.pop(record_id, None)
+        if record is not None:
+            key = (record.name, record.type)
+            same = self.by_name_type[key]
+            del same[record_id]
+            if not same:
+                del self.by_name_type[key]
+
+
+class RecordCache(object):
+    """
+    Write-through cache of records, indexed by zone, record ID and
+    ``(name, type)``.
+
+    The driver stores the records it reads and the ones returned by
+    ``create_record`` and ``update_record``, and drops deleted records and
+    zones, so the cache stays correct after our own writes. Once all
+    records of a zone were listed, the zone is ``complete`` and listings
+    and filtered reads are answered from the cache.
+
+    Zones are evicted least recently used first, together with their
+    records, and expire ``ttl`` seconds after they were first cached, so
+    changes made by other clients show up eventually. Cached records are
+    shared between callers and must not be modified.
+
+    Every change to a zone bumps its :meth:`version`. A listing only
+    completes the zone when the version is still the one taken when the
+    listing started, so writes made while it ran are not lost.
+    """
+
+    def __init__(self, maxsize=0, ttl=None):
+        """
+        :param maxsize: Number of zones whose records are kept, ``0``
+                        disables the cache.
+        :type maxsize: ``int``
+
+        :param ttl: Seconds the records of a zone stay valid, ``None``
+                    means forever.
+        :type ttl: ``float``
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._zones = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def version(self, zone_id):
+        """
+        :rtype: ``int``
+        """
+        with self._lock:
+            return self._versions.get(zone_id, 0)
+
+    def _bump(self, zone_id):
+        self._versions[zone_id] = self._versions.get(zone_id, 0) + 1
+
+    def _get_zone(self, zone_id, create=False):
+        """
+        Return the entry of ``zone_id``, must be called with the lock held.
+        """
+        zone = self._zones.get(zone_id)
+        if zone is not None and self.ttl is not None and time.monotonic() - zone.created > self.ttl:
+            del self._zones[zone_id]
+            zone = None
+        if zone is None and create:
+            zone = self._zones[zone_id] = _ZoneRecords()
+            while len(self._zones) > self.maxsize:
+                self._zones.popitem(last=False)
+        if zone is not None:
+            self._zones.move_to_end(zone_id)
+        return zone
+
+    def _count(self, found):
+        if found is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return found
+
+    def get(self, zone_id, record_id):
+        """
+        :rtype: :class:`Record` or ``None``
+        """
+        if not self.maxsize:
+            return None
+        with self._lock:
+            zone = self._get_zone(zone_id)
+            return self._count(zone.records.get(str(record_id)) if zone is not None else None)
+
+    def find(self, zone_id, name=None, type=None, name_like=None):
+        """
+        Return the records of a complete zone matching the filters, with
+        the same meaning as the API filters, or ``None`` when the zone is
+        not complete.
+
+        :rtype: ``list`` of :class:`Record` or ``None``
+        """
+        if not self.maxsize:
+            return None
+        with self._lock:
+            zone = self._get_zone(zone_id)
+            if zone is None or not zone.complete:
+                return self._count(None)
+            if name is not None and type is not None:
+                records = list(zone.by_name_type.get((name, type), {}).values())
+            else:
+                records = [
+                    record for record in zone.records.values()
+                    if (name is None or record.name == name) and (type is None or record.type == type)
+                ]
+            if name_like is not None:
+                records = [record for record in records if name_like in (record.name or '')]
+            return self._count(records)
+
+    def set(self, record):
+        """
+        Add or replace ``record`` in the zone it belongs to.
+        """
+        if not self.maxsize:
+            return
+        with self._lock:
+            self._bump(record.zone.id)
+            self._get_zone(record.zone.id, create=True).add(record)
+
+    def set_zone(self, zone_id, records, version=None):
+        """
+        Replace the records of ``zone_id`` with a complete listing.
+
+        :param version: :meth:`version` of the zone when the listing
+                        started. The listing is dropped when the zone was
+                        changed since.
+        :type version: ``int``
+
+        :return: Whether the listing was stored.
+        :rtype: ``bool``
+        """
+        if not self.maxsize:
+            return False
+        with self._lock:
+            if version is not None and self._versions.get(zone_id, 0) != version:
+                return False
+            self._zones.pop(zone_id, None)
+            zone = self._get_zone(zone_id, create=True)
+            for record in records:
+                zone.add(record)
+            zone.complete = True
+            return True
+
+    def discard(self, zone_id, record_id):
+        with self._lock:
+            self._bump(zone_id)
+            zone = self._get_zone(zone_id)
+            if zone is not None:
+                zone.remove(str(record_id))
+
+    def discard_zone(self, zone_id):
+        with self._lock:
+            self._bump(zone_id)
+            self._zones.pop(zone_id, None)
+
+    def clear(self):
+        with self._lock:
+            for zone_id in self._versions:
+                self._bump(zone_id)
+            self._zones.clear()
+
+    @property
+    def stats(self):
+        """
+        :rtype: ``dict`` with ``hits``, ``misses``, ``zones`` and
+                ``records`` keys
+        """
+        with self._lock:
+            records = sum(len(zone.records) for zone in self._zones.values())
+            return {"hits": self.hits, "misses": self.misses, "zones": len(self._zones), "records": records}
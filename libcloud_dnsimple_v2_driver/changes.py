@@ -0,0 +1,244 @@
+import threading
+import weakref
+
+from libcloud.dns.base import Record
+
+DEFAULT_MAX_SIZE = 100
+DEFAULT_MAX_DELAY = 5.0
+
+CREATE = 'create'
+UPDATE = 'update'
+DELETE = 'delete'
+
+
+class _Change(object):
+    """
+    Pending operation on one record, the result of merging every change
+    queued for it since the last flush.
+    """
+    __slots__ = ('action', 'record', 'name', 'type', 'data', 'extra')
+
+    def __init__(self, action, record, name=None, type=None, data=None, extra=None):
+        self.action = action
+        self.record = record
+        self.name = name
+        self.type = type
+        self.data = data
+        self.extra = dict(extra or {})
+
+    def merge_update(self, name, data, extra):
+        self.name = name
+        self.data = data
+        self.extra.update(extra or {})
+
+
+class ChangeQueue(object):
+    """
+    Buffer of record changes which are merged per record and written in
+    bulk, see :meth:`DNSimpleV2DNSDriver.ex_change_queue`.
+
+    Consecutive updates of a record become one ``PUT`` with the last name
+    and data and the merged ``extra``, an update of a record queued for
+    creation changes what is created, a delete drops the updates queued
+    before it and a delete of a record queued for creation cancels both.
+
+    Changes are written once ``max_size`` records have pending changes,
+    ``max_delay`` seconds after the first change since the last flush, or
+    on :meth:`flush`. A flush deletes, then updates, then creates, with
+    the bulk methods of the driver. Without a ``callback``, the failed
+    writes of flushes started by size or time are returned by the next
+    :meth:`flush`.
+    """
+
+    def __init__(self, driver, max_size=DEFAULT_MAX_SIZE, max_delay=DEFAULT_MAX_DELAY, max_workers=None,
+                 callback=None):
+        """
+        :param driver: Driver the changes are written with.
+        :type driver: :class:`DNSimpleV2DNSDriver`
+
+        :param max_size: Number of records with pending changes which
+                         triggers a flush.
+        :type max_size: ``int``
+
+        :param max_delay: Seconds a change waits at most, ``None`` only
+                          flushes on size or explicitly.
+        :type max_delay: ``float``
+
+        :param max_workers: Concurrent requests of a flush, defaults to
+                            the driver's ``bulk_workers``.
+        :type max_workers: ``int``
+
+        :param callback: Called with the ``list`` of :class:`BulkResult`
+                         items of every flush, including the ones started
+                         by size or time.
+        :type callback: ``callable``
+        """
+        self.driver = driver
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self.max_workers = max_workers
+        self.callback = callback
+        self.stats = {"queued": 0, "merged": 0, "cancelled": 0, "writes": 0, "flushes": 0}
+        self._pending = {}
+        self._failures = []
+        # Placeholders whose creation failed, they have no ID to write to
+        self._failed = weakref.WeakSet()
+        self._timer = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def _key(self, record):
+        # Records queued for creation have no ID yet
+        if record.id is None:
+            return id(record)
+        return (record.zone.id, str(record.id))
+
+    def create_record(self, name, zone, type, data, extra=None):
+        """
+        Queue the creation of a record.
+
+        :return: Placeholder with ``id`` set to ``None``, which can be
+                 passed to :meth:`update_record` and :meth:`delete_record`.
+                 It gets the ``id`` of the created record once the queue
+                 is flushed, and is rejected if the creation failed.
+        :rtype: :class:`Record`
+        """
+        record = Record(id=None, name=name, type=type, data=data, zone=zone, driver=self.driver,
+                        extra=dict(extra or {}))
+        self._add(record, lambda change: None, lambda: _Change(CREATE, record, name, type, data, extra))
+        return record
+
+    def update_record(self, record, name, type, data, extra=None):
+        """
+        Queue an update of ``record``, see
+        :meth:`DNSimpleV2DNSDriver.update_record`.
+        """
+        def merge(change):
+            if change.action == DELETE:
+                raise ValueError('Record {} is queued for deletion'.format(record.id))
+            change.merge_update(name, data, extra)
+
+        self._add(record, merge, lambda: _Change(UPDATE, record, name, type, data, extra))
+
+    def delete_record(self, record):
+        """
+        Queue the deletion of ``record``.
+        """
+        def merge(change):
+            if change.action == CREATE:
+                return CREATE
+            change.action = DELETE
+
+        self._add(record, merge, lambda: _Change(DELETE, record))
+
+    def _add(self, record, merge, new):
+        """
+        Merge a change into the pending change of ``record`` or queue it
+        with ``new()``. ``merge`` returns ``CREATE`` when both cancel out.
+        """
+        if record.id is None and record in self._failed:
+            raise ValueError('Creation of record {} failed'.format(record.name))
+        key = self._key(record)
+        with self._lock:
+            self.stats["queued"] += 1
+            change = self._pending.get(key)
+            if change is None:
+                self._pending[key] = new()
+                if self._timer is None and self.max_delay is not None:
+                    self._timer = threading.Timer(self.max_delay, self._flush_later)
+                    self._timer.daemon = True
+                    self._timer.start()
+            elif merge(change) == CREATE:
+                del self._pending[key]
+                self.stats["cancelled"] += 2
+            else:
+                self.stats["merged"] += 1
+            full = len(self._pending) >= self.max_size
+        if full:
+            self._flush_later()
+
+    def flush(self):
+        """
+        Write all pending changes.
+
+        :return: Failed writes of earlier flushes started by size or time
+                 when there is no ``callback``, then the outcome of every
+                 write, deletes first, then updates and creates.
+        :rtype: ``list`` of :class:`BulkResult`
+        """
+        results = self._write()
+        with self._lock:
+            results = self._failures + results
+            self._failures = []
+        return results
+
+    def _flush_later(self):
+        # Nobody gets the results of this flush, keep the failures for flush()
+        results = self._write()
+        if self.callback is None:
+            with self._lock:
+                self._failures += [result for result in results if result.error is not None]
+
+    def _write(self):
+        with self._flush_lock:
+            with self._lock:
+                pending = list(self._pending.values())
+                self._pending.clear()
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            if not pending:
+                return []
+
+            deletes = [change.record for change in pending if change.action == DELETE]
+            updates = [
+                {"record": change.record, "name": change.name, "type": change.type, "data": change.data,
+                 "extra": change.extra or None}
+                for change in pending if change.action == UPDATE
+            ]
+            results = self.driver.ex_delete_records(deletes, max_workers=self.max_workers)
+            results += self.driver.ex_update_records(updates, max_workers=self.max_workers)
+            results += self._create_records(pending, max_workers=self.max_workers)
+            self.stats["writes"] += len(results)
+            self.stats["flushes"] += 1
+
+        if self.callback is not None:
+            self.callback(results)
+        return results
+
+    def _create_records(self, pending, max_workers):
+        results = []
+        by_zone = {}
+        for change in pending:
+            if change.action == CREATE:
+                by_zone.setdefault(change.record.zone.id, []).append(change)
+        for changes in by_zone.values():
+            items = [
+                {"name": change.name, "type": change.type, "data": change.data, "extra": change.extra or None}
+                for change in changes
+            ]
+            created = self.driver.ex_create_records(changes[0].record.zone, items, max_workers=max_workers)
+            for change, result in zip(changes, created):
+                # Let the placeholder stand for the created record
+                if result.error is None:
+                    change.record.id = result.result.id
+                    change.record.extra = result.result.extra
+                else:
+                    self._failed.add(change.record)
+            results += created
+        return results
+
+    def close(self):
+        """
+        Stop the timer and write all pending changes.
+        """
+        return self.flush()
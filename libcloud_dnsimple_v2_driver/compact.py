@@ -0,0 +1,116 @@
+from libcloud.dns.base import Record, Zone
+
+# Keys of ``extra``, in the order their values are kept in the compact objects
+ZONE_EXTRA_FIELDS = (
+    "id", "account_id", "registrant_id", "unicode_name", "state", "auto_renew",
+    "private_whois", "expires_on", "created_at", "updated_at",
+)
+RECORD_EXTRA_FIELDS = (
+    "zone_id", "parent_id", "ttl", "priority", "regions", "system_record",
+    "created_at", "updated_at",
+)
+
+
+class CompactZone(object):
+    """
+    Memory efficient stand-in for :class:`Zone`.
+
+    Attributes live in ``__slots__`` and the values of ``extra`` in a
+    tuple, which is turned into a ``dict`` the first time ``extra`` is
+    accessed. :meth:`to_zone` returns a regular :class:`Zone`.
+    """
+    __slots__ = ('id', 'domain', 'ttl', 'driver', '_extra')
+
+    # All zones are primary by design
+    type = 'master'
+
+    def __init__(self, data, ttl, driver):
+        """
+        :param data: Zone as returned by the API.
+        :type data: ``dict``
+        """
+        self.id = data.get('name')
+        self.domain = self.id
+        self.ttl = ttl
+        self.driver = driver
+        self._extra = tuple(map(data.get, ZONE_EXTRA_FIELDS))
+
+    @property
+    def extra(self):
+        if type(self._extra) is tuple:
+            self._extra = dict(zip(ZONE_EXTRA_FIELDS, self._extra))
+        return self._extra
+
+    def to_zone(self):
+        """
+        :rtype: :class:`Zone`
+        """
+        return Zone(id=self.id, domain=self.domain, type=self.type, ttl=self.ttl,
+                    driver=self.driver, extra=dict(self.extra))
+
+    def list_records(self):
+        return self.driver.list_records(zone=self)
+
+    def create_record(self, name, type, data, extra=None):
+        return self.driver.create_record(name=name, zone=self, type=type,
+                                         data=data, extra=extra)
+
+    def delete(self):
+        return self.driver.delete_zone(zone=self)
+
+    def __repr__(self):
+        return ('<CompactZone: domain=%s, ttl=%s, provider=%s ...>' %
+                (self.domain, self.ttl, self.driver.name))
+
+
+class CompactRecord(object):
+    """
+    Memory efficient stand-in for :class:`Record`.
+
+    Attributes live in ``__slots__`` and the values of ``extra`` in a
+    tuple, which is turned into a ``dict`` the first time ``extra`` is
+    accessed. :meth:`to_record` returns a regular :class:`Record`.
+    """
+    __slots__ = ('id', 'name', 'type', 'data', 'ttl', 'zone', 'driver', '_extra')
+
+    def __init__(self, data, zone, driver):
+        """
+        :param data: Record as returned by the API.
+        :type data: ``dict``
+        """
+        id = data.get('id')
+        self.id = str(id) if id else None
+        self.name = data.get('name')
+        self.type = data.get('type')
+        self.data = data.get('content')
+        self.ttl = data.get('ttl')
+        self.zone = zone
+        self.driver = driver
+        self._extra = tuple(map(data.get, RECORD_EXTRA_FIELDS))
+
+    @property
+    def extra(self):
+        if type(self._extra) is tuple:
+            self._extra = dict(zip(RECORD_EXTRA_FIELDS, self._extra))
+        return self._extra
+
+    def to_record(self):
+        """
+        :rtype: :class:`Record`
+        """
+        return Record(id=self.id, name=self.name, type=self.type, data=self.data, zone=self.zone,
+                      driver=self.driver, ttl=self.ttl, extra=dict(self.extra))
+
+    def update(self, name=None, type=None, data=None, extra=None):
+        return self.driver.update_record(record=self, name=name, type=type,
+                                         data=data, extra=extra)
+
+    def delete(self):
+        return self.driver.delete_record(record=self)
+
+    def __repr__(self):
+        zone = self.zone.domain if self.zone.domain else self.zone.id
+        return ('<CompactRecord: zone=%s, name=%s, type=%s, data=%s, provider=%s, '
+                'ttl=%s ...>' %
+                (zone, self.name, self.type, self.data,
+                 self.driver.name, self.ttl))
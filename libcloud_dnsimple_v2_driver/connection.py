@@ -1,66 +1,332 @@
-import requests
+import threading
+import time
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+from libcloud_dnsimple_v2_driver.cache import ResponseCache
+from libcloud_dnsimple_v2_driver.metrics import emit
+from libcloud_dnsimple_v2_driver.ratelimit import RateLimiter
+from libcloud_dnsimple_v2_driver.retry import DEFAULT_BACKOFF, DEFAULT_MAX_RETRIES, DEFAULT_RETRY_DELAY, RetryPolicy
+from libcloud_dnsimple_v2_driver.singleflight import SingleFlight
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+DEFAULT_POOL_IDLE_TIMEOUT = 60
+DEFAULT_RESPONSE_CACHE_SIZE = 0
+
+
+class LibCloudResponse(object):
+    """
+    Status, headers and decoded body of a single request.
+
+    Instances are not modified once created, so they can be passed between
+    threads freely. Coalesced ``GET`` requests share one instance.
+    """
+    __slots__ = ('_status', '_headers', '_body', '_object', '_retries', '_stream')
+
+    def __init__(self, status, headers, body=None, retries=0, stream=None, parsed=None):
+        """
+        :param body: Decoded response body, ``None`` for streamed responses.
+        :type body: ``bytes``
+
+        :param retries: Number of retries it took to get the response.
+        :type retries: ``int``
+
+        :param stream: Unread ``requests`` response of a ``raw`` request.
+        :type stream: :class:`requests.Response`
+
+        :param parsed: Already decoded ``body``, which is then not parsed
+                       again.
+        :type parsed: ``dict``
+        """
+        self._status = status
+        self._headers = headers
+        self._body = body
+        if parsed is not None:
+            self._object = parsed
+        else:
+            try:
+                self._object = json.loads(body) if body else {}
+            except ValueError:
+                if status < 400:
+                    raise
+                # Proxies and load balancers answer errors with HTML or text
+                if isinstance(body, bytes):
+                    body = body.decode('utf-8', 'replace')
+                self._object = {"message": body.strip()}
+        self._retries = retries
+        self._stream = stream
+
+    @property
+    def status(self):
+        return self._status
+
+    @property
+    def headers(self):
+        return self._headers
+
+    @property
+    def body(self):
+        return self._body
+
+    @property
+    def object(self):
+        return self._object
+
+    @property
+    def retries(self):
+        return self._retries
+
+    @property
+    def stream(self):
+        return self._stream
+
+    @property
+    def reason(self):
+        return None if self._status > 400 else self.read().decode("utf-8")
+
+    def getresponse(self):
+        return self
+
+    def getheaders(self):
+        # The body has already been decoded, so the encoding and the length
+        # of the compressed body no longer apply to it
+        headers = self._headers.copy()
+        if "content-encoding" in headers:
+            del headers["content-encoding"]
+            headers.pop("content-length", None)
+        return headers
+
+    def read(self):
+        if self._body is None and self._stream is not None:
+            return self._stream.content
+        return self._body or b""
+
+    def close(self):
+        # return connection back to pool
+        if self._stream is not None:
+            self._stream.close()
 
 
 class LibCloudRequest(object):
     host = None
-    response = None
-    object = {}
     user_id = ""
     key = ""
 
     def __init__(self, user_id, key, secure=True, host=None, port=None,
                  url=None, timeout=None, proxy_url=None,
-                 backoff=None, retry_delay=None):
+                 backoff=None, retry_delay=None,
+                 pool_connections=DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 pool_idle_timeout=DEFAULT_POOL_IDLE_TIMEOUT,
+                 rate_limit=True,
+                 max_retries=DEFAULT_MAX_RETRIES,
+                 compress=True,
+                 response_cache_size=DEFAULT_RESPONSE_CACHE_SIZE,
+                 response_cache_ttl=None,
+                 coalesce=True):
+        """
+        :param backoff: Factor the retry delay grows by on every retry.
+        :type backoff: ``float``
+
+        :param retry_delay: Upper bound of the first retry delay in seconds.
+        :type retry_delay: ``float``
+
+        :param pool_connections: Number of per-host connection pools to keep.
+        :type pool_connections: ``int``
+
+        :param pool_maxsize: Maximum number of connections kept open per host.
+        :type pool_maxsize: ``int``
+
+        :param pool_idle_timeout: Seconds after which an unused session is
+                                  dropped and its connections re-established
+                                  on the next request. ``None`` disables it.
+        :type pool_idle_timeout: ``float``
+
+        :param rate_limit: Pace requests by the ``X-RateLimit-*`` headers
+                           with a limiter shared by all connections using
+                           the same token.
+        :type rate_limit: ``bool``
+
+        :param max_retries: How many times idempotent requests are retried
+                            after connection errors and ``429``/``5xx``
+                            responses, see :class:`RetryPolicy`.
+        :type max_retries: ``int``
+
+        :param compress: Ask for gzip/deflate (and brotli, when the
+                         ``brotli`` package is installed) compressed
+                         responses. Bodies are decoded transparently.
+        :type compress: ``bool``
+
+        :param response_cache_size: Number of ``GET`` responses kept for
+                                    conditional requests, see
+                                    :class:`ResponseCache`. ``0``, the
+                                    default, disables the cache.
+        :type response_cache_size: ``int``
+
+        :param response_cache_ttl: Seconds a cached response is kept,
+                                   ``None`` keeps it until it is evicted.
+        :type response_cache_ttl: ``float``
+
+        :param coalesce: Let concurrent identical ``GET`` requests share one
+                         HTTP request and its response, see
+                         :class:`SingleFlight`.
+        :type coalesce: ``bool``
+        """
         self.timeout = timeout
         self.user_id = user_id
         self.key = key
         self.host = "{}://{}".format("https" if secure else "http", host)
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_idle_timeout = pool_idle_timeout
+        self.compress = compress
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._last_used = None
+        self.rate_limiter = RateLimiter.for_account(self.host, key) if rate_limit else None
+        self.retry_policy = RetryPolicy(
+            max_retries=max_retries,
+            retry_delay=DEFAULT_RETRY_DELAY if retry_delay is None else retry_delay,
+            backoff=DEFAULT_BACKOFF if backoff is None else backoff,
+        )
+        self.response_cache = ResponseCache(maxsize=response_cache_size, ttl=response_cache_ttl)
+        self.single_flight = SingleFlight() if coalesce else None
+        self.hooks = []
+
+    def add_hook(self, hook):
+        """
+        Call ``hook`` with a :class:`RequestEvent` after every request.
+
+        Hooks run in the thread which made the request and should return
+        quickly. Without hooks requests are not timed at all.
+
+        :type hook: ``callable``
+        """
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook):
+        self.hooks.remove(hook)
+
+    @property
+    def session(self):
+        """
+        Pooled ``requests.Session`` shared by every request made through
+        this connection. It is created on first use and re-created when it
+        has been idle for longer than ``pool_idle_timeout``.
+        """
+        with self._session_lock:
+            now = time.monotonic()
+            if self._session is not None and self.pool_idle_timeout is not None and \
+                    now - self._last_used > self.pool_idle_timeout:
+                self._session.close()
+                self._session = None
+            if self._session is None:
+                self._session = self._create_session()
+            self._last_used = now
+            return self._session
+
+    def _create_session(self):
+        # requests is only imported once the first request is made
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
 
     def request(self, action, params=None, data=None, headers=None,
                 method='GET', raw=False):
+        if self.single_flight is not None and method.upper() == 'GET' and not raw:
+            key = (action, frozenset((headers or {}).items()))
+            return self.single_flight.do(key, lambda: self._observed_request(action, data, headers, method, raw))
+        return self._observed_request(action, data, headers, method, raw)
+
+    def _observed_request(self, action, data, headers, method, raw):
+        if not self.hooks:
+            return self._request(action, data, headers, method, raw)
+
+        start = time.perf_counter()
+        try:
+            response = self._request(action, data, headers, method, raw)
+        except Exception as error:
+            emit(self.hooks, method, action, start, time.perf_counter(), error=error)
+            raise
+        emit(self.hooks, method, action, start, time.perf_counter(), response)
+        return response
+
+    def _request(self, action, data, headers, method, raw):
+        import requests
+        from urllib3.util.request import ACCEPT_ENCODING
+
         if not headers:
             headers = {}
 
-        headers["Accept-Encoding"] = "plain"
-
-        self.response = requests.request(
-            method=method.lower(),
-            url="".join([self.host, action]),
-            data=data,
-            headers=headers,
-            timeout=self.timeout,
-            verify=0,
-            allow_redirects=1,
-            stream=raw,
-        )
-        if self.response.text:
-            self.object = self.response.json()
-        else:
-            self.object = {}
-        return self
-
-    def getresponse(self):
-        return self
+        headers["Accept-Encoding"] = ACCEPT_ENCODING if self.compress else "identity"
 
-    def getheaders(self):  # pragma: no cover
-        if "content-encoding" in self.response.headers:
-            del self.response.headers["content-encoding"]
-        return self.response.headers
+        url = "".join([self.host, action])
+        cacheable = method.upper() == 'GET' and not raw
+        cached = self.response_cache.validate(url, headers) if cacheable else None
 
-    @property
-    def status(self):
-        return self.response.status_code
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                response = self.session.request(
+                    method=method.lower(),
+                    url=url,
+                    data=data,
+                    headers=headers,
+                    timeout=self.timeout,
+                    verify=0,
+                    allow_redirects=1,
+                    stream=raw,
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                if not self.retry_policy.can_retry(method, attempt):
+                    self.retry_policy.record(attempt, exhausted=attempt > 0)
+                    raise
+                delay = self.retry_policy.get_delay(attempt)
+            else:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.update(response.headers, response.status_code)
+                if not self.retry_policy.should_retry_status(response.status_code):
+                    self.retry_policy.record(attempt)
+                    break
+                if not self.retry_policy.can_retry(method, attempt, response.status_code):
+                    self.retry_policy.record(attempt, exhausted=attempt > 0)
+                    break
+                delay = self.retry_policy.get_delay(attempt, response.headers.get("Retry-After"))
+                response.close()
+            attempt += 1
+            time.sleep(delay)
 
-    @property
-    def reason(self):
-        return None if self.response.status_code > 400 else self.response.text
+        # Error bodies are short and needed for the error message
+        if raw and response.status_code < 400:
+            return LibCloudResponse(response.status_code, response.headers, retries=attempt, stream=response)
+        if cached is not None and response.status_code == 304:
+            self.response_cache.record_not_modified()
+            return LibCloudResponse(cached.status, cached.headers, cached.body, retries=attempt, parsed=cached.object)
+        response = LibCloudResponse(response.status_code, response.headers, response.content, retries=attempt)
+        if cacheable:
+            self.response_cache.store(url, response)
+        return response
 
     def connect(self):  # pragma: no cover
         pass
 
-    def read(self):
-        return self.response.content
-
-    def close(self):  # pragma: no cover
-        # return connection back to pool
-        self.response.close()
+    def close(self):
+        # shut the connection pool down
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
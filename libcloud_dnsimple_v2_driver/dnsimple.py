@@ -16,7 +16,21 @@
 DNSimple v2 DNS Driver
 """
 
-from libcloud_dnsimple_v2_driver.connection import LibCloudRequest
+import queue
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlencode
+
+from libcloud_dnsimple_v2_driver.cache import LRUCache, RecordCache
+from libcloud_dnsimple_v2_driver.changes import DEFAULT_MAX_DELAY, DEFAULT_MAX_SIZE, ChangeQueue
+from libcloud_dnsimple_v2_driver.compact import CompactRecord, CompactZone
+from libcloud_dnsimple_v2_driver.connection import DEFAULT_POOL_MAXSIZE, LibCloudRequest
+from libcloud_dnsimple_v2_driver.metrics import MetricsCollector, path_template
+from libcloud_dnsimple_v2_driver.pagination import DEFAULT_MAX_PAGE_BYTES, MAX_PAGE_SIZE, AdaptivePageSize
+from libcloud_dnsimple_v2_driver.streaming import DEFAULT_CHUNK_SIZE, StreamedPage
+from libcloud_dnsimple_v2_driver.zonefile import parse_zone_file
 
 __all__ = [
     'DNSimpleV2DNSDriver'
@@ -28,10 +42,35 @@ except ImportError:
     import json
 
 from libcloud.common.dnsimple import DNSimpleDNSResponse
+from libcloud.common.types import LibcloudError
 from libcloud.dns.types import RecordType
 from libcloud.dns.base import DNSDriver, Zone, Record
 
 DEFAULT_ZONE_TTL = 3600
+DEFAULT_ZONE_CACHE_SIZE = 1024
+DEFAULT_ZONE_CACHE_TTL = 300
+DEFAULT_BULK_WORKERS = 10
+
+# Outcome of one item of a bulk operation, ``error`` is the exception
+# raised for it or ``None`` when ``result`` is valid.
+BulkResult = namedtuple('BulkResult', ['item', 'result', 'error'])
+
+# Changes needed to bring a zone to its desired state, see
+# :meth:`DNSimpleV2DNSDriver.ex_sync_zone`.
+SyncPlan = namedtuple('SyncPlan', ['creates', 'updates', 'deletes'])
+
+# Put on the queue of a crawl by a worker which is done with its zone
+_ZONE_DONE = object()
+
+
+class DNSimpleV2Error(LibcloudError):
+    """
+    Error response returned by the DNSimple API.
+    """
+
+    def __init__(self, value, status, driver=None):
+        super().__init__(value, driver=driver)
+        self.status = status
 
 
 class DNSimpleV2DNSConnection(LibCloudRequest):
@@ -56,7 +95,10 @@ class DNSimpleV2DNSConnection(LibCloudRequest):
         if not headers:
             headers = {}
         self.add_default_headers(headers)
-        return super().request(action, params=params, data=data, headers=headers, method=method, raw=raw)
+        response = super().request(action, params=params, data=data, headers=headers, method=method, raw=raw)
+        if response.status >= 400:
+            raise DNSimpleV2Error(response.object.get("message"), response.status, driver=self.driver)
+        return response
 
     def add_default_headers(self, headers):
         """
@@ -70,14 +112,36 @@ class DNSimpleV2DNSConnection(LibCloudRequest):
         return headers
 
 
-class DNSimpleV2DNSDriver(DNSDriver):
+class DNSimpleV2LazyZone(Zone):
+    """
+    Zone known only by its name. Domain metadata in ``extra`` is fetched
+    from the API the first time it is accessed.
+    """
+
+    def __init__(self, id, driver):
+        super().__init__(id=id, domain=id, type='master', ttl=DEFAULT_ZONE_TTL, driver=driver)
+
+    @property
+    def extra(self):
+        if self._extra is None:
+            self._extra = self.driver.get_zone(self.id).extra
+        return self._extra
+
+    @extra.setter
+    def extra(self, value):
+        self._extra = value or None
+
+
+class BaseDNSimpleV2DNSDriver(DNSDriver):
+    """
+    Settings and response parsing shared by the blocking and the asyncio
+    drivers.
+    """
     type = "DNSimpleV2"
     name = 'DNSimpleV2'
     host = 'api.dnsimple.com'
     website = 'https://dnsimple.com/'
 
-    connectionCls = DNSimpleV2DNSConnection
-
     RECORD_TYPE_MAP = {
         RecordType.A: 'A',
         RecordType.AAAA: 'AAAA',
@@ -96,13 +160,244 @@ class DNSimpleV2DNSDriver(DNSDriver):
         RecordType.URL: 'URL'
     }
 
-    def __init__(self, key, secret=None, secure=True, **kwargs):
+    # Keyword arguments accepted by the driver and handed over to the
+    # connection class, see :class:`LibCloudRequest` for their meaning.
+    connection_options = (
+        'pool_connections',
+        'pool_maxsize',
+        'pool_idle_timeout',
+        'rate_limit',
+        'max_retries',
+        'compress',
+        'response_cache_size',
+        'response_cache_ttl',
+        'coalesce',
+    )
+
+    def __init__(self, key, secret=None, secure=True, zone_cache_size=DEFAULT_ZONE_CACHE_SIZE,
+                 zone_cache_ttl=DEFAULT_ZONE_CACHE_TTL, compact=False, metrics=False, page_size=MAX_PAGE_SIZE,
+                 max_page_bytes=DEFAULT_MAX_PAGE_BYTES, record_cache_size=0,
+                 record_cache_ttl=DEFAULT_ZONE_CACHE_TTL, **kwargs):
+        """
+        :param zone_cache_size: Number of zones remembered for record
+                                lookups, ``0`` disables the cache.
+        :type zone_cache_size: ``int``
+
+        :param zone_cache_ttl: Seconds a cached zone stays valid.
+        :type zone_cache_ttl: ``float``
+
+        :param compact: Return :class:`CompactZone` and
+                        :class:`CompactRecord` objects, which need less
+                        memory than regular zones and records.
+        :type compact: ``bool``
+
+        :param metrics: Collect per endpoint request metrics, see
+                        :meth:`ex_get_metrics`.
+        :type metrics: ``bool``
+
+        :param page_size: Items per page of the paginated endpoints, at
+                          most 100. ``"auto"`` picks the size of every
+                          endpoint from the latency and size of earlier
+                          pages, see :class:`AdaptivePageSize`.
+        :type page_size: ``int`` or ``str``
+
+        :param max_page_bytes: Upper bound of the page body size with
+                               ``page_size="auto"``.
+        :type max_page_bytes: ``int``
+
+        :param record_cache_size: Number of zones whose records are kept
+                                  in a :class:`RecordCache`, which serves
+                                  ``get_zone``, ``get_record`` and record
+                                  listings. ``0`` disables it.
+        :type record_cache_size: ``int``
+
+        :param record_cache_ttl: Seconds the cached records of a zone stay
+                                 valid.
+        :type record_cache_ttl: ``float``
+        """
+        if page_size == 'auto':
+            self.page_sizer = AdaptivePageSize(max_page_bytes=max_page_bytes)
+        elif isinstance(page_size, int) and 1 <= page_size <= MAX_PAGE_SIZE:
+            self.page_sizer = None
+        else:
+            raise ValueError('page_size must be "auto" or between 1 and {}'.format(MAX_PAGE_SIZE))
+        self.page_size = page_size
+        self.compact = compact
+        self.zone_cache = LRUCache(maxsize=zone_cache_size, ttl=zone_cache_ttl)
+        self.record_cache = RecordCache(maxsize=record_cache_size, ttl=record_cache_ttl)
+        self._connection_kwargs = {}
+        for option in self.connection_options:
+            if option in kwargs:
+                self._connection_kwargs[option] = kwargs.pop(option)
         super().__init__(key, secret, secure, self.host, 443, **kwargs)
+        self.metrics = None
+        if metrics:
+            self.metrics = MetricsCollector()
+            self.connection.add_hook(self.metrics)
+
+    def ex_get_metrics(self):
+        """
+        Return request counts, counts per status, bytes, retries and a
+        latency histogram for every endpoint used so far, keyed by
+        ``"<METHOD> <path template>"``. Empty unless the driver was created
+        with ``metrics=True``.
+
+        :rtype: ``dict``
+        """
+        return self.metrics.snapshot() if self.metrics is not None else {}
+
+    def _ex_connection_class_kwargs(self):
+        kwargs = super()._ex_connection_class_kwargs()
+        kwargs.update(self._connection_kwargs)
+        return kwargs
+
+    def _get_page_size(self, path):
+        """
+        Return the page size for the next iteration of ``path``. It stays
+        the same for all pages of an iteration, so page numbers line up.
+        """
+        if self.page_sizer is None:
+            return self.page_size
+        return self.page_sizer.get(path_template(path))
+
+    def _observe_page(self, path, page, seconds, size):
+        if self.page_sizer is not None:
+            self.page_sizer.observe(path_template(path), len(page.get("data") or ()), seconds, size)
+
+    def _page_url(self, path, page_number, params=None, per_page=MAX_PAGE_SIZE):
+        query = 'per_page={}&page={}'.format(per_page, page_number)
+        if params:
+            query = '{}&{}'.format(query, urlencode(params))
+        return '{}?{}'.format(path, query)
+
+    def _record_filters(self, name=None, type=None, name_like=None):
+        """
+        Return query parameters for the server-side record filters.
+        """
+        params = {}
+        if name is not None:
+            params['name'] = name
+        if name_like is not None:
+            params['name_like'] = name_like
+        if type is not None:
+            if type not in self.RECORD_TYPE_MAP:
+                raise LibcloudError('Unsupported record type: {}'.format(type), driver=self)
+            params['type'] = self.RECORD_TYPE_MAP[type]
+        return params
+
+    def _to_zones(self, data):
+        zones = []
+        for zone in data:
+            _zone = self._to_zone(zone)
+            zones.append(_zone)
+
+        return zones
+
+    def _to_zone(self, data):
+        if self.compact:
+            zone = CompactZone(data, ttl=DEFAULT_ZONE_TTL, driver=self)
+            self.zone_cache.set(zone.id, zone)
+            return zone
+
+        id = data.get('name')
+        name = data.get('name')
+        extra = {
+            "id": data.get("id"),
+            "account_id": data.get("account_id"),
+            "registrant_id": data.get("registrant_id"),
+            "unicode_name": data.get("unicode_name"),
+            "state": data.get("state"),
+            "auto_renew": data.get("auto_renew"),
+            "private_whois": data.get("private_whois"),
+            "expires_on": data.get("expires_on"),
+            "created_at": data.get("created_at"),
+            "updated_at": data.get("updated_at")
+        }
+
+        # All zones are primary by design
+        type = 'master'
+
+        zone = Zone(id=id, domain=name, type=type, ttl=DEFAULT_ZONE_TTL,
+                    driver=self, extra=extra)
+        # Remember every zone we see so records can be attached to it
+        # without another request
+        self.zone_cache.set(zone.id, zone)
+        return zone
+
+    def _get_record_zone(self, zone_id):
+        """
+        Return the cached zone, or a lazy one which fetches its metadata
+        only when ``extra`` is accessed.
+        """
+        zone = self.zone_cache.get(zone_id)
+        if zone is None:
+            zone = DNSimpleV2LazyZone(zone_id, driver=self)
+        return zone
+
+    def _to_records(self, data, zone):
+        records = []
+        for item in data:
+            record = self._to_record(item, zone=zone)
+            records.append(record)
+        return records
+
+    def _to_record(self, data, zone_id=None, zone=None):
+        if not zone:  # We need zone_id or zone
+            zone = self._get_record_zone(zone_id)
+        if self.compact:
+            return CompactRecord(data, zone=zone, driver=self)
+        id = data.get('id')
+        name = data.get('name')
+        type = data.get('type')
+        content = data.get('content')
+        extra = {
+            "zone_id": data.get("zone_id"),
+            "parent_id": data.get("parent_id"),
+            "ttl": data.get("ttl"),
+            "priority": data.get("priority"),
+            "regions": data.get("regions"),
+            "system_record": data.get("system_record"),
+            "created_at": data.get("created_at"),
+            "updated_at": data.get("updated_at"),
+        }
+        return Record(id=id, name=name, type=type, data=content, zone=zone,
+                      driver=self, ttl=data.get('ttl', None), extra=extra)
+
 
-    # def _ex_connection_class_kwargs(self):
-    #     kwargs = super()._ex_connection_class_kwargs()
-    #     kwargs["port"] = 443
-    #     return kwargs
+class DNSimpleV2DNSDriver(BaseDNSimpleV2DNSDriver):
+    connectionCls = DNSimpleV2DNSConnection
+
+    def __init__(self, key, secret=None, secure=True, prefetch_workers=None,
+                 prefetch_ordered=True, bulk_workers=DEFAULT_BULK_WORKERS, stream_pages=False, **kwargs):
+        """
+        :param prefetch_workers: When set to more than one, paginated
+                                 iterators read ``total_pages`` from the
+                                 first page and fetch the remaining pages
+                                 concurrently with this many workers.
+        :type prefetch_workers: ``int``
+
+        :param prefetch_ordered: Yield prefetched pages in page order. When
+                                 ``False`` pages are yielded as they arrive.
+        :type prefetch_ordered: ``bool``
+
+        :param bulk_workers: Default number of concurrent requests made by
+                             the ``ex_*_records`` bulk methods.
+        :type bulk_workers: ``int``
+
+        :param stream_pages: Parse list pages while they are downloaded and
+                             yield every item as soon as it is complete,
+                             instead of reading the whole page first.
+                             Pages fetched by prefetch workers are still
+                             read whole.
+        :type stream_pages: ``bool``
+        """
+        self.stream_pages = stream_pages
+        self.prefetch_workers = prefetch_workers or 1
+        self.prefetch_ordered = prefetch_ordered
+        self.bulk_workers = bulk_workers
+        # Keep one pooled connection per worker
+        kwargs.setdefault('pool_maxsize', max(DEFAULT_POOL_MAXSIZE, self.prefetch_workers, self.bulk_workers))
+        super().__init__(key, secret, secure, **kwargs)
 
     def iterate_zones(self):
         """
@@ -110,21 +405,9 @@ class DNSimpleV2DNSDriver(DNSDriver):
 
         :return: ``list`` of :class:`Zone`
         """
-        page_number = 1
-
-        while True:
-            response = self.connection.request('/v2/{}/domains?per_page=100&page={}'.format(
-                    self.connection.user_id,
-                    page_number,
-                )
-            )
-            for zone in self._to_zones(response.object.get("data", [])):
-                yield zone
-
-            pagination = response.object.get("pagination")
-            page_number = pagination["current_page"] + 1
-            if pagination["current_page"] >= pagination["total_pages"]:
-                break
+        for page in self._iterate_pages('/v2/{}/domains'.format(self.connection.user_id)):
+            for item in page.get("data", []):
+                yield self._to_zone(item)
 
     def iterate_records(self, zone):
         """
@@ -135,24 +418,254 @@ class DNSimpleV2DNSDriver(DNSDriver):
 
         :return: ``list`` of :class:`Record`
         """
-        page_number = 1
+        records = self.record_cache.find(zone.id)
+        if records is not None:
+            for record in records:
+                yield record
+            return
+
+        # Keep the listing for the record cache, if there is one
+        listed = [] if self.record_cache.maxsize else None
+        # Writes made while the listing runs keep it from completing the zone
+        version = self.record_cache.version(zone.id)
+        path = '/v2/{}/zones/{}/records'.format(self.connection.user_id, zone.id)
+        for page in self._iterate_pages(path):
+            for item in page.get("data", []):
+                record = self._to_record(item, zone=zone)
+                if listed is not None:
+                    listed.append(record)
+                yield record
+        if listed is not None:
+            self.record_cache.set_zone(zone.id, listed, version)
+
+    def ex_iterate_records(self, zone, name=None, type=None, name_like=None):
+        """
+        Return a generator of the records of a zone matching the filters.
 
-        while True:
-            response = self.connection.request(
-                '/v2/{}/zones/{}/records?per_page=100&page={}'.format(
-                    self.connection.user_id,
-                    zone.id,
-                    page_number,
-                )
-            )
-            for record in self._to_records(response.object.get("data"), zone):
+        Filtering is done by the API, so only matching records are
+        transferred.
+
+        :param zone: Zone to list records for.
+        :type zone: :class:`Zone`
+
+        :param name: Exact record name, ``''`` for the zone apex.
+        :type name: ``str``
+
+        :param type: Record type.
+        :type type: :class:`RecordType`
+
+        :param name_like: Part of the record name.
+        :type name_like: ``str``
+
+        :rtype: ``generator`` of :class:`Record`
+        """
+        params = self._record_filters(name=name, type=type, name_like=name_like)
+        records = self.record_cache.find(zone.id, name=name, type=params.get('type'), name_like=name_like)
+        if records is not None:
+            for record in records:
                 yield record
+            return
+
+        path = '/v2/{}/zones/{}/records'.format(self.connection.user_id, zone.id)
+        for page in self._iterate_pages(path, params):
+            for item in page.get("data", []):
+                record = self._to_record(item, zone=zone)
+                self.record_cache.set(record)
+                yield record
+
+    def ex_export_zone_file(self, zone):
+        """
+        Return the whole zone in BIND format, fetched with one request.
+
+        :param zone: Zone to export.
+        :type zone: :class:`Zone`
+
+        :rtype: ``str``
+        """
+        response = self.connection.request('/v2/{}/zones/{}/file'.format(self.connection.user_id, zone.id))
+        return response.object.get("data", {}).get("zone", "")
+
+    def ex_iterate_records_from_zone_file(self, zone):
+        """
+        Return a generator of the records of a zone read from its zone
+        file, which takes a single request no matter how large the zone
+        is.
+
+        Zone files carry no record IDs, so the records have ``id`` set to
+        ``None`` and can't be updated or deleted. Use them for exports and
+        audits.
+
+        :param zone: Zone to list records for.
+        :type zone: :class:`Zone`
+
+        :rtype: ``generator`` of :class:`Record`
+        """
+        for item in parse_zone_file(self.ex_export_zone_file(zone), zone.domain):
+            yield self._to_record(item, zone=zone)
+
+    def ex_iterate_all_records(self, max_workers=None, group_by_zone=False, queue_size=None):
+        """
+        Return a generator of the records of every zone of the account.
+
+        Zones are crawled concurrently by ``max_workers`` threads, each
+        reading the pages of one zone at a time. Fetched pages wait in a
+        queue of ``queue_size`` pages; workers block while it is full, so
+        memory stays bounded however fast the API answers. Requests go
+        through the connection's rate limiter like any other.
+
+        Records of a zone are always yielded in page order. With
+        ``group_by_zone`` the records of every zone are yielded together,
+        zones in the order of :meth:`iterate_zones`, and every zone gets
+        its own queue so workers ahead of the consumer keep fetching.
+
+        :param max_workers: Number of zones crawled at once, defaults to
+                            ``bulk_workers``.
+        :type  max_workers: ``int``
+
+        :param group_by_zone: Don't interleave the records of zones.
+        :type  group_by_zone: ``bool``
+
+        :param queue_size: Pages buffered per queue, defaults to two per
+                           worker.
+        :type  queue_size: ``int``
+
+        :rtype: ``generator`` of :class:`Record`
+        """
+        max_workers = max_workers or self.bulk_workers
+        queue_size = queue_size or max_workers * 2
+        zones = list(self.iterate_zones())
+        if group_by_zone:
+            queues = [queue.Queue(maxsize=queue_size) for _ in zones]
+        else:
+            queues = [queue.Queue(maxsize=queue_size)] * len(zones)
+        stop = threading.Event()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self._crawl_zone, zone, output, stop) for zone, output in zip(zones, queues)]
+            try:
+                # Zone N is done once N queues have seen their end. With
+                # group_by_zone that is the queue of zone N, without it
+                # the shared queue.
+                done = 0
+                while done < len(zones):
+                    zone, items = queues[done].get()
+                    if items is _ZONE_DONE:
+                        done += 1
+                    elif isinstance(items, Exception):
+                        raise items
+                    else:
+                        for item in items:
+                            yield self._to_record(item, zone=zone)
+            finally:
+                stop.set()
+                for future in futures:
+                    future.cancel()
+
+    def _crawl_zone(self, zone, output, stop):
+        """
+        Put the records of every page of ``zone`` on ``output`` until done
+        or ``stop`` is set.
+        """
+        def put(item):
+            while not stop.is_set():
+                try:
+                    output.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        path = '/v2/{}/zones/{}/records'.format(self.connection.user_id, zone.id)
+        try:
+            for page in self._iterate_pages(path, prefetch=False):
+                if not put((zone, list(page.get("data", [])))):
+                    return
+        except Exception as error:
+            put((zone, error))
+            return
+        put((zone, _ZONE_DONE))
+
+    def _iterate_pages(self, path, params=None, prefetch=True):
+        """
+        Yield the decoded body of every page of a paginated endpoint.
+
+        :param path: Endpoint path without the pagination query.
+        :type path: ``str``
+
+        :param params: Additional query parameters.
+        :type params: ``dict``
+
+        :param prefetch: Use the prefetch workers, if any.
+        :type prefetch: ``bool``
+
+        :rtype: ``generator`` of ``dict`` or :class:`StreamedPage`
+        """
+        per_page = self._get_page_size(path)
+        page = self._get_page(path, 1, params, per_page, stream=self.stream_pages)
+        yield page
 
-            pagination = response.object.get("pagination")
-            page_number = pagination["current_page"] + 1
+        pagination = page.get("pagination")
+        if pagination["current_page"] >= pagination["total_pages"]:
+            return
+
+        if prefetch and self.prefetch_workers > 1:
+            for page in self._prefetch_pages(path, pagination["current_page"] + 1, pagination["total_pages"],
+                                             params, per_page):
+                yield page
+            return
+
+        while True:
+            page = self._get_page(path, pagination["current_page"] + 1, params, per_page, stream=self.stream_pages)
+            yield page
+
+            pagination = page.get("pagination")
             if pagination["current_page"] >= pagination["total_pages"]:
                 break
 
+    def _prefetch_pages(self, path, first_page, last_page, params=None, per_page=MAX_PAGE_SIZE):
+        """
+        Fetch pages ``first_page`` to ``last_page`` concurrently.
+
+        At most two pages per worker are in flight or buffered at any time,
+        so memory stays bounded no matter how many pages there are.
+        """
+        page_numbers = iter(range(first_page, last_page + 1))
+        window = self.prefetch_workers * 2
+        pending = deque()
+
+        with ThreadPoolExecutor(max_workers=self.prefetch_workers) as executor:
+            try:
+                for page_number in page_numbers:
+                    pending.append(executor.submit(self._get_page, path, page_number, params, per_page))
+                    if len(pending) >= window:
+                        break
+
+                while pending:
+                    if self.prefetch_ordered:
+                        future = pending.popleft()
+                    else:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        future = done.pop()
+                        pending.remove(future)
+                    page = future.result()
+
+                    for page_number in page_numbers:
+                        pending.append(executor.submit(self._get_page, path, page_number, params, per_page))
+                        break
+
+                    yield page
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _get_page(self, path, page_number, params=None, per_page=MAX_PAGE_SIZE, stream=False):
+        start = time.perf_counter()
+        response = self.connection.request(self._page_url(path, page_number, params, per_page), raw=stream)
+        if response.stream is not None:
+            return StreamedPage(response.stream.iter_content(DEFAULT_CHUNK_SIZE), on_close=response.close)
+        self._observe_page(path, response.object, time.perf_counter() - start, len(response.body or b""))
+        return response.object
+
     def get_zone(self, zone_id):
         """
         Return a Zone instance.
@@ -162,6 +675,10 @@ class DNSimpleV2DNSDriver(DNSDriver):
 
         :rtype: :class:`Zone`
         """
+        if self.record_cache.maxsize:
+            zone = self.zone_cache.get(zone_id)
+            if zone is not None:
+                return zone
         response = self.connection.request('/v2/{}/domains/{}'.format(self.connection.user_id, zone_id))
         zone = self._to_zone(response.object.get("data"))
         return zone
@@ -178,12 +695,16 @@ class DNSimpleV2DNSDriver(DNSDriver):
 
         :rtype: :class:`Record`
         """
+        record = self.record_cache.get(zone_id, record_id)
+        if record is not None:
+            return record
         response = self.connection.request('/v2/{}/zones/{}/records/{}'.format(
             self.connection.user_id,
             zone_id,
             record_id,
         ))
         record = self._to_record(response.object.get("data"), zone_id=zone_id)
+        self.record_cache.set(record)
         return record
 
     def create_zone(self, domain, type='master', ttl=None, extra=None):
@@ -263,6 +784,7 @@ class DNSimpleV2DNSDriver(DNSDriver):
             data=r_data,
         )
         record = self._to_record(response.object.get("data"), zone=zone)
+        self.record_cache.set(record)
         return record
 
     def update_record(self, record, name, type, data, extra=None):
@@ -310,7 +832,9 @@ class DNSimpleV2DNSDriver(DNSDriver):
             method='PUT',
             data=r_data,
         )
+        self.record_cache.discard(zone.id, record.id)
         record = self._to_record(response.object.get("data"), zone=zone)
+        self.record_cache.set(record)
         return record
 
     def delete_zone(self, zone):
@@ -325,6 +849,8 @@ class DNSimpleV2DNSDriver(DNSDriver):
         :rtype: ``bool``
         """
         self.connection.request('/v2/{}/domains/{}'.format(self.connection.user_id, zone.id), method='DELETE')
+        self.zone_cache.pop(zone.id)
+        self.record_cache.discard_zone(zone.id)
         return True
 
     def delete_record(self, record):
@@ -343,62 +869,177 @@ class DNSimpleV2DNSDriver(DNSDriver):
             zone_id,
             record.id,
         ), method='DELETE')
+        self.record_cache.discard(zone_id, record.id)
 
         return True
 
-    def _to_zones(self, data):
-        zones = []
-        for zone in data:
-            _zone = self._to_zone(zone)
-            zones.append(_zone)
+    def ex_create_records(self, zone, records, max_workers=None):
+        """
+        Create many records concurrently.
 
-        return zones
+        A failing record does not abort the batch, its error is returned
+        in place of the created record.
 
-    def _to_zone(self, data):
-        id = data.get('name')
-        name = data.get('name')
-        extra = {
-            "id": data.get("id"),
-            "account_id": data.get("account_id"),
-            "registrant_id": data.get("registrant_id"),
-            "unicode_name": data.get("unicode_name"),
-            "state": data.get("state"),
-            "auto_renew": data.get("auto_renew"),
-            "private_whois": data.get("private_whois"),
-            "expires_on": data.get("expires_on"),
-            "created_at": data.get("created_at"),
-            "updated_at": data.get("updated_at")
-        }
+        :param zone: Zone where the records are created.
+        :type  zone: :class:`Zone`
 
-        # All zones are primary by design
-        type = 'master'
+        :param records: ``dict`` items with ``name``, ``type``, ``data`` and
+                        optional ``extra`` keys, as taken by
+                        :meth:`create_record`.
+        :type  records: ``iterable`` of ``dict``
 
-        return Zone(id=id, domain=name, type=type, ttl=DEFAULT_ZONE_TTL,
-                    driver=self, extra=extra)
+        :param max_workers: Number of concurrent requests, defaults to
+                            ``bulk_workers``.
+        :type  max_workers: ``int``
 
-    def _to_records(self, data, zone):
-        records = []
-        for item in data:
-            record = self._to_record(item, zone=zone)
-            records.append(record)
-        return records
+        :rtype: ``list`` of :class:`BulkResult` in input order
+        """
+        return self._run_bulk(lambda item: self.create_record(zone=zone, **item), records, max_workers)
 
-    def _to_record(self, data, zone_id=None, zone=None):
-        if not zone:  # We need zone_id or zone
-            zone = self.get_zone(zone_id)
-        id = data.get('id')
-        name = data.get('name')
-        type = data.get('type')
-        content = data.get('content')
-        extra = {
-            "zone_id": data.get("zone_id"),
-            "parent_id": data.get("parent_id"),
-            "ttl": data.get("ttl"),
-            "priority": data.get("priority"),
-            "regions": data.get("regions"),
-            "system_record": data.get("system_record"),
-            "created_at": data.get("created_at"),
-            "updated_at": data.get("updated_at"),
-        }
-        return Record(id=id, name=name, type=type, data=content, zone=zone,
-                      driver=self, ttl=data.get('ttl', None), extra=extra)
+    def ex_update_records(self, updates, max_workers=None):
+        """
+        Update many records concurrently.
+
+        :param updates: ``dict`` items with ``record``, ``name``, ``type``,
+                        ``data`` and optional ``extra`` keys, as taken by
+                        :meth:`update_record`.
+        :type  updates: ``iterable`` of ``dict``
+
+        :param max_workers: Number of concurrent requests, defaults to
+                            ``bulk_workers``.
+        :type  max_workers: ``int``
+
+        :rtype: ``list`` of :class:`BulkResult` in input order
+        """
+        return self._run_bulk(lambda item: self.update_record(**item), updates, max_workers)
+
+    def ex_delete_records(self, records, max_workers=None):
+        """
+        Delete many records concurrently.
+
+        :param records: Records to delete.
+        :type  records: ``iterable`` of :class:`Record`
+
+        :param max_workers: Number of concurrent requests, defaults to
+                            ``bulk_workers``.
+        :type  max_workers: ``int``
+
+        :rtype: ``list`` of :class:`BulkResult` in input order
+        """
+        return self._run_bulk(self.delete_record, records, max_workers)
+
+    def ex_sync_zone(self, zone, desired_records, dry_run=False, max_workers=None):
+        """
+        Create, update and delete records so the zone holds exactly
+        ``desired_records``.
+
+        The current records are listed once and matched to the desired
+        ones by ``(name, type, data)``. Matches whose ``extra`` values
+        differ are updated. Left over records and desired records with the
+        same ``(name, type)`` are paired up into updates, everything else
+        is created or deleted. System records (SOA and the DNSimple name
+        servers) are never touched.
+
+        Deletes are applied first, then updates, then creates, each group
+        concurrently through the bulk methods.
+
+        :param zone: Zone to synchronise.
+        :type  zone: :class:`Zone`
+
+        :param desired_records: ``dict`` items with ``name``, ``type``,
+                                ``data`` and optional ``extra`` keys, as
+                                taken by :meth:`ex_create_records`.
+        :type  desired_records: ``iterable`` of ``dict``
+
+        :param dry_run: Only compute the changes.
+        :type  dry_run: ``bool``
+
+        :param max_workers: Number of concurrent requests, defaults to
+                            ``bulk_workers``.
+        :type  max_workers: ``int``
+
+        :return: The planned changes: ``dict`` items for
+                 :meth:`ex_create_records` and :meth:`ex_update_records`
+                 and the records to delete. Unless ``dry_run`` is set
+                 every change is wrapped in a :class:`BulkResult`.
+        :rtype: :class:`SyncPlan`
+        """
+        plan = self._plan_zone_sync(self.iterate_records(zone), desired_records)
+        if dry_run:
+            return plan
+
+        deletes = self.ex_delete_records(plan.deletes, max_workers=max_workers)
+        updates = self.ex_update_records(plan.updates, max_workers=max_workers)
+        creates = self.ex_create_records(zone, plan.creates, max_workers=max_workers)
+        return SyncPlan(creates, updates, deletes)
+
+    def ex_change_queue(self, max_size=DEFAULT_MAX_SIZE, max_delay=DEFAULT_MAX_DELAY, max_workers=None,
+                        callback=None):
+        """
+        Return a :class:`ChangeQueue` which buffers record creates,
+        updates and deletes, merges the ones made to the same record and
+        writes them in bulk once ``max_size`` records changed, after
+        ``max_delay`` seconds or on ``flush()``.
+
+            with driver.ex_change_queue() as changes:
+                changes.update_record(record, record.name, None, record.data, extra={"ttl": 60})
+                changes.update_record(record, record.name, None, "192.0.2.2")
+
+        :rtype: :class:`ChangeQueue`
+        """
+        return ChangeQueue(self, max_size=max_size, max_delay=max_delay, max_workers=max_workers,
+                           callback=callback)
+
+    def _plan_zone_sync(self, records, desired_records):
+        """
+        Diff current and desired records with hash indexes, in time linear
+        in their number.
+        """
+        current = {}
+        for record in records:
+            if record.extra.get('system_record'):
+                continue
+            current.setdefault((record.name, record.type, record.data), []).append(record)
+
+        updates = []
+        unmatched = []
+        for desired in desired_records:
+            matches = current.get((desired['name'], desired['type'], desired['data']))
+            if not matches:
+                unmatched.append(desired)
+                continue
+            record = matches.pop()
+            extra = desired.get('extra') or {}
+            if any(record.extra.get(key) != value for key, value in extra.items()):
+                updates.append(dict(desired, record=record))
+
+        left_over = {}
+        for matches in current.values():
+            for record in matches:
+                left_over.setdefault((record.name, record.type), []).append(record)
+
+        creates = []
+        for desired in unmatched:
+            records = left_over.get((desired['name'], desired['type']))
+            if records:
+                updates.append(dict(desired, record=records.pop()))
+            else:
+                creates.append(desired)
+
+        deletes = [record for records in left_over.values() for record in records]
+        return SyncPlan(creates, updates, deletes)
+
+    def _run_bulk(self, func, items, max_workers=None):
+        items = list(items)
+        if not items:
+            return []
+
+        results = []
+        with ThreadPoolExecutor(max_workers=max_workers or self.bulk_workers) as executor:
+            futures = [executor.submit(func, item) for item in items]
+            for item, future in zip(items, futures):
+                try:
+                    results.append(BulkResult(item, future.result(), None))
+                except Exception as error:
+                    results.append(BulkResult(item, None, error))
+        return results
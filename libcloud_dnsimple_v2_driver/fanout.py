@@ -0,0 +1,155 @@
+"""
+Crawl the records of many DNSimple accounts on a pool of processes.
+"""
+import multiprocessing
+import queue
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from libcloud_dnsimple_v2_driver.dnsimple import DNSimpleV2DNSDriver
+
+DEFAULT_QUEUE_SIZE = 64
+
+# Fields of the API record kept in every row of a RecordBatch
+RECORD_FIELDS = ('id', 'name', 'type', 'content', 'ttl', 'priority')
+
+# One page of records of a zone, ``records`` are tuples of RECORD_FIELDS
+RecordBatch = namedtuple('RecordBatch', ['account', 'zone', 'records'])
+
+# End of the crawl of an account, ``error`` is the message of the
+# exception which stopped it or ``None`` when all records were sent.
+AccountResult = namedtuple('AccountResult', ['account', 'zones', 'records', 'error'])
+
+# State of a pool process, set up by _init_worker
+_worker = {}
+
+
+def _init_worker(output, stop, driver_kwargs):
+    # Don't let a process wait at exit for pages nobody reads any more
+    output.cancel_join_thread()
+    _worker.update(output=output, stop=stop, driver_kwargs=driver_kwargs, drivers={})
+
+
+def _put(item):
+    while not _worker["stop"].is_set():
+        try:
+            _worker["output"].put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _crawl_account(index, user_id, key):
+    """
+    Send the records of every zone of an account to the output queue as
+    ``(index, zone, rows)`` items, followed by ``(index, None, (zones,
+    records, error))``.
+    """
+    zones = records = 0
+    error = None
+    try:
+        # Every process keeps one driver, and so one connection pool, per account
+        driver = _worker["drivers"].get((user_id, key))
+        if driver is None:
+            driver = _worker["drivers"][(user_id, key)] = DNSimpleV2DNSDriver(user_id, key, **_worker["driver_kwargs"])
+        for zone in driver.iterate_zones():
+            zones += 1
+            path = '/v2/{}/zones/{}/records'.format(driver.connection.user_id, zone.id)
+            for page in driver._iterate_pages(path):
+                rows = [tuple(map(item.get, RECORD_FIELDS)) for item in page.get("data", [])]
+                records += len(rows)
+                if not _put((index, zone.id, rows)):
+                    return
+    except Exception as exc:
+        error = '{}: {}'.format(type(exc).__name__, exc)
+    _put((index, None, (zones, records, error)))
+
+
+class AccountFanOut(object):
+    """
+    Crawl the records of many accounts on a pool of ``max_workers``
+    processes, so parsing the pages uses more than one core.
+
+    Every process crawls one account at a time with its own driver and
+    connection pool, so at most ``max_workers`` requests are in flight.
+    Pages come back as :class:`RecordBatch` items of plain tuples, which
+    are cheap to send between processes. They wait in a queue of
+    ``queue_size`` pages, and workers pause while it is full.
+
+    A failing account ends with an :class:`AccountResult` carrying the
+    error and doesn't affect the others.
+    """
+
+    def __init__(self, max_workers=None, queue_size=DEFAULT_QUEUE_SIZE, mp_context=None, **driver_kwargs):
+        """
+        :param max_workers: Number of processes, defaults to the number of
+                            CPUs.
+        :type max_workers: ``int``
+
+        :param queue_size: Pages buffered between the processes and the
+                           consumer.
+        :type queue_size: ``int``
+
+        :param mp_context: ``multiprocessing`` context to start the
+                           processes with.
+
+        :param driver_kwargs: Options of :class:`DNSimpleV2DNSDriver`.
+        """
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self.mp_context = mp_context
+        self.driver_kwargs = driver_kwargs
+
+    def iterate_records(self, accounts):
+        """
+        Crawl ``accounts``, a sequence of ``(user_id, key)`` pairs.
+
+        Yields a :class:`RecordBatch` for every page of records, and one
+        :class:`AccountResult` per account once it is finished. Batches of
+        different accounts are interleaved.
+
+        :rtype: ``generator`` of :class:`RecordBatch` and
+                :class:`AccountResult`
+        """
+        accounts = list(accounts)
+        if not accounts:
+            return
+        context = self.mp_context or multiprocessing.get_context()
+        output = context.Queue(maxsize=self.queue_size)
+        stop = context.Event()
+        pending = set(range(len(accounts)))
+
+        executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context, initializer=_init_worker,
+                                       initargs=(output, stop, self.driver_kwargs))
+        try:
+            futures = dict(
+                (executor.submit(_crawl_account, index, user_id, key), index)
+                for index, (user_id, key) in enumerate(accounts)
+            )
+            while pending:
+                try:
+                    index, zone, data = output.get(timeout=0.1)
+                except queue.Empty:
+                    # A process which died never reports its account
+                    for future, index in futures.items():
+                        if index in pending and future.done() and future.exception() is not None:
+                            pending.discard(index)
+                            error = '{}: {}'.format(type(future.exception()).__name__, future.exception())
+                            yield AccountResult(accounts[index][0], 0, 0, error)
+                    continue
+                if zone is None:
+                    pending.discard(index)
+                    yield AccountResult(accounts[index][0], *data)
+                else:
+                    yield RecordBatch(accounts[index][0], zone, data)
+        finally:
+            stop.set()
+            # Unblock workers which are still writing to the queue
+            while True:
+                try:
+                    output.get_nowait()
+                except queue.Empty:
+                    break
+            executor.shutdown(wait=True, cancel_futures=True)
+            output.close()
@@ -0,0 +1,140 @@
+import bisect
+import threading
+from collections import namedtuple
+
+# Upper bounds in seconds of the latency histogram buckets
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# One request as seen by the hooks of a connection. ``path`` is the path
+# template, e.g. ``/v2/{account}/zones/{zone}/records/{record}``,
+# ``latency`` is in seconds including retries, ``bytes`` the size of the
+# decoded body (``None`` for streamed responses) and ``error`` the
+# exception raised when no response was received.
+RequestEvent = namedtuple('RequestEvent', ['method', 'path', 'status', 'latency', 'bytes', 'retries', 'error'])
+
+# Placeholders for the path segment following each of these segments
+_PLACEHOLDERS = {
+    'v2': '{account}',
+    'domains': '{zone}',
+    'zones': '{zone}',
+    'records': '{record}',
+}
+
+
+def path_template(action):
+    """
+    Replace account, zone and record identifiers in a request path with
+    placeholders, so requests to the same endpoint can be grouped.
+
+    :rtype: ``str``
+    """
+    segments = action.split('?', 1)[0].split('/')
+    for index in range(1, len(segments)):
+        placeholder = _PLACEHOLDERS.get(segments[index - 1])
+        if placeholder is not None and segments[index]:
+            segments[index] = placeholder
+    return '/'.join(segments)
+
+
+class Histogram(object):
+    """
+    Cumulative histogram with fixed bucket bounds, as used by Prometheus.
+    """
+
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def to_dict(self):
+        """
+        :return: ``count``, ``sum`` and ``buckets``, a list of
+                 ``(upper bound, cumulative count)`` pairs ending with
+                 ``float("inf")``
+        :rtype: ``dict``
+        """
+        cumulative = []
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            cumulative.append((bound, total))
+        return {"count": total, "sum": self.sum, "buckets": cumulative}
+
+
+class MetricsCollector(object):
+    """
+    Connection hook which aggregates :class:`RequestEvent` items in memory
+    per method and path template: request and error counts, counts per
+    status, transferred bytes, retries and a latency :class:`Histogram`.
+    """
+
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS):
+        """
+        :param buckets: Upper bounds of the latency buckets in seconds.
+        :type buckets: ``tuple`` of ``float``
+        """
+        self.buckets = buckets
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        key = '{} {}'.format(event.method, event.path)
+        with self._lock:
+            endpoint = self._endpoints.get(key)
+            if endpoint is None:
+                endpoint = self._endpoints[key] = {
+                    "count": 0,
+                    "errors": 0,
+                    "statuses": {},
+                    "bytes": 0,
+                    "retries": 0,
+                    "latency": Histogram(self.buckets),
+                }
+            endpoint["count"] += 1
+            if event.error is not None or event.status >= 400:
+                endpoint["errors"] += 1
+            if event.status is not None:
+                endpoint["statuses"][event.status] = endpoint["statuses"].get(event.status, 0) + 1
+            endpoint["bytes"] += event.bytes or 0
+            endpoint["retries"] += event.retries or 0
+            endpoint["latency"].observe(event.latency)
+
+    def snapshot(self):
+        """
+        :return: Metrics keyed by ``"<METHOD> <path template>"``
+        :rtype: ``dict``
+        """
+        with self._lock:
+            return dict(
+                (key, dict(endpoint, statuses=dict(endpoint["statuses"]), latency=endpoint["latency"].to_dict()))
+                for key, endpoint in self._endpoints.items()
+            )
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+def emit(hooks, method, action, start, end, response=None, error=None):
+    """
+    Pass a :class:`RequestEvent` for a finished request to every hook.
+
+    :param start: ``time.perf_counter()`` when the request was started.
+    :param end: ``time.perf_counter()`` when it finished.
+    """
+    if response is None:
+        event = RequestEvent(method.upper(), path_template(action), None, end - start, None, None, error)
+    else:
+        size = None if response.stream is not None else len(response.body or b"")
+        event = RequestEvent(method.upper(), path_template(action), response.status, end - start, size,
+                             response.retries, None)
+    for hook in list(hooks):
+        hook(event)
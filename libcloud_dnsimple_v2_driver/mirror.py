@@ -0,0 +1,223 @@
+import sqlite3
+import threading
+import time
+
+try:
+    import simplejson as json
+except ImportError:
+    import json
+
+DEFAULT_MAX_STALENESS = 300
+DEFAULT_RECORDS_MAX_AGE = 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS zones (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    updated_at TEXT,
+    records_synced_at REAL
+);
+CREATE TABLE IF NOT EXISTS records (
+    zone_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (zone_id, id)
+);
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value REAL
+);
+"""
+
+
+def _zone_to_data(zone):
+    data = dict(zone.extra)
+    data["name"] = zone.domain
+    return data
+
+
+def _record_to_data(record):
+    data = dict(record.extra)
+    data.update(id=record.id, name=record.name, type=record.type, content=record.data)
+    return data
+
+
+class DNSimpleV2Mirror(object):
+    """
+    Local SQLite copy of all zones and records of an account.
+
+    Reads are answered from the database as long as the last refresh is
+    no older than ``max_staleness`` seconds, otherwise the mirror is
+    refreshed first. Refreshing lists the zones and re-downloads records
+    only for zones whose ``updated_at`` changed, or whose records are
+    older than ``records_max_age``.
+
+    ``max_staleness`` therefore bounds the lag of zones and of records of
+    zones whose ``updated_at`` changed. A record change which leaves the
+    zone's ``updated_at`` alone shows up after up to ``records_max_age``
+    seconds, set it to ``max_staleness`` to bound every read.
+
+    Zones and records are returned as regular :class:`Zone` and
+    :class:`Record` objects bound to ``driver``.
+    """
+
+    def __init__(self, driver, path=":memory:", max_staleness=DEFAULT_MAX_STALENESS,
+                 records_max_age=DEFAULT_RECORDS_MAX_AGE):
+        """
+        :param driver: Driver used to refresh the mirror.
+        :type driver: :class:`DNSimpleV2DNSDriver`
+
+        :param path: SQLite database file, kept between runs.
+        :type path: ``str``
+
+        :param max_staleness: Seconds the zone list, and records of zones
+                              whose ``updated_at`` changed, may lag behind
+                              the API.
+        :type max_staleness: ``float``
+
+        :param records_max_age: Seconds after which the records of a zone
+                                are re-downloaded even if the zone's
+                                ``updated_at`` did not change. ``None``
+                                only follows ``updated_at``.
+        :type records_max_age: ``float``
+        """
+        self.driver = driver
+        self.max_staleness = max_staleness
+        self.records_max_age = records_max_age
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._lock = threading.RLock()
+
+    def close(self):
+        self._db.close()
+
+    @property
+    def synced_at(self):
+        """
+        Time of the last refresh or ``None`` if the mirror is empty.
+        """
+        row = self._db.execute("SELECT value FROM state WHERE key = 'synced_at'").fetchone()
+        return row[0] if row else None
+
+    def refresh(self, force=False):
+        """
+        Bring the mirror up to date with the API.
+
+        :param force: Re-download the records of every zone.
+        :type force: ``bool``
+
+        :return: Number of zones listed, of zones whose records were
+                 downloaded and of records downloaded.
+        :rtype: ``dict``
+        """
+        stats = {"zones": 0, "zones_refreshed": 0, "records": 0}
+        with self._lock:
+            now = time.time()
+            known = dict(
+                (row[0], (row[1], row[2]))
+                for row in self._db.execute("SELECT id, updated_at, records_synced_at FROM zones")
+            )
+            seen = set()
+
+            for zone in self.driver.iterate_zones():
+                stats["zones"] += 1
+                seen.add(zone.id)
+                updated_at, records_synced_at = known.get(zone.id, (None, None))
+                stale = (
+                    force or
+                    records_synced_at is None or
+                    updated_at != zone.extra.get("updated_at") or
+                    (self.records_max_age is not None and now - records_synced_at > self.records_max_age)
+                )
+                if stale:
+                    stats["zones_refreshed"] += 1
+                    stats["records"] += self._store_records(zone)
+                    records_synced_at = now
+                self._db.execute(
+                    "INSERT OR REPLACE INTO zones (id, data, updated_at, records_synced_at) VALUES (?, ?, ?, ?)",
+                    (zone.id, json.dumps(_zone_to_data(zone)), zone.extra.get("updated_at"), records_synced_at),
+                )
+
+            for zone_id in set(known) - seen:
+                self._db.execute("DELETE FROM zones WHERE id = ?", (zone_id,))
+                self._db.execute("DELETE FROM records WHERE zone_id = ?", (zone_id,))
+
+            self._db.execute("INSERT OR REPLACE INTO state (key, value) VALUES ('synced_at', ?)", (now,))
+            self._db.commit()
+        return stats
+
+    def _store_records(self, zone):
+        rows = [
+            (zone.id, record.id, json.dumps(_record_to_data(record)))
+            for record in self.driver.iterate_records(zone)
+        ]
+        self._db.execute("DELETE FROM records WHERE zone_id = ?", (zone.id,))
+        self._db.executemany("INSERT INTO records (zone_id, id, data) VALUES (?, ?, ?)", rows)
+        return len(rows)
+
+    def _query(self, sql, params=()):
+        """
+        Run a read query, refreshing the mirror first when it is stale.
+        """
+        with self._lock:
+            self._refresh_if_stale()
+            return self._db.execute(sql, params).fetchall()
+
+    def _refresh_if_stale(self):
+        synced_at = self.synced_at
+        if synced_at is None or time.time() - synced_at > self.max_staleness:
+            self.refresh()
+
+    def list_zones(self):
+        """
+        :rtype: ``list`` of :class:`Zone`
+        """
+        rows = self._query("SELECT data FROM zones ORDER BY id")
+        return [self.driver._to_zone(json.loads(row[0])) for row in rows]
+
+    def get_zone(self, zone_id):
+        """
+        :rtype: :class:`Zone` or ``None`` when the zone is not mirrored
+        """
+        rows = self._query("SELECT data FROM zones WHERE id = ?", (zone_id,))
+        return self.driver._to_zone(json.loads(rows[0][0])) if rows else None
+
+    def list_records(self, zone):
+        """
+        :param zone: Zone to list records for.
+        :type zone: :class:`Zone`
+
+        :rtype: ``list`` of :class:`Record`
+        """
+        rows = self._query("SELECT data FROM records WHERE zone_id = ? ORDER BY rowid", (zone.id,))
+        return [self.driver._to_record(json.loads(row[0]), zone=zone) for row in rows]
+
+    def get_record(self, zone_id, record_id):
+        """
+        :rtype: :class:`Record` or ``None`` when the record is not mirrored
+        """
+        rows = self._query(
+            "SELECT zones.data, records.data FROM records JOIN zones ON zones.id = records.zone_id "
+            "WHERE records.zone_id = ? AND records.id = ?",
+            (zone_id, str(record_id)),
+        )
+        if not rows:
+            return None
+        zone = self.driver._to_zone(json.loads(rows[0][0]))
+        return self.driver._to_record(json.loads(rows[0][1]), zone=zone)
+
+    def list_all_records(self):
+        """
+        Return the records of every zone of the account.
+
+        :rtype: ``list`` of :class:`Record`
+        """
+        # One refresh at most, so zones and records come from the same one
+        with self._lock:
+            self._refresh_if_stale()
+            zones = dict(
+                (row[0], self.driver._to_zone(json.loads(row[1])))
+                for row in self._db.execute("SELECT id, data FROM zones")
+            )
+            rows = self._db.execute("SELECT zone_id, data FROM records ORDER BY zone_id, rowid").fetchall()
+        return [self.driver._to_record(json.loads(data), zone=zones[zone_id]) for zone_id, data in rows]
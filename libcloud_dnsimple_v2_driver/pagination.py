@@ -0,0 +1,87 @@
+import threading
+
+MIN_PAGE_SIZE = 10
+# Largest page the API returns
+MAX_PAGE_SIZE = 100
+DEFAULT_MAX_PAGE_BYTES = 512 * 1024
+# Share of the latency of a page which may be spent on the round trip
+TARGET_OVERHEAD = 0.1
+
+
+class AdaptivePageSize(object):
+    """
+    Page size for every paginated endpoint, derived from the latency and
+    size of the pages fetched from it before.
+
+    A page costs a round trip plus some time and memory per item. The
+    round trip is estimated from the fastest page seen and the cost per
+    item from the rest. Pages are made just large enough for the round
+    trip to take at most ``TARGET_OVERHEAD`` of their latency, but no
+    larger than what fits into ``max_page_bytes``.
+    """
+
+    def __init__(self, max_page_bytes=DEFAULT_MAX_PAGE_BYTES, initial=MAX_PAGE_SIZE, smoothing=0.3):
+        """
+        :param max_page_bytes: Upper bound of the size of a page body.
+        :type max_page_bytes: ``int``
+
+        :param initial: Page size used before anything was observed.
+        :type initial: ``int``
+
+        :param smoothing: Weight of a new observation in the moving
+                          averages.
+        :type smoothing: ``float``
+        """
+        self.max_page_bytes = max_page_bytes
+        self.initial = initial
+        self.smoothing = smoothing
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        :param key: Endpoint, e.g. the path template.
+        :type key: ``str``
+
+        :rtype: ``int``
+        """
+        with self._lock:
+            stats = self._endpoints.get(key)
+        if stats is None:
+            return self.initial
+
+        size = MAX_PAGE_SIZE
+        if stats["item_seconds"] > 0:
+            size = stats["round_trip"] * (1 - TARGET_OVERHEAD) / (TARGET_OVERHEAD * stats["item_seconds"])
+        if stats["item_bytes"] > 0:
+            size = min(size, self.max_page_bytes / stats["item_bytes"])
+        return int(max(MIN_PAGE_SIZE, min(size, MAX_PAGE_SIZE)))
+
+    def observe(self, key, items, seconds, size=None):
+        """
+        Record a fetched page.
+
+        :param items: Number of items on the page.
+        :type items: ``int``
+
+        :param seconds: Latency of the request.
+        :type seconds: ``float``
+
+        :param size: Body size in bytes, ``None`` when unknown.
+        :type size: ``int``
+        """
+        if not items:
+            return
+        with self._lock:
+            stats = self._endpoints.get(key)
+            if stats is None:
+                stats = self._endpoints[key] = {"round_trip": seconds, "item_seconds": 0.0, "item_bytes": 0.0}
+            stats["round_trip"] = min(stats["round_trip"], seconds)
+            stats["item_seconds"] = self._average(stats["item_seconds"], (seconds - stats["round_trip"]) / items)
+            if size is not None:
+                stats["item_bytes"] = self._average(stats["item_bytes"], size / items)
+
+    def _average(self, current, value):
+        if not current:
+            return value
+        return current + self.smoothing * (value - current)
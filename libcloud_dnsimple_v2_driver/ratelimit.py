@@ -0,0 +1,170 @@
+import hashlib
+import threading
+import time
+
+
+class RateLimiter(object):
+    """
+    Token bucket fed by DNSimple's ``X-RateLimit-*`` response headers.
+
+    The requests left in the current window are spread over the time left
+    until ``X-RateLimit-Reset``: the bucket refills at ``remaining / (reset
+    - now)`` tokens per second and holds at most ``burst`` of them, so a
+    bulk job is paced instead of spending the budget at once and then
+    waiting for the rest of the window. Once the budget is spent callers
+    wait until the reset, when the window starts over with the full
+    ``X-RateLimit-Limit`` budget. Until the first response with those
+    headers arrives the budget is unknown and requests are not delayed.
+
+    One limiter exists per API host and token, so all connections and
+    drivers using the same account share the budget.
+    """
+
+    _registry = {}
+    _registry_lock = threading.Lock()
+
+    # Seconds to wait when the budget is spent but the reset time is unknown
+    fallback_delay = 1.0
+
+    # Requests which may be sent back to back before pacing sets in
+    burst = 10
+
+    def __init__(self):
+        self.limit = None
+        self.remaining = None
+        self.reset = None
+        self.throttled = 0
+        self.wait_time = 0.0
+        self._tokens = None
+        self._refilled_at = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_account(cls, host, token):
+        """
+        Return the limiter shared by every connection to ``host`` using
+        ``token``.
+
+        :rtype: :class:`RateLimiter`
+        """
+        key = (host, hashlib.sha256((token or "").encode("utf-8")).hexdigest())
+        with cls._registry_lock:
+            limiter = cls._registry.get(key)
+            if limiter is None:
+                limiter = cls._registry[key] = cls()
+            return limiter
+
+    def acquire(self):
+        """
+        Take a token, sleeping until one is available.
+
+        :return: Seconds spent waiting.
+        :rtype: ``float``
+        """
+        waited = 0.0
+        delay = self._reserve()
+        while delay:
+            time.sleep(delay)
+            waited += delay
+            delay = self._reserve()
+        self._record_wait(waited)
+        return waited
+
+    async def acquire_async(self):
+        """
+        Coroutine version of :meth:`acquire` for asyncio connections.
+        """
+        import asyncio
+
+        waited = 0.0
+        delay = self._reserve()
+        while delay:
+            await asyncio.sleep(delay)
+            waited += delay
+            delay = self._reserve()
+        self._record_wait(waited)
+        return waited
+
+    def _reserve(self):
+        """
+        Take a token if there is one, otherwise return how long to wait
+        before trying again.
+        """
+        with self._lock:
+            now = time.time()
+            if self.reset is not None and now >= self.reset:
+                # The window is over, the next response tells us the new one
+                self.remaining = self.limit
+                self.reset = None
+            if self.remaining is None:
+                return 0
+            if self.remaining <= 0:
+                if self.reset is None:
+                    self.reset = now + self.fallback_delay
+                return self.reset - now
+            if self.reset is not None:
+                # Spread what is left of the budget over the rest of the window
+                rate = self.remaining / (self.reset - now)
+                if self._tokens is None:
+                    self._tokens = self.burst
+                else:
+                    self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * rate)
+                self._refilled_at = now
+                if self._tokens < 1:
+                    return (1 - self._tokens) / rate
+                self._tokens -= 1
+            self.remaining -= 1
+            return 0
+
+    def _record_wait(self, waited):
+        if waited:
+            with self._lock:
+                self.throttled += 1
+                self.wait_time += waited
+
+    def update(self, headers, status=None):
+        """
+        Refresh the budget from the headers of a response.
+
+        :param headers: Response headers.
+        :type headers: ``dict``
+
+        :param status: Response status, ``429`` empties the bucket.
+        :type status: ``int``
+        """
+        try:
+            limit = int(headers["X-RateLimit-Limit"])
+            remaining = int(headers["X-RateLimit-Remaining"])
+            reset = float(headers["X-RateLimit-Reset"])
+        except (KeyError, TypeError, ValueError):
+            if status == 429:
+                with self._lock:
+                    self.remaining = 0
+                    self.reset = None
+            return
+
+        with self._lock:
+            if self.reset is None or self.remaining is None or reset > self.reset:
+                # First response of a new window
+                self.remaining = remaining
+            else:
+                # Other requests may have taken tokens since this one was sent
+                self.remaining = min(self.remaining, remaining)
+            if status == 429:
+                self.remaining = 0
+            self.limit = limit
+            self.reset = reset
+
+    @property
+    def stats(self):
+        """
+        :rtype: ``dict`` with the current budget and the time spent waiting
+        """
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "remaining": self.remaining,
+                "reset": self.reset,
+                "throttled": self.throttled,
+                "wait_time": self.wait_time,
+            }
@@ -0,0 +1,99 @@
+import random
+import threading
+
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_RETRY_DELAY = 0.5
+DEFAULT_BACKOFF = 2
+
+# Only requests which can safely be sent twice are retried
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+
+class RetryPolicy(object):
+    """
+    Exponential backoff with full jitter for transient failures.
+
+    The n-th retry waits a random time between zero and
+    ``retry_delay * backoff ** n`` seconds, or longer when the server asks
+    for it with ``Retry-After``.
+    """
+
+    def __init__(self, max_retries=DEFAULT_MAX_RETRIES, retry_delay=DEFAULT_RETRY_DELAY,
+                 backoff=DEFAULT_BACKOFF):
+        """
+        :param max_retries: Retries after the first attempt, ``0`` disables
+                            retrying.
+        :type max_retries: ``int``
+
+        :param retry_delay: Upper bound of the first delay in seconds.
+        :type retry_delay: ``float``
+
+        :param backoff: Factor the delay bound grows by on every retry.
+        :type backoff: ``float``
+        """
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.backoff = backoff
+        self.retries = 0
+        self.retried_requests = 0
+        self.exhausted = 0
+        self._lock = threading.Lock()
+
+    def can_retry(self, method, attempt, status=None):
+        """
+        Return whether the ``attempt``-th retry (counting from zero) of a
+        ``method`` request is allowed.
+
+        :param status: Status of the failed response, ``None`` after a
+                       connection error or timeout.
+        :type status: ``int``
+        """
+        if attempt >= self.max_retries:
+            return False
+        # A rate limited request was rejected before it was processed
+        return status == 429 or method.upper() in IDEMPOTENT_METHODS
+
+    def should_retry_status(self, status):
+        return status in RETRY_STATUSES
+
+    def get_delay(self, attempt, retry_after=None):
+        """
+        Return seconds to wait before the ``attempt``-th retry.
+
+        :param retry_after: Value of the ``Retry-After`` response header.
+        :type retry_after: ``str``
+        """
+        delay = random.uniform(0, self.retry_delay * self.backoff ** attempt)
+        try:
+            delay = max(delay, float(retry_after))
+        except (TypeError, ValueError):
+            pass
+        return delay
+
+    def record(self, retries, exhausted=False):
+        """
+        Count the retries made for one request.
+        """
+        if not retries and not exhausted:
+            return
+        with self._lock:
+            self.retries += retries
+            if retries:
+                self.retried_requests += 1
+            if exhausted:
+                self.exhausted += 1
+
+    @property
+    def stats(self):
+        """
+        :rtype: ``dict`` with the total number of ``retries``, the number
+                of ``retried_requests`` and of requests which failed after
+                all retries were ``exhausted``
+        """
+        with self._lock:
+            return {
+                "retries": self.retries,
+                "retried_requests": self.retried_requests,
+                "exhausted": self.exhausted,
+            }
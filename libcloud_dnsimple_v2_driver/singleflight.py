@@ -0,0 +1,105 @@
+import threading
+
+
+class _Call(object):
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """
+    Run at most one call per key at a time. Threads asking for a key
+    which is already in flight wait for that call and get its result or
+    exception instead of making their own, which is counted in
+    ``coalesced``.
+
+    Results are shared, not copied, so callers must not modify them.
+    """
+
+    def __init__(self):
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        """
+        Return ``func()``, or the result of the call for ``key`` already
+        in flight.
+
+        :param key: Hashable identity of the call.
+        :param func: Callable without arguments.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    @property
+    def stats(self):
+        """
+        :rtype: ``dict`` with ``in_flight`` and ``coalesced`` keys
+        """
+        return {"in_flight": len(self._calls), "coalesced": self.coalesced}
+
+
+class AsyncSingleFlight(object):
+    """
+    :class:`SingleFlight` for coroutines of one event loop.
+    """
+
+    def __init__(self):
+        self.coalesced = 0
+        self._calls = {}
+
+    async def do(self, key, func):
+        """
+        Return ``await func()``, or the result of the call for ``key``
+        already in flight.
+
+        :param key: Hashable identity of the call.
+        :param func: Coroutine function without arguments.
+        """
+        import asyncio
+
+        future = self._calls.get(key)
+        if future is not None:
+            self.coalesced += 1
+            # Don't let a cancelled waiter cancel the shared call
+            return await asyncio.shield(future)
+
+        future = self._calls[key] = asyncio.ensure_future(func())
+        try:
+            return await asyncio.shield(future)
+        finally:
+            del self._calls[key]
+
+    @property
+    def stats(self):
+        """
+        :rtype: ``dict`` with ``in_flight`` and ``coalesced`` keys
+        """
+        return {"in_flight": len(self._calls), "coalesced": self.coalesced}
@@ -0,0 +1,149 @@
+import codecs
+import json
+import re
+
+DEFAULT_CHUNK_SIZE = 16 * 1024
+
+_WHITESPACE = re.compile(r"\s*")
+# Characters which can follow an element of the array
+_DELIMITERS = frozenset(",] \t\n\r")
+
+
+class StreamedPage(object):
+    """
+    Page of a list endpoint parsed while it is being downloaded.
+
+    ``get("data")`` returns a generator which yields the elements of the
+    ``data`` array as soon as each of them is complete, so neither the
+    whole body nor the whole decoded document is held in memory. The other
+    members of the document, such as ``pagination``, follow the array and
+    are available once it has been read; asking for them earlier reads
+    the rest of the array first.
+
+    Bodies which do not start with the array are parsed in one go.
+    """
+
+    def __init__(self, chunks, key="data", on_close=None):
+        """
+        :param chunks: Decoded response body.
+        :type chunks: ``iterable`` of ``bytes``
+
+        :param key: Name of the array member to stream.
+        :type key: ``str``
+
+        :param on_close: Called once, when the body has been read or the
+                         page is closed early.
+        :type on_close: ``callable``
+        """
+        self.key = key
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._on_close = on_close
+        self._prefix = '{"' + key + '":['
+        self._start = re.compile(r'\s*\{\s*"' + re.escape(key) + r'"\s*:\s*\[')
+        self._buffer = ""
+        self._eof = False
+        self._items = None
+        self._rest = None
+
+    def get(self, key, default=None):
+        if key == self.key:
+            if self._items is None:
+                self._items = self._iterate()
+            return self._items
+        if self._rest is None:
+            for _ in self.get(self.key):
+                pass
+            if self._rest is None:
+                raise ValueError("The page was closed before it was read")
+        return self._rest.get(key, default)
+
+    def close(self):
+        """
+        Stop reading the body and release the response.
+        """
+        if not self._eof:
+            self._eof = True
+            if self._on_close is not None:
+                self._on_close()
+
+    def _read(self):
+        """
+        Append the next chunk to the buffer, return ``False`` at the end.
+        """
+        for chunk in self._chunks:
+            self._buffer += self._decoder.decode(chunk)
+            return True
+        if not self._eof:
+            self._buffer += self._decoder.decode(b"", final=True)
+            self.close()
+        return False
+
+    def _iterate(self):
+        try:
+            for item in self._parse():
+                yield item
+        finally:
+            self.close()
+
+    def _parse(self):
+        decoder = json.JSONDecoder()
+
+        while True:
+            match = self._start.match(self._buffer)
+            if match is not None:
+                break
+            prefix = "".join(self._buffer[:256].split())
+            if not self._prefix.startswith(prefix) or not self._read():
+                break
+        if match is None:
+            while self._read():
+                pass
+            document = json.loads(self._buffer) if self._buffer.strip() else {}
+            self._buffer = ""
+            self._rest = document
+            for item in document.get(self.key) or []:
+                yield item
+            return
+
+        position = match.end()
+        while True:
+            position = _WHITESPACE.match(self._buffer, position).end()
+            if position == len(self._buffer):
+                self._buffer = ""
+                position = 0
+                if not self._read():
+                    raise ValueError("Unexpected end of JSON document")
+                continue
+
+            character = self._buffer[position]
+            if character == "]":
+                break
+            if character == ",":
+                position += 1
+                continue
+
+            try:
+                item, end = decoder.raw_decode(self._buffer, position)
+            except ValueError:
+                end = None
+            # An element is only known to be complete when a delimiter follows
+            # it, a prefix of a number split between chunks parses as well
+            if end is None or (not self._eof and (end == len(self._buffer) or
+                                                  self._buffer[end] not in _DELIMITERS)):
+                self._buffer = self._buffer[position:]
+                position = 0
+                if not self._read() and end is None:
+                    raise ValueError("Unexpected end of JSON document")
+                continue
+
+            position = end
+            yield item
+
+        rest = self._buffer[position + 1:]
+        self._buffer = ""
+        while self._read():
+            rest += self._buffer
+            self._buffer = ""
+        self._rest = json.loads('{"' + self.key + '": []' + rest)
+        del self._rest[self.key]
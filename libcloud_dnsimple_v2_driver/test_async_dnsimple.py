@@ -0,0 +1,223 @@
+import asyncio
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from libcloud.dns.types import RecordType
+
+from libcloud_dnsimple_v2_driver.async_dnsimple import AsyncDNSimpleV2DNSDriver
+from libcloud_dnsimple_v2_driver.dnsimple import DNSimpleV2DNSDriver, DNSimpleV2Error
+from libcloud_dnsimple_v2_driver.test_dnsimple import get_fixture
+
+DNS_PARAMS_DNSIMPLE_V2 = ('user', 'key')
+
+
+class AsyncDNSimpleV2DNSTests(unittest.TestCase):
+    _test_domain = "example-alpha.com"
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.requests = []
+        self.server = TestServer(self._create_app())
+        self.loop.run_until_complete(self.server.start_server())
+        self.driver = AsyncDNSimpleV2DNSDriver(*DNS_PARAMS_DNSIMPLE_V2, concurrency=2)
+        self.driver.connection.host = str(self.server.make_url("")).rstrip("/")
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.driver.close())
+        self.loop.run_until_complete(self.server.close())
+        self.loop.close()
+
+    def run_async(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def _create_app(self):
+        def fixture(ident):
+            async def handler(request):
+                self.requests.append((request.method, request.path_qs, request.headers.get("Authorization")))
+                if ident is None:
+                    return web.Response(status=204)
+                etag = '"{}"'.format(ident)
+                if request.headers.get("If-None-Match") == etag:
+                    return web.Response(status=304)
+                return web.json_response(get_fixture(ident), headers={"ETag": etag})
+            return handler
+
+        async def paged_records(request):
+            page = int(request.query["page"])
+            self.requests.append((request.method, request.path_qs, request.headers.get("Authorization")))
+            data = get_fixture("list_records")
+            for item in data["data"]:
+                item["id"] = "{}-{}".format(page, item["id"])
+            data["pagination"] = {"current_page": page, "per_page": 100, "total_entries": 25, "total_pages": 5}
+            # later pages answer first to check that ordering is kept
+            await asyncio.sleep(0.01 * (5 - page))
+            return web.json_response(data)
+
+        async def bad_gateway(request):
+            return web.Response(status=502, text="<html><body>Bad Gateway</body></html>", content_type="text/html")
+
+        app = web.Application()
+        app.router.add_get("/v2/user/domains", fixture("list_domains"))
+        app.router.add_get("/v2/user/domains/bad-gateway.com", bad_gateway)
+        app.router.add_post("/v2/user/domains", fixture("create_domain"))
+        app.router.add_get("/v2/user/domains/{zone}", fixture("get_zone"))
+        app.router.add_delete("/v2/user/domains/{zone}", fixture(None))
+        app.router.add_get("/v2/user/zones/example-alpha.com/records", fixture("list_records"))
+        app.router.add_get("/v2/user/zones/example-alpha.com/file", fixture("get_zone_file"))
+        app.router.add_get("/v2/user/zones/paged.com/records", paged_records)
+        app.router.add_post("/v2/user/zones/{zone}/records", fixture("create_record"))
+        app.router.add_get("/v2/user/zones/{zone}/records/{id}", fixture("get_record"))
+        app.router.add_put("/v2/user/zones/{zone}/records/{id}", fixture("update_record"))
+        app.router.add_delete("/v2/user/zones/{zone}/records/{id}", fixture(None))
+        return app
+
+    def test_list_zones(self):
+        zones = self.run_async(self.driver.list_zones())
+
+        self.assertEqual([zone.id for zone in zones], ['example-alpha.com', 'example-beta.com'])
+        self.assertEqual(self.requests[0][2], "Bearer key")
+
+    def test_list_records_matches_blocking_driver(self):
+        zone = self.run_async(self.driver.get_zone(self._test_domain))
+        records = self.run_async(self.driver.list_records(zone))
+
+        blocking = DNSimpleV2DNSDriver(*DNS_PARAMS_DNSIMPLE_V2)
+        expected = blocking._to_records(get_fixture("list_records")["data"], zone)
+        self.assertEqual(len(records), 5)
+        for record, other in zip(records, expected):
+            self.assertEqual((record.id, record.name, record.type, record.data, record.ttl, record.extra),
+                             (other.id, other.name, other.type, other.data, other.ttl, other.extra))
+            self.assertIs(record.driver, self.driver)
+
+    def test_iterate_records_concurrent_pages_in_order(self):
+        zone = self.driver._get_record_zone("paged.com")
+
+        async def collect():
+            return [record.id async for record in self.driver.iterate_records(zone)]
+
+        ids = self.run_async(collect())
+        self.assertEqual(len(ids), 25)
+        self.assertEqual(ids[::5], ["{}-1".format(page) for page in range(1, 6)])
+
+    def test_ex_iterate_records(self):
+        zone = self.driver._get_record_zone(self._test_domain)
+
+        async def collect():
+            return [record async for record in self.driver.ex_iterate_records(zone, type=RecordType.NS)]
+
+        self.run_async(collect())
+        self.assertEqual(self.requests[0][1],
+                         "/v2/user/zones/example-alpha.com/records?per_page=100&page=1&type=NS")
+
+    def test_get_record(self):
+        record = self.run_async(self.driver.get_record(self._test_domain, "1"))
+
+        self.assertEqual(record.type, RecordType.MX)
+        self.assertEqual(record.zone.id, self._test_domain)
+        self.assertEqual(record.zone.extra, {})
+        self.assertEqual(len(self.requests), 1)
+
+        self.run_async(self.driver.get_zone(self._test_domain))
+        record = self.run_async(self.driver.get_record(self._test_domain, "1"))
+        self.assertEqual(record.zone.extra["account_id"], 1010)
+        self.assertEqual(len(self.requests), 3)
+
+    def test_ex_iterate_records_from_zone_file(self):
+        zone = self.run_async(self.driver.get_zone(self._test_domain))
+
+        async def collect():
+            return [record async for record in self.driver.ex_iterate_records_from_zone_file(zone)]
+
+        records = self.run_async(collect())
+        self.assertEqual(len(records), 5)
+        self.assertEqual(records[-1].name, "www")
+
+    def test_metrics(self):
+        driver = AsyncDNSimpleV2DNSDriver(*DNS_PARAMS_DNSIMPLE_V2, metrics=True)
+        driver.connection.host = self.driver.connection.host
+        self.run_async(driver.list_zones())
+        self.run_async(driver.close())
+
+        metrics = driver.ex_get_metrics()
+        self.assertEqual(metrics["GET /v2/{account}/domains"]["statuses"], {200: 1})
+
+    def test_conditional_requests(self):
+        driver = AsyncDNSimpleV2DNSDriver(*DNS_PARAMS_DNSIMPLE_V2, response_cache_size=16)
+        driver.connection.host = self.driver.connection.host
+        zone = self.run_async(driver.get_zone(self._test_domain))
+        other = self.run_async(driver.get_zone(self._test_domain))
+        self.run_async(driver.close())
+
+        self.assertEqual(other.extra, zone.extra)
+        self.assertEqual(len(self.requests), 2)
+        self.assertEqual(driver.connection.response_cache.stats["not_modified"], 1)
+
+    def test_coalesced_requests(self):
+        async def get_zones():
+            return await asyncio.gather(*[self.driver.get_zone(self._test_domain) for _ in range(3)])
+
+        zones = self.run_async(get_zones())
+        self.assertEqual([zone.id for zone in zones], [self._test_domain] * 3)
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(self.driver.connection.single_flight.stats, {"in_flight": 0, "coalesced": 2})
+
+    def test_record_cache(self):
+        driver = AsyncDNSimpleV2DNSDriver(*DNS_PARAMS_DNSIMPLE_V2, record_cache_size=10)
+        driver.connection.host = self.driver.connection.host
+        zone = self.run_async(driver.get_zone(self._test_domain))
+        records = self.run_async(driver.list_records(zone))
+
+        self.assertEqual(self.run_async(driver.list_records(zone)), records)
+        self.assertIs(self.run_async(driver.get_record(self._test_domain, records[0].id)), records[0])
+        self.assertIs(self.run_async(driver.get_zone(self._test_domain)), zone)
+        self.assertEqual(len(self.requests), 2)
+
+        self.run_async(driver.delete_record(records[0]))
+        self.assertNotIn(records[0], self.run_async(driver.list_records(zone)))
+        self.run_async(driver.close())
+
+    def test_record_cache_write_during_listing(self):
+        driver = AsyncDNSimpleV2DNSDriver(*DNS_PARAMS_DNSIMPLE_V2, record_cache_size=10)
+        driver.connection.host = self.driver.connection.host
+        zone = self.run_async(driver.get_zone(self._test_domain))
+
+        async def delete_while_listing():
+            async for record in driver.iterate_records(zone):
+                if record.id == "69061":
+                    await driver.delete_record(record)
+
+        self.run_async(delete_while_listing())
+        self.assertIsNone(driver.record_cache.find(zone.id))
+        self.run_async(driver.close())
+
+    def test_error_response_not_json(self):
+        driver = AsyncDNSimpleV2DNSDriver(*DNS_PARAMS_DNSIMPLE_V2, max_retries=0)
+        driver.connection.host = self.driver.connection.host
+
+        with self.assertRaises(DNSimpleV2Error) as context:
+            self.run_async(driver.get_zone("bad-gateway.com"))
+        self.run_async(driver.close())
+        self.assertEqual(context.exception.status, 502)
+        self.assertEqual(context.exception.value, "<html><body>Bad Gateway</body></html>")
+
+    def test_create_update_delete_record(self):
+        zone = self.run_async(self.driver.get_zone(self._test_domain))
+        record = self.run_async(self.driver.create_record("foo", zone, RecordType.MX, "mail.example-alpha.com",
+                                                          extra={"priority": 10}))
+        self.assertEqual(record.name, "foo")
+
+        record = self.run_async(self.driver.update_record(record, "www", None, "updated.com",
+                                                          extra={"ttl": 4500}))
+        self.assertEqual(record.data, "updated.com")
+        self.assertEqual(record.extra["ttl"], 4500)
+
+        self.assertTrue(self.run_async(self.driver.delete_record(record)))
+        self.assertEqual([request[0] for request in self.requests], ["GET", "POST", "PUT", "DELETE"])
+
+    def test_create_delete_zone(self):
+        zone = self.run_async(self.driver.create_zone("example-alpha.com"))
+        self.assertEqual(zone.id, "example-alpha.com")
+
+        self.assertTrue(self.run_async(self.driver.delete_zone(zone)))
+        self.assertIsNone(self.driver.zone_cache.get("example-alpha.com"))
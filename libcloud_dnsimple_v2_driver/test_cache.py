@@ -0,0 +1,146 @@
+import unittest
+from unittest import mock
+
+from libcloud.dns.base import Record, Zone
+
+from libcloud_dnsimple_v2_driver.cache import LRUCache, RecordCache, ResponseCache
+
+
+class LRUCacheTests(unittest.TestCase):
+
+    def test_get_set(self):
+        cache = LRUCache()
+        cache.set("a", 1)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("b"), None)
+        self.assertEqual(cache.stats, {"hits": 1, "misses": 1, "size": 1})
+
+    def test_lru_eviction(self):
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("b"), None)
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_ttl_expiry(self):
+        cache = LRUCache(ttl=10)
+        with mock.patch("libcloud_dnsimple_v2_driver.cache.time.monotonic", return_value=100):
+            cache.set("a", 1)
+        with mock.patch("libcloud_dnsimple_v2_driver.cache.time.monotonic", return_value=105):
+            self.assertEqual(cache.get("a"), 1)
+        with mock.patch("libcloud_dnsimple_v2_driver.cache.time.monotonic", return_value=111):
+            self.assertEqual(cache.get("a"), None)
+        self.assertEqual(len(cache), 0)
+
+    def test_disabled(self):
+        cache = LRUCache(maxsize=0)
+        cache.set("a", 1)
+
+        self.assertEqual(cache.get("a"), None)
+
+    def test_pop(self):
+        cache = LRUCache()
+        cache.set("a", 1)
+
+        self.assertEqual(cache.pop("a"), 1)
+        self.assertEqual(cache.pop("a"), None)
+
+
+class ResponseCacheTests(unittest.TestCase):
+
+    def _response(self, headers, status=200):
+        return mock.Mock(status=status, headers=headers)
+
+    def test_validate(self):
+        cache = ResponseCache()
+        cache.store("/a", self._response({"ETag": '"1"', "Last-Modified": "yesterday"}))
+
+        headers = {}
+        self.assertIsNotNone(cache.validate("/a", headers))
+        self.assertEqual(headers, {"If-None-Match": '"1"', "If-Modified-Since": "yesterday"})
+
+        headers = {}
+        self.assertIsNone(cache.validate("/b", headers))
+        self.assertEqual(headers, {})
+
+    def test_store_needs_validator(self):
+        cache = ResponseCache()
+        cache.store("/a", self._response({}))
+        cache.store("/b", self._response({"ETag": '"1"'}, status=404))
+
+        self.assertEqual(len(cache), 0)
+
+    def test_stats(self):
+        cache = ResponseCache(maxsize=0)
+        cache.record_not_modified()
+
+        self.assertIsNone(cache.validate("/a", {}))
+        self.assertEqual(cache.stats, {"hits": 0, "misses": 0, "size": 0, "not_modified": 1})
+
+
+class RecordCacheTests(unittest.TestCase):
+
+    def _record(self, id, name, type="A", zone="example.com"):
+        zone = Zone(id=zone, domain=zone, type="master", ttl=3600, driver=None)
+        return Record(id=id, name=name, type=type, data="192.0.2.1", zone=zone, driver=None)
+
+    def test_get_set_discard(self):
+        cache = RecordCache(maxsize=10)
+        record = self._record(1, "www")
+        cache.set(record)
+
+        self.assertIs(cache.get("example.com", "1"), record)
+        cache.discard("example.com", 1)
+        self.assertIsNone(cache.get("example.com", "1"))
+        self.assertEqual(cache.stats, {"hits": 1, "misses": 1, "zones": 1, "records": 0})
+
+    def test_find_needs_complete_zone(self):
+        cache = RecordCache(maxsize=10)
+        cache.set(self._record(1, "www"))
+        self.assertIsNone(cache.find("example.com"))
+
+        cache.set_zone("example.com", [self._record(1, "www"), self._record(2, "www", "AAAA"),
+                                       self._record(3, "mail", "MX")])
+        self.assertEqual([r.id for r in cache.find("example.com")], ["1", "2", "3"])
+        self.assertEqual([r.id for r in cache.find("example.com", name="www", type="AAAA")], ["2"])
+        self.assertEqual([r.id for r in cache.find("example.com", name="www")], ["1", "2"])
+        self.assertEqual([r.id for r in cache.find("example.com", type="MX")], ["3"])
+        self.assertEqual([r.id for r in cache.find("example.com", name_like="ai")], ["3"])
+
+    def test_set_zone_after_write(self):
+        cache = RecordCache(maxsize=10)
+        version = cache.version("example.com")
+        cache.discard("example.com", "1")
+
+        self.assertFalse(cache.set_zone("example.com", [self._record(1, "www")], version))
+        self.assertIsNone(cache.find("example.com"))
+        self.assertTrue(cache.set_zone("example.com", [self._record(1, "www")], cache.version("example.com")))
+
+    def test_update_moves_index(self):
+        cache = RecordCache(maxsize=10)
+        cache.set_zone("example.com", [self._record(1, "www")])
+        cache.set(self._record(1, "web"))
+
+        self.assertEqual(cache.find("example.com", name="www", type="A"), [])
+        self.assertEqual([r.name for r in cache.find("example.com", name="web", type="A")], ["web"])
+
+    def test_zone_eviction_and_expiry(self):
+        cache = RecordCache(maxsize=1, ttl=10)
+        with mock.patch("libcloud_dnsimple_v2_driver.cache.time.monotonic", return_value=100):
+            cache.set(self._record(1, "www"))
+            cache.set(self._record(2, "www", zone="other.com"))
+            self.assertIsNone(cache.get("example.com", "1"))
+            self.assertIsNotNone(cache.get("other.com", "2"))
+        with mock.patch("libcloud_dnsimple_v2_driver.cache.time.monotonic", return_value=111):
+            self.assertIsNone(cache.get("other.com", "2"))
+
+    def test_disabled(self):
+        cache = RecordCache()
+        cache.set_zone("example.com", [self._record(1, "www")])
+        self.assertIsNone(cache.find("example.com"))
+        self.assertIsNone(cache.get("example.com", "1"))
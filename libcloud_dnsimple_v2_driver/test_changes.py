@@ -0,0 +1,130 @@
+import time
+import unittest
+
+import requests_mock
+from libcloud.dns.types import RecordType
+
+from libcloud_dnsimple_v2_driver.dnsimple import DNSimpleV2DNSDriver
+from libcloud_dnsimple_v2_driver.test_dnsimple import get_fixture
+
+DNS_PARAMS_DNSIMPLE_V2 = ('user', 'key')
+RECORDS_URL = "https://api.dnsimple.com/v2/user/zones/example-alpha.com/records"
+
+
+class ChangeQueueTests(unittest.TestCase):
+
+    def setUp(self):
+        self.driver = DNSimpleV2DNSDriver(*DNS_PARAMS_DNSIMPLE_V2)
+        zone = self.driver._get_record_zone("example-alpha.com")
+        self.records = self.driver._to_records(get_fixture("list_records")["data"], zone)
+        self.zone = zone
+
+    def _set_mock_requests(self, m):
+        m.post(RECORDS_URL, json=get_fixture("create_record"))
+        for record in self.records:
+            m.put("{}/{}".format(RECORDS_URL, record.id), json=get_fixture("update_record"))
+            m.delete("{}/{}".format(RECORDS_URL, record.id))
+
+    @requests_mock.Mocker()
+    def test_updates_collapse(self, m):
+        self._set_mock_requests(m)
+        record = self.records[0]
+        changes = self.driver.ex_change_queue(max_delay=None)
+        changes.update_record(record, record.name, None, record.data, extra={"ttl": 60})
+        changes.update_record(record, "www", None, "192.0.2.2", extra={"priority": 5})
+        self.assertEqual(m.call_count, 0)
+
+        results = changes.flush()
+        self.assertEqual(len(results), 1)
+        self.assertEqual(m.call_count, 1)
+        self.assertEqual(m.last_request.json(),
+                         {"record": {"name": "www", "content": "192.0.2.2", "ttl": 60, "priority": 5}})
+        self.assertEqual(changes.stats, {"queued": 2, "merged": 1, "cancelled": 0, "writes": 1, "flushes": 1})
+
+    @requests_mock.Mocker()
+    def test_create_delete_cancel(self, m):
+        self._set_mock_requests(m)
+        changes = self.driver.ex_change_queue(max_delay=None)
+        record = changes.create_record("www", self.zone, RecordType.A, "192.0.2.1")
+        changes.update_record(record, "web", None, "192.0.2.2")
+        changes.delete_record(record)
+
+        self.assertEqual(changes.flush(), [])
+        self.assertEqual(m.call_count, 0)
+        self.assertEqual(changes.stats["cancelled"], 2)
+
+    @requests_mock.Mocker()
+    def test_create_with_update(self, m):
+        self._set_mock_requests(m)
+        with self.driver.ex_change_queue(max_delay=None) as changes:
+            record = changes.create_record("www", self.zone, RecordType.A, "192.0.2.1")
+            changes.update_record(record, "web", None, "192.0.2.2", extra={"ttl": 60})
+
+        self.assertEqual(m.call_count, 1)
+        self.assertEqual(m.last_request.json(), {"name": "web", "type": "A", "content": "192.0.2.2", "ttl": 60})
+        self.assertEqual(record.id, "1")
+
+    @requests_mock.Mocker()
+    def test_delete_drops_updates(self, m):
+        self._set_mock_requests(m)
+        record = self.records[1]
+        changes = self.driver.ex_change_queue(max_delay=None)
+        changes.update_record(record, "www", None, "192.0.2.2")
+        changes.delete_record(record)
+        with self.assertRaises(ValueError):
+            changes.update_record(record, "www", None, "192.0.2.3")
+
+        changes.flush()
+        self.assertEqual([request.method for request in m.request_history], ["DELETE"])
+
+    @requests_mock.Mocker()
+    def test_flush_on_size(self, m):
+        self._set_mock_requests(m)
+        results = []
+        changes = self.driver.ex_change_queue(max_size=2, max_delay=None, callback=results.extend)
+        changes.delete_record(self.records[0])
+        self.assertEqual(m.call_count, 0)
+        changes.delete_record(self.records[1])
+
+        self.assertEqual(m.call_count, 2)
+        self.assertEqual(len(results), 2)
+        self.assertEqual(len(changes), 0)
+
+    @requests_mock.Mocker()
+    def test_flush_on_time(self, m):
+        self._set_mock_requests(m)
+        changes = self.driver.ex_change_queue(max_delay=0.01)
+        changes.delete_record(self.records[0])
+
+        deadline = time.monotonic() + 5
+        while changes.stats["flushes"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        self.assertEqual(m.call_count, 1)
+
+    @requests_mock.Mocker()
+    def test_failed_create_rejected(self, m):
+        m.post(RECORDS_URL, status_code=400, json={"message": "Validation failed"})
+        changes = self.driver.ex_change_queue(max_delay=None)
+        record = changes.create_record("www", self.zone, RecordType.A, "192.0.2.1")
+
+        results = changes.flush()
+        self.assertIsNotNone(results[0].error)
+        self.assertIsNone(record.id)
+        self.assertRaises(ValueError, changes.update_record, record, "web", None, "192.0.2.2")
+        self.assertRaises(ValueError, changes.delete_record, record)
+        self.assertEqual(len(changes), 0)
+
+    @requests_mock.Mocker()
+    def test_failures_kept_without_callback(self, m):
+        m.delete("{}/{}".format(RECORDS_URL, self.records[0].id), status_code=404, json={"message": "Not found"})
+        m.delete("{}/{}".format(RECORDS_URL, self.records[1].id))
+        changes = self.driver.ex_change_queue(max_size=2, max_delay=None)
+        changes.delete_record(self.records[0])
+        changes.delete_record(self.records[1])
+        self.assertEqual(m.call_count, 2)
+
+        results = changes.flush()
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].item, self.records[0])
+        self.assertEqual(results[0].error.status, 404)
+        self.assertEqual(changes.flush(), [])
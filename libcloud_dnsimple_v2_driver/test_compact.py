@@ -0,0 +1,67 @@
+import unittest
+
+import requests_mock
+from libcloud.dns.base import Record, Zone
+from libcloud_dnsimple_v2_driver import test_dnsimple
+from libcloud_dnsimple_v2_driver.compact import CompactRecord, CompactZone
+from libcloud_dnsimple_v2_driver.dnsimple import DNSimpleV2DNSDriver
+
+DNS_PARAMS_DNSIMPLE_V2 = test_dnsimple.DNS_PARAMS_DNSIMPLE_V2
+
+
+class CompactTests(unittest.TestCase):
+
+    def setUp(self):
+        self.driver = DNSimpleV2DNSDriver(*DNS_PARAMS_DNSIMPLE_V2)
+
+    def test_zone_matches_regular_zone(self):
+        data = test_dnsimple.get_fixture("get_zone")["data"]
+        zone = self.driver._to_zone(data)
+        compact = CompactZone(data, ttl=zone.ttl, driver=self.driver)
+
+        self.assertFalse(hasattr(compact, "__dict__"))
+        self.assertEqual((compact.id, compact.domain, compact.type, compact.ttl),
+                         (zone.id, zone.domain, zone.type, zone.ttl))
+        self.assertEqual(compact.extra, zone.extra)
+        self.assertIs(compact.extra, compact.extra)
+
+        full = compact.to_zone()
+        self.assertIsInstance(full, Zone)
+        self.assertEqual(full.extra, zone.extra)
+
+    def test_record_matches_regular_record(self):
+        data = test_dnsimple.get_fixture("get_record")["data"]
+        zone = Zone("example-alpha.com", "example-alpha.com", "master", 3600, self.driver)
+        record = self.driver._to_record(data, zone=zone)
+        compact = CompactRecord(data, zone=zone, driver=self.driver)
+
+        self.assertFalse(hasattr(compact, "__dict__"))
+        self.assertEqual((compact.id, compact.name, compact.type, compact.data, compact.ttl),
+                         (record.id, record.name, record.type, record.data, record.ttl))
+        self.assertEqual(compact.extra, record.extra)
+        compact.extra["ttl"] = 60
+        self.assertEqual(compact.extra["ttl"], 60)
+
+        full = compact.to_record()
+        self.assertIsInstance(full, Record)
+        self.assertEqual(full.zone, zone)
+        self.assertEqual(full.extra["ttl"], 60)
+
+
+class CompactDriverTests(test_dnsimple.DNSimpleV2DNSTests):
+    """
+    Run the driver tests again with compact zones and records.
+    """
+
+    def setUp(self):
+        self.driver = DNSimpleV2DNSDriver(*DNS_PARAMS_DNSIMPLE_V2, compact=True)
+
+    @requests_mock.Mocker()
+    def test_compact_types(self, m):
+        self.set_mock_requests(m)
+
+        zone = self.driver.list_zones()[0]
+        record = self.driver.list_records(zone=zone)[0]
+        self.assertIsInstance(zone, CompactZone)
+        self.assertIsInstance(record, CompactRecord)
+        self.assertIs(record.zone, zone)
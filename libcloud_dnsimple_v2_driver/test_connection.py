@@ -1,8 +1,12 @@
+import gzip
+import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 
+import requests
 import requests_mock
 
-from libcloud_dnsimple_v2_driver.connection import LibCloudRequest
+from libcloud_dnsimple_v2_driver.connection import LibCloudRequest, LibCloudResponse
 
 
 @requests_mock.Mocker()
@@ -39,34 +43,41 @@ class LibCloudRequestTests(unittest.TestCase):
         self.set_mock_requests(m)
         response = self.connection.request("/json")
 
-        self.assertEqual(response, self.connection)
+        self.assertIsInstance(response, LibCloudResponse)
         self.assertEqual(response.object["ip"], "46.101.192.233")
 
+    def test_request_returns_new_response(self, m):
+        self.set_mock_requests(m)
+        response = self.connection.request("/json")
+        other = self.connection.request("/json")
+
+        self.assertIsNot(response, other)
+        with self.assertRaises(AttributeError):
+            response.status = 500
+
     def test_getresponse(self, m):
         self.set_mock_requests(m)
-        self.connection.request("/json")
-        response = self.connection.getresponse()
+        response = self.connection.request("/json")
 
-        self.assertEqual(response, self.connection)
+        self.assertEqual(response.getresponse(), response)
 
     def test_getheaders(self, m):
         self.set_mock_requests(m)
-        self.connection.request("/json")
-        headers = self.connection.getheaders()
+        headers = self.connection.request("/json").getheaders()
 
         self.assertNotIn("content-encoding", headers.keys())
 
     def test_status(self, m):
         self.set_mock_requests(m)
-        self.connection.request("/json")
+        response = self.connection.request("/json")
 
-        self.assertEqual(self.connection.status, 200)
+        self.assertEqual(response.status, 200)
 
     def test_reason(self, m):
         self.set_mock_requests(m)
-        self.connection.request("/json")
+        response = self.connection.request("/json")
 
-        self.assertEqual(self.connection.reason, self._response_text)
+        self.assertEqual(response.reason, self._response_text)
 
     def test_connect(self, m):
         self.set_mock_requests(m)
@@ -74,12 +85,155 @@ class LibCloudRequestTests(unittest.TestCase):
 
     def test_read(self, m):
         self.set_mock_requests(m)
-        self.connection.request("/json")
-        data = self.connection.read()
+        data = self.connection.request("/json").read()
 
         self.assertEqual(data, self._response_text.encode("utf-8"))
 
+    def test_read_raw(self, m):
+        self.set_mock_requests(m)
+        response = self.connection.request("/json", raw=True)
+
+        self.assertEqual(response.object, {})
+        self.assertEqual(response.read(), self._response_text.encode("utf-8"))
+        response.close()
+
     def test_close(self, m):
         self.set_mock_requests(m)
         self.connection.request("/json")
-        self.connection.close()
\ No newline at end of file
+        self.connection.close()
+
+    def test_session_reused(self, m):
+        self.set_mock_requests(m)
+        self.connection.request("/json")
+        session = self.connection.session
+        self.connection.request("/json")
+
+        self.assertIs(self.connection.session, session)
+
+    def test_session_pool_size(self, m):
+        connection = LibCloudRequest("user", "key", pool_connections=2, pool_maxsize=5)
+        adapter = connection.session.get_adapter("https://ifconfig.co")
+
+        self.assertEqual(adapter._pool_connections, 2)
+        self.assertEqual(adapter._pool_maxsize, 5)
+
+    def test_session_idle_timeout(self, m):
+        self.set_mock_requests(m)
+        self.connection.pool_idle_timeout = 0
+        self.connection.request("/json")
+        session = self.connection.session
+
+        self.assertIsNot(self.connection.session, session)
+
+    def test_close_drops_session(self, m):
+        self.set_mock_requests(m)
+        self.connection.request("/json")
+        session = self.connection.session
+        self.connection.close()
+
+        self.assertIsNone(self.connection._session)
+        self.connection.request("/json")
+        self.assertIsNot(self.connection.session, session)
+
+    def test_compressed_response(self, m):
+        m.get(self._test_url, content=gzip.compress(self._response_text.encode("utf-8")),
+              headers={"content-encoding": "gzip", "content-length": "120", "content-type": "application/json"})
+        response = self.connection.request("/json")
+
+        self.assertIn("gzip", m.last_request.headers["Accept-Encoding"])
+        self.assertEqual(response.object["ip"], "46.101.192.233")
+        self.assertEqual(response.read(), self._response_text.encode("utf-8"))
+        self.assertNotIn("content-encoding", response.getheaders())
+        self.assertNotIn("content-length", response.getheaders())
+        self.assertIn("content-encoding", response.headers)
+
+    def test_compression_disabled(self, m):
+        self.set_mock_requests(m)
+        connection = LibCloudRequest("user", "key", compress=False)
+        connection.host = "https://ifconfig.co"
+        connection.request("/json")
+
+        self.assertEqual(m.last_request.headers["Accept-Encoding"], "identity")
+
+    def test_conditional_request(self, m):
+        m.get(self._test_url, [
+            {"text": self._response_text, "headers": {"ETag": '"abc"'}},
+            {"status_code": 304},
+        ])
+        connection = LibCloudRequest("user", "key", response_cache_size=16)
+        connection.host = "https://ifconfig.co"
+        response = connection.request("/json")
+        other = connection.request("/json")
+
+        self.assertEqual(m.last_request.headers["If-None-Match"], '"abc"')
+        self.assertEqual(other.status, 200)
+        self.assertIs(other.object, response.object)
+        self.assertEqual(connection.response_cache.stats,
+                         {"hits": 1, "misses": 1, "size": 1, "not_modified": 1})
+
+    def test_conditional_request_changed(self, m):
+        m.get(self._test_url, [
+            {"text": self._response_text, "headers": {"Last-Modified": "Thu, 30 Aug 2018 17:01:28 GMT"}},
+            {"text": '{"ip": "192.0.2.1"}', "headers": {"Last-Modified": "Fri, 31 Aug 2018 17:01:28 GMT"}},
+        ])
+        connection = LibCloudRequest("user", "key", response_cache_size=16)
+        connection.host = "https://ifconfig.co"
+        connection.request("/json")
+        response = connection.request("/json")
+
+        self.assertEqual(m.last_request.headers["If-Modified-Since"], "Thu, 30 Aug 2018 17:01:28 GMT")
+        self.assertEqual(response.object["ip"], "192.0.2.1")
+        self.assertEqual(connection.response_cache.stats["not_modified"], 0)
+
+    def test_response_cache_off_by_default(self, m):
+        m.get(self._test_url, text=self._response_text, headers={"ETag": '"abc"'})
+        self.connection.request("/json")
+        self.connection.request("/json")
+
+        self.assertNotIn("If-None-Match", m.last_request.headers)
+        self.assertEqual(self.connection.response_cache.stats["size"], 0)
+
+    def test_hooks(self, m):
+        self.set_mock_requests(m)
+        m.get("https://ifconfig.co/broken", exc=requests.ConnectionError)
+        events = []
+        self.connection.add_hook(events.append)
+        self.connection.retry_policy.max_retries = 0
+
+        self.connection.request("/json")
+        with self.assertRaises(requests.ConnectionError):
+            self.connection.request("/broken")
+
+        self.assertEqual([(event.method, event.status, event.bytes) for event in events],
+                         [("GET", 200, len(self._response_text)), ("GET", None, None)])
+        self.assertIsInstance(events[1].error, requests.ConnectionError)
+
+        self.connection.remove_hook(events.append)
+        self.connection.request("/json")
+        self.assertEqual(len(events), 2)
+
+    def test_coalesced_requests(self, m):
+        def slow(request, context):
+            # Answer once the other threads have joined the request
+            deadline = time.monotonic() + 5
+            while self.connection.single_flight.coalesced < 3 and time.monotonic() < deadline:
+                time.sleep(0.001)
+            return self._response_text
+
+        m.get(self._test_url, text=slow)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            responses = list(executor.map(lambda _: self.connection.request("/json"), range(4)))
+
+        self.assertEqual(m.call_count, 1)
+        self.assertTrue(all(response is responses[0] for response in responses))
+        self.assertEqual(self.connection.single_flight.stats, {"in_flight": 0, "coalesced": 3})
+
+    def test_coalescing_disabled(self, m):
+        self.set_mock_requests(m)
+        connection = LibCloudRequest("user", "key", coalesce=False)
+        connection.host = "https://ifconfig.co"
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(lambda _: connection.request("/json"), range(4)))
+        self.assertEqual(m.call_count, 4)
+        self.assertIsNone(connection.single_flight)
@@ -13,14 +13,28 @@
 # See the License for the specific language governing permissions and
 import json
 import os
+import re
+import threading
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
 import requests_mock
+from libcloud.common.types import LibcloudError
 from libcloud.dns.types import RecordType
-from libcloud_dnsimple_v2_driver.dnsimple import DNSimpleV2DNSDriver
+from libcloud_dnsimple_v2_driver.dnsimple import DNSimpleV2DNSDriver, DNSimpleV2Error
 
 DNS_PARAMS_DNSIMPLE_V2 = ('user', 'key')
 
 
+def get_fixture(ident):
+    """
+    Return the decoded JSON fixture ``fixtures/<ident>.json``.
+    """
+    with open(os.path.join("fixtures", ident + ".json")) as f:
+        return json.loads(f.read())
+
+
 class DNSimpleV2DNSTests(unittest.TestCase):
     secure = True
     host = DNSimpleV2DNSDriver.host
@@ -42,8 +56,7 @@ class DNSimpleV2DNSTests(unittest.TestCase):
         )
 
     def _get_fixture(self, ident):
-        with open(os.path.join("fixtures", ident + ".json")) as f:
-            return json.loads(f.read())
+        return get_fixture(ident)
 
     def set_mock_requests(self, m):
         m.get(self._get_url(
@@ -124,6 +137,11 @@ class DNSimpleV2DNSTests(unittest.TestCase):
         self.assertTrue(RecordType.TXT in record_types)
         self.assertTrue(RecordType.URL in record_types)
 
+    def test_connection_options(self):
+        driver = DNSimpleV2DNSDriver(*DNS_PARAMS_DNSIMPLE_V2, pool_maxsize=32, pool_idle_timeout=5)
+        self.assertEqual(driver.connection.pool_maxsize, 32)
+        self.assertEqual(driver.connection.pool_idle_timeout, 5)
+
     @requests_mock.Mocker()
     def test_list_zones_success(self, m):
         self.set_mock_requests(m)
@@ -247,6 +265,38 @@ class DNSimpleV2DNSTests(unittest.TestCase):
         self.assertHasKeys(record.extra, ["zone_id", "parent_id", "ttl", "priority", "regions", "system_record",
                                            "created_at", "updated_at"])
 
+    @requests_mock.Mocker()
+    def test_get_record_single_request(self, m):
+        self.set_mock_requests(m)
+
+        record = self.driver.get_record(zone_id='example-alpha.com',
+                                        record_id='1')
+        self.assertEqual(m.call_count, 1)
+        self.assertEqual(record.zone.id, 'example-alpha.com')
+        self.assertEqual(self.driver.zone_cache.misses, 1)
+
+        self.assertEqual(record.zone.extra["account_id"], 1010)
+        self.assertEqual(m.call_count, 2)
+
+    @requests_mock.Mocker()
+    def test_get_record_cached_zone(self, m):
+        self.set_mock_requests(m)
+
+        zone = self.driver.get_zone(zone_id='example-alpha.com')
+        record = self.driver.get_record(zone_id='example-alpha.com',
+                                        record_id='1')
+        self.assertIs(record.zone, zone)
+        self.assertEqual(m.call_count, 2)
+        self.assertEqual(self.driver.zone_cache.hits, 1)
+
+    @requests_mock.Mocker()
+    def test_delete_zone_invalidates_cache(self, m):
+        self.set_mock_requests(m)
+
+        zone = self.driver.get_zone(zone_id='example-alpha.com')
+        self.driver.delete_zone(zone=zone)
+        self.assertIsNone(self.driver.zone_cache.get('example-alpha.com'))
+
     @requests_mock.Mocker()
     def test_update_record_success(self, m):
         self.set_mock_requests(m)
@@ -287,5 +337,495 @@ class DNSimpleV2DNSTests(unittest.TestCase):
         status = self.driver.delete_record(record=record)
         self.assertTrue(status)
 
+    def _paged_records(self, page, total_pages):
+        data = []
+        for item in self._get_fixture("list_records")["data"]:
+            item = dict(item, id="{}-{}".format(page, item["id"]))
+            data.append(item)
+        return {
+            "data": data,
+            "pagination": {"current_page": page, "per_page": 100, "total_entries": 5 * total_pages,
+                           "total_pages": total_pages},
+        }
+
+    def _set_paged_records(self, m, total_pages):
+        for page in range(1, total_pages + 1):
+            m.get(self._get_url(
+                "/v2/{}/zones/{}/records?per_page=100&page={}".format(
+                    DNS_PARAMS_DNSIMPLE_V2[0],
+                    self._test_domain,
+                    page,
+                )),
+                json=self._paged_records(page, total_pages),
+            )
+
+    @requests_mock.Mocker()
+    def test_iterate_records_sequential_pages(self, m):
+        self.set_mock_requests(m)
+        self._set_paged_records(m, 3)
+
+        zone = self.driver.list_zones()[0]
+        records = self.driver.list_records(zone=zone)
+        self.assertEqual(len(records), 15)
+        self.assertEqual([r.id for r in records[::5]], ["1-1", "2-1", "3-1"])
+
+    @requests_mock.Mocker()
+    def test_iterate_records_prefetch_ordered(self, m):
+        self.set_mock_requests(m)
+        self._set_paged_records(m, 7)
+        driver = DNSimpleV2DNSDriver(*DNS_PARAMS_DNSIMPLE_V2, prefetch_workers=3)
+
+        zone = driver.list_zones()[0]
+        records = driver.list_records(zone=zone)
+        self.assertEqual(len(records), 35)
+        self.assertEqual([r.id for r in records[::5]], ["{}-1".format(page) for page in range(1, 8)])
+        self.assertEqual(driver.connection.pool_maxsize, 10)
+
+    @requests_mock.Mocker()
+    def test_iterate_records_prefetch_unordered(self, m):
+        self.set_mock_requests(m)
+        self._set_paged_records(m, 7)
+        driver = DNSimpleV2DNSDriver(*DNS_PARAMS_DNSIMPLE_V2, prefetch_workers=16, prefetch_ordered=False)
+
+        zone = driver.list_zones()[0]
+        records = driver.list_records(zone=zone)
+        self.assertEqual(len(records), 35)
+        self.assertEqual(sorted(r.id for r in records[::5]), ["{}-1".format(page) for page in range(1, 8)])
+        self.assertEqual(driver.connection.pool_maxsize, 16)
+
+    @requests_mock.Mocker()
+    def test_iterate_records_stream_pages(self, m):
+        self.set_mock_requests(m)
+        self._set_paged_records(m, 3)
+        driver = DNSimpleV2DNSDriver(*DNS_PARAMS_DNSIMPLE_V2, stream_pages=True)
+
+        zone = driver.list_zones()[0]
+        records = driver.list_records(zone=zone)
+        self.assertEqual(len(records), 15)
+        self.assertEqual([r.id for r in records[::5]], ["1-1", "2-1", "3-1"])
+        self.assertEqual(records[0].zone, zone)
+
+    def _set_beta_records(self, m, **kwargs):
+        kwargs.setdefault("json", self._get_fixture("list_records"))
+        m.get(self._get_url("/v2/{}/zones/example-beta.com/records?per_page=100&page=1".format(
+            DNS_PARAMS_DNSIMPLE_V2[0])), **kwargs)
+
+    @requests_mock.Mocker()
+    def test_ex_iterate_all_records(self, m):
+        self.set_mock_requests(m)
+        self._set_paged_records(m, 3)
+        self._set_beta_records(m)
+
+        records = list(self.driver.ex_iterate_all_records(max_workers=2, queue_size=1))
+        self.assertEqual(len(records), 20)
+        alpha = [r.id for r in records if r.zone.domain == "example-alpha.com"]
+        self.assertEqual(alpha[::5], ["1-1", "2-1", "3-1"])
+        self.assertEqual(len([r for r in records if r.zone.domain == "example-beta.com"]), 5)
+
+    @requests_mock.Mocker()
+    def test_ex_iterate_all_records_group_by_zone(self, m):
+        self.set_mock_requests(m)
+        self._set_paged_records(m, 3)
+        self._set_beta_records(m)
+
+        records = list(self.driver.ex_iterate_all_records(max_workers=2, group_by_zone=True, queue_size=1))
+        self.assertEqual([r.zone.domain for r in records], ["example-alpha.com"] * 15 + ["example-beta.com"] * 5)
+
+    @requests_mock.Mocker()
+    def test_ex_iterate_all_records_error(self, m):
+        self.set_mock_requests(m)
+        self._set_beta_records(m, status_code=404, json={"message": "Domain `example-beta.com` not found"})
+
+        with self.assertRaises(DNSimpleV2Error) as context:
+            list(self.driver.ex_iterate_all_records(max_workers=2))
+        self.assertEqual(context.exception.status, 404)
+
+    @requests_mock.Mocker()
+    def test_ex_iterate_all_records_close(self, m):
+        self.set_mock_requests(m)
+        self._set_paged_records(m, 3)
+        self._set_beta_records(m)
+        threads = threading.active_count()
+
+        records = self.driver.ex_iterate_all_records(max_workers=2, queue_size=1)
+        next(records)
+        # Workers blocked on the full queue must give up
+        records.close()
+        self.assertEqual(threading.active_count(), threads)
+
+    @requests_mock.Mocker()
+    def test_iterate_records_page_size(self, m):
+        self.set_mock_requests(m)
+        m.get(self._get_url("/v2/{}/zones/{}/records?per_page=25&page=1".format(
+            DNS_PARAMS_DNSIMPLE_V2[0], self._test_domain)), json=self._paged_records(1, 1))
+        driver = DNSimpleV2DNSDriver(*DNS_PARAMS_DNSIMPLE_V2, page_size=25)
+
+        zone = self.driver.list_zones()[0]
+        self.assertEqual(len(driver.list_records(zone=zone)), 5)
+        self.assertEqual(m.last_request.qs["per_page"], ["25"])
+
+    @requests_mock.Mocker()
+    def test_iterate_records_adaptive_page_size(self, m):
+        self.set_mock_requests(m)
+        self._set_paged_records(m, 1)
+        m.get(self._get_url("/v2/{}/zones/{}/records?per_page=10&page=1".format(
+            DNS_PARAMS_DNSIMPLE_V2[0], self._test_domain)), json=self._paged_records(1, 1))
+        driver = DNSimpleV2DNSDriver(*DNS_PARAMS_DNSIMPLE_V2, page_size="auto", max_page_bytes=100)
+
+        zone = driver.list_zones()[0]
+        driver.list_records(zone=zone)
+        self.assertEqual(m.last_request.qs["per_page"], ["100"])
+        # The first page showed records to take far more than 10 bytes each
+        driver.list_records(zone=zone)
+        self.assertEqual(m.last_request.qs["per_page"], ["10"])
+
+    def test_invalid_page_size(self):
+        for page_size in (0, 101, "large"):
+            with self.assertRaises(ValueError):
+                DNSimpleV2DNSDriver(*DNS_PARAMS_DNSIMPLE_V2, page_size=page_size)
+
+    @requests_mock.Mocker()
+    def test_record_cache(self, m):
+        self.set_mock_requests(m)
+        driver = DNSimpleV2DNSDriver(*DNS_PARAMS_DNSIMPLE_V2, record_cache_size=10)
+        zone = driver.list_zones()[0]
+        records = driver.list_records(zone=zone)
+        requests = m.call_count
+
+        self.assertEqual(driver.list_records(zone=zone), records)
+        self.assertIs(driver.get_record(zone.id, str(records[0].id)), records[0])
+        self.assertEqual(list(driver.ex_iterate_records(zone, name="", type=RecordType.NS)),
+                         [r for r in records if r.name == "" and r.type == "NS"])
+        self.assertIs(driver.get_zone(zone.id), zone)
+        self.assertEqual(m.call_count, requests)
+
+    @requests_mock.Mocker()
+    def test_record_cache_write_through(self, m):
+        self.set_mock_requests(m)
+        driver = DNSimpleV2DNSDriver(*DNS_PARAMS_DNSIMPLE_V2, record_cache_size=10)
+        zone = driver.list_zones()[0]
+        records = driver.list_records(zone=zone)
+
+        created = driver.create_record("www", zone, RecordType.A, "192.0.2.1")
+        self.assertIn(created, driver.list_records(zone=zone))
+        # The update fixture answers with another ID
+        updated = driver.update_record(created, "www", None, "192.0.2.2")
+        self.assertIs(driver.get_record(zone.id, str(updated.id)), updated)
+        self.assertNotIn(created.id, [r.id for r in driver.list_records(zone=zone)])
+        self.assertTrue(driver.delete_record(records[1]))
+        self.assertNotIn(records[1].id, [r.id for r in driver.list_records(zone=zone)])
+
+        requests = m.call_count
+        self.assertTrue(driver.delete_zone(zone))
+        driver.list_records(zone=zone)
+        self.assertEqual(m.call_count, requests + 2)
+        self.assertEqual(len(records), 5)
+
+    @requests_mock.Mocker()
+    def test_record_cache_write_during_listing(self, m):
+        self.set_mock_requests(m)
+        driver = DNSimpleV2DNSDriver(*DNS_PARAMS_DNSIMPLE_V2, record_cache_size=10)
+        zone = driver.list_zones()[0]
+
+        for record in driver.iterate_records(zone):
+            if record.id == "69061":
+                driver.delete_record(record)
+        self.assertIsNone(driver.record_cache.find(zone.id))
+
+        requests = m.call_count
+        driver.list_records(zone=zone)
+        self.assertEqual(m.call_count, requests + 1)
+        self.assertIsNotNone(driver.record_cache.find(zone.id))
+
+    @requests_mock.Mocker()
+    def test_error_response(self, m):
+        m.get(self._get_url("/v2/{}/domains/missing.com".format(DNS_PARAMS_DNSIMPLE_V2[0])),
+              status_code=404, json={"message": "Domain `missing.com` not found"})
+
+        with self.assertRaises(DNSimpleV2Error) as context:
+            self.driver.get_zone(zone_id='missing.com')
+        self.assertEqual(context.exception.status, 404)
+        self.assertEqual(context.exception.value, "Domain `missing.com` not found")
+
+    @requests_mock.Mocker()
+    def test_error_response_not_json(self, m):
+        m.get(self._get_url("/v2/{}/domains/missing.com".format(DNS_PARAMS_DNSIMPLE_V2[0])),
+              status_code=502, text="<html><body>Bad Gateway</body></html>\n")
+        driver = DNSimpleV2DNSDriver(*DNS_PARAMS_DNSIMPLE_V2, max_retries=0)
+
+        with self.assertRaises(DNSimpleV2Error) as context:
+            driver.get_zone(zone_id='missing.com')
+        self.assertEqual(context.exception.status, 502)
+        self.assertEqual(context.exception.value, "<html><body>Bad Gateway</body></html>")
+
+    @requests_mock.Mocker()
+    def test_metrics(self, m):
+        self.set_mock_requests(m)
+        m.get(self._get_url("/v2/{}/domains/missing.com".format(DNS_PARAMS_DNSIMPLE_V2[0])),
+              status_code=404, json={"message": "Domain `missing.com` not found"})
+        driver = DNSimpleV2DNSDriver(*DNS_PARAMS_DNSIMPLE_V2, metrics=True)
+
+        self.assertEqual(self.driver.ex_get_metrics(), {})
+        driver.list_zones()
+        driver.get_zone(self._test_domain)
+        with self.assertRaises(DNSimpleV2Error):
+            driver.get_zone("missing.com")
+
+        metrics = driver.ex_get_metrics()
+        self.assertEqual(sorted(metrics), ["GET /v2/{account}/domains", "GET /v2/{account}/domains/{zone}"])
+        self.assertEqual(metrics["GET /v2/{account}/domains/{zone}"]["statuses"], {200: 1, 404: 1})
+        self.assertEqual(metrics["GET /v2/{account}/domains/{zone}"]["errors"], 1)
+        self.assertEqual(metrics["GET /v2/{account}/domains"]["latency"]["count"], 1)
+
+    @requests_mock.Mocker()
+    def test_ex_create_records(self, m):
+        self.set_mock_requests(m)
+        fixture = self._get_fixture("create_record")
+
+        def create(request, context):
+            body = request.json()
+            if body["name"] == "bad":
+                context.status_code = 400
+                return {"message": "Validation failed"}
+            return dict(fixture, data=dict(fixture["data"], name=body["name"]))
+
+        m.post(self._get_url("/v2/{}/zones/{}/records".format(DNS_PARAMS_DNSIMPLE_V2[0], self._test_domain)),
+               json=create)
+
+        zone = self.driver.list_zones()[0]
+        items = [{"name": name, "type": RecordType.A, "data": "127.0.0.1"} for name in ("a", "bad", "c")]
+        results = self.driver.ex_create_records(zone, items, max_workers=3)
+
+        self.assertEqual([result.item for result in results], items)
+        self.assertEqual(results[0].result.name, "a")
+        self.assertIsNone(results[0].error)
+        self.assertIsNone(results[1].result)
+        self.assertEqual(results[1].error.status, 400)
+        self.assertEqual(results[2].result.name, "c")
+
+    @requests_mock.Mocker()
+    def test_ex_update_records(self, m):
+        self.set_mock_requests(m)
+
+        record = self.driver.get_record(zone_id='example-alpha.com', record_id='1')
+        results = self.driver.ex_update_records([
+            {"record": record, "name": "www", "type": None, "data": "updated.com", "extra": {"ttl": 4500}},
+        ])
+        self.assertEqual(results[0].result.data, "updated.com")
+
+    @requests_mock.Mocker()
+    def test_ex_delete_records(self, m):
+        self.set_mock_requests(m)
+
+        m.delete(self._get_url("/v2/{}/zones/{}/records/2".format(DNS_PARAMS_DNSIMPLE_V2[0], self._test_domain)),
+                 status_code=404, json={"message": "Record `2` not found"})
+
+        zone = self.driver.list_zones()[0]
+        records = self.driver.list_records(zone=zone)
+        results = self.driver.ex_delete_records(records[1:3])
+
+        self.assertTrue(results[0].result)
+        self.assertEqual(results[1].error.status, 404)
+        self.assertEqual(self.driver.ex_delete_records([]), [])
+
+    def _set_sync_records(self, m):
+        data = self._get_fixture("list_records")["data"][:1]
+        template = dict(data[0], system_record=False, ttl=3600, priority=None)
+        data += [
+            dict(template, id=10, name="www", type="A", content="192.0.2.1"),
+            dict(template, id=11, name="www", type="A", content="192.0.2.2"),
+            dict(template, id=12, name="", type="MX", content="mx.example.com", priority=10),
+            dict(template, id=13, name="", type="TXT", content="old"),
+        ]
+        m.get(self._get_url("/v2/{}/zones/{}/records?per_page=100&page=1".format(
+            DNS_PARAMS_DNSIMPLE_V2[0],
+            self._test_domain,
+        )), json={"data": data, "pagination": {"current_page": 1, "total_pages": 1}})
+
+    def _desired_records(self):
+        return [
+            {"name": "www", "type": "A", "data": "192.0.2.1"},
+            {"name": "www", "type": "A", "data": "192.0.2.3"},
+            {"name": "", "type": "MX", "data": "mx.example.com", "extra": {"priority": 20}},
+            {"name": "blog", "type": "CNAME", "data": "www.example-alpha.com"},
+        ]
+
+    @requests_mock.Mocker()
+    def test_ex_sync_zone_dry_run(self, m):
+        self.set_mock_requests(m)
+        self._set_sync_records(m)
+
+        zone = self.driver.list_zones()[0]
+        plan = self.driver.ex_sync_zone(zone, self._desired_records(), dry_run=True)
+
+        self.assertEqual(plan.creates, [{"name": "blog", "type": "CNAME", "data": "www.example-alpha.com"}])
+        self.assertEqual([(update["record"].id, update["data"], update.get("extra")) for update in plan.updates],
+                         [("12", "mx.example.com", {"priority": 20}), ("11", "192.0.2.3", None)])
+        self.assertEqual([record.id for record in plan.deletes], ["13"])
+        self.assertEqual([request.method for request in m.request_history], ["GET", "GET"])
+
+    @requests_mock.Mocker()
+    def test_ex_sync_zone(self, m):
+        self.set_mock_requests(m)
+        self._set_sync_records(m)
+        for record_id in (11, 12):
+            m.put(self._get_url("/v2/{}/zones/{}/records/{}".format(
+                DNS_PARAMS_DNSIMPLE_V2[0], self._test_domain, record_id,
+            )), json=self._get_fixture("update_record"))
+        m.delete(self._get_url("/v2/{}/zones/{}/records/13".format(DNS_PARAMS_DNSIMPLE_V2[0], self._test_domain)))
+
+        zone = self.driver.list_zones()[0]
+        result = self.driver.ex_sync_zone(zone, self._desired_records())
+
+        self.assertEqual(len(result.creates), 1)
+        self.assertEqual(len(result.updates), 2)
+        self.assertEqual(len(result.deletes), 1)
+        self.assertTrue(all(item.error is None for item in result.creates + result.updates + result.deletes))
+        self.assertEqual([request.method for request in m.request_history],
+                         ["GET", "GET", "DELETE", "PUT", "PUT", "POST"])
+
+    @requests_mock.Mocker()
+    def test_ex_sync_zone_in_sync(self, m):
+        self.set_mock_requests(m)
+        self._set_sync_records(m)
+
+        zone = self.driver.list_zones()[0]
+        desired = [
+            {"name": "www", "type": "A", "data": "192.0.2.1"},
+            {"name": "www", "type": "A", "data": "192.0.2.2", "extra": {"ttl": 3600}},
+            {"name": "", "type": "MX", "data": "mx.example.com"},
+            {"name": "", "type": "TXT", "data": "old"},
+        ]
+        self.assertEqual(self.driver.ex_sync_zone(zone, desired), ([], [], []))
+
+    @requests_mock.Mocker()
+    def test_iterate_records_retries_failed_page(self, m):
+        self.set_mock_requests(m)
+        self._set_paged_records(m, 3)
+        page_2 = self._get_url("/v2/{}/zones/{}/records?per_page=100&page=2".format(
+            DNS_PARAMS_DNSIMPLE_V2[0],
+            self._test_domain,
+        ))
+        m.get(page_2, [
+            {"status_code": 503, "json": {"message": "Service Unavailable"}},
+            {"status_code": 200, "json": self._paged_records(2, 3)},
+        ])
+        driver = DNSimpleV2DNSDriver(*DNS_PARAMS_DNSIMPLE_V2, retry_delay=0)
+
+        zone = driver.list_zones()[0]
+        records = driver.list_records(zone=zone)
+        self.assertEqual(len(records), 15)
+        urls = [request.url for request in m.request_history if "/records" in request.url]
+        self.assertEqual([url.split("&page=")[1] for url in urls], ["1", "2", "2", "3"])
+        self.assertEqual(driver.connection.retry_policy.stats,
+                         {"retries": 1, "retried_requests": 1, "exhausted": 0})
+
+    @requests_mock.Mocker()
+    def test_ex_iterate_records_filters(self, m):
+        self.set_mock_requests(m)
+        fixture = self._get_fixture("list_records")
+        fixture["data"] = fixture["data"][1:2]
+        m.get(self._get_url("/v2/{}/zones/{}/records?per_page=100&page=1&name=&type=NS".format(
+            DNS_PARAMS_DNSIMPLE_V2[0],
+            self._test_domain,
+        )), json=fixture, complete_qs=True)
+
+        zone = self.driver.list_zones()[0]
+        records = list(self.driver.ex_iterate_records(zone, name='', type=RecordType.NS))
+        self.assertEqual([record.id for record in records], ['69061'])
+        self.assertEqual(m.last_request.qs, {"per_page": ["100"], "page": ["1"], "name": [""], "type": ["ns"]})
+
+    @requests_mock.Mocker()
+    def test_ex_iterate_records_name_like(self, m):
+        self.set_mock_requests(m)
+
+        zone = self.driver.list_zones()[0]
+        list(self.driver.ex_iterate_records(zone, name_like='www'))
+        self.assertEqual(m.last_request.qs["name_like"], ["www"])
+        self.assertNotIn("type", m.last_request.qs)
+
+    @requests_mock.Mocker()
+    def test_ex_iterate_records_from_zone_file(self, m):
+        self.set_mock_requests(m)
+        m.get(self._get_url("/v2/{}/zones/{}/file".format(DNS_PARAMS_DNSIMPLE_V2[0], self._test_domain)),
+              json=self._get_fixture("get_zone_file"))
+
+        zone = self.driver.list_zones()[0]
+        self.assertTrue(self.driver.ex_export_zone_file(zone).startswith("$ORIGIN example-alpha.com."))
+
+        records = list(self.driver.ex_iterate_records_from_zone_file(zone))
+        self.assertEqual([(r.name, r.type, r.data) for r in records[2:]], [
+            ("", RecordType.NS, "ns2.dnsimple.com"),
+            ("", RecordType.MX, "mxa.example-alpha.com"),
+            ("www", RecordType.CNAME, "example-alpha.com"),
+        ])
+        self.assertIsNone(records[0].id)
+        self.assertEqual(records[3].extra["priority"], 10)
+        self.assertEqual(records[4].ttl, 600)
+        self.assertIs(records[4].zone, zone)
+
+    def test_ex_iterate_records_unsupported_type(self):
+        zone = self.driver._get_record_zone(self._test_domain)
+        with self.assertRaises(LibcloudError):
+            list(self.driver.ex_iterate_records(zone, type='BOGUS'))
+
+    @requests_mock.Mocker()
+    def test_create_record_is_not_retried(self, m):
+        self.set_mock_requests(m)
+        m.post(self._get_url("/v2/{}/zones/{}/records".format(DNS_PARAMS_DNSIMPLE_V2[0], self._test_domain)),
+               status_code=503, json={"message": "Service Unavailable"})
+        driver = DNSimpleV2DNSDriver(*DNS_PARAMS_DNSIMPLE_V2, retry_delay=0)
+
+        zone = driver.list_zones()[0]
+        with self.assertRaises(DNSimpleV2Error):
+            driver.create_record(name='foo', zone=zone, type=RecordType.A, data='127.0.0.1')
+        self.assertEqual(m.call_count, 2)
+
+class _RecordHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        zone_id, record_id = re.match(r"/v2/user/zones/([^/]+)/records/(\d+)", self.path).groups()
+        body = json.dumps({"data": {
+            "id": int(record_id), "zone_id": zone_id, "name": "host{}".format(record_id),
+            "content": "192.0.2.{}".format(int(record_id) % 255), "ttl": 3600, "type": "A",
+        }}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class DNSimpleV2DNSThreadSafetyTests(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _RecordHandler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.driver = DNSimpleV2DNSDriver(*DNS_PARAMS_DNSIMPLE_V2, pool_maxsize=16)
+        self.driver.connection.host = "http://127.0.0.1:{}".format(self.server.server_address[1])
+
+    def tearDown(self):
+        self.driver.connection.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_shared_driver_across_threads(self):
+        def get_record(record_id):
+            record = self.driver.get_record(zone_id="example-alpha.com", record_id=str(record_id))
+            return record_id, record
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(get_record, range(1, 401)))
+
+        for record_id, record in results:
+            self.assertEqual(record.id, str(record_id))
+            self.assertEqual(record.name, "host{}".format(record_id))
+            self.assertEqual(record.data, "192.0.2.{}".format(record_id % 255))
+
 # if __name__ == '__main__':
 #     sys.exit(unittest.main())
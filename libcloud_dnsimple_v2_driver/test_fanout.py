@@ -0,0 +1,107 @@
+import json
+import multiprocessing
+import re
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from libcloud_dnsimple_v2_driver.dnsimple import DNSimpleV2DNSDriver
+from libcloud_dnsimple_v2_driver.fanout import AccountFanOut, AccountResult, RecordBatch
+
+
+class _AccountHandler(BaseHTTPRequestHandler):
+    """
+    Accounts ``1`` and ``2`` have two zones with ``server.records`` records
+    each, every other account is unauthorized.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        match = re.match(r"/v2/(\w+)/(domains|zones/([^/]+)/records)\?per_page=(\d+)&page=(\d+)", self.path)
+        account, _, zone, per_page, page = match.groups()
+        if account not in ("1", "2"):
+            return self._send(401, {"message": "Authentication failed"})
+        if zone is None:
+            items = [{"id": n, "name": "zone{}.example.com".format(n)} for n in range(2)]
+        else:
+            items = [{"id": n, "name": "host{}".format(n), "type": self.server.record_type,
+                      "content": self.server.content, "ttl": 60, "priority": None, "zone_id": zone}
+                     for n in range(self.server.records)]
+        page, per_page = int(page), int(per_page)
+        total_pages = (len(items) + per_page - 1) // per_page
+        self._send(200, {
+            "data": items[(page - 1) * per_page:page * per_page],
+            "pagination": {"current_page": page, "per_page": per_page, "total_entries": len(items),
+                           "total_pages": total_pages},
+        })
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class AccountFanOutTests(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _AccountHandler)
+        self.server.daemon_threads = True
+        self.server.records = 3
+        self.server.record_type = "A"
+        self.server.content = "192.0.2.1"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        # Forked workers inherit the host
+        self.host = DNSimpleV2DNSDriver.host
+        DNSimpleV2DNSDriver.host = "127.0.0.1:{}".format(self.server.server_address[1])
+        self.fanout = AccountFanOut(max_workers=2, queue_size=2, mp_context=multiprocessing.get_context("fork"),
+                                    secure=False, rate_limit=False, page_size=2)
+
+    def tearDown(self):
+        DNSimpleV2DNSDriver.host = self.host
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_iterate_records(self):
+        items = list(self.fanout.iterate_records([("1", "key"), ("2", "key"), ("3", "key")]))
+
+        batches = [item for item in items if isinstance(item, RecordBatch)]
+        results = sorted(item for item in items if isinstance(item, AccountResult))
+        self.assertEqual(len(batches), 8)
+        self.assertEqual(batches[0].records[0], (0, "host0", "A", "192.0.2.1", 60, None))
+        self.assertEqual(sum(len(batch.records) for batch in batches if batch.account == "1"), 6)
+        self.assertEqual(results[:2], [AccountResult("1", 2, 6, None), AccountResult("2", 2, 6, None)])
+        self.assertEqual(results[2].account, "3")
+        self.assertIn("Authentication failed", results[2].error)
+
+    def test_close_early(self):
+        records = self.fanout.iterate_records([("1", "key"), ("2", "key")])
+        self.assertIsInstance(next(records), RecordBatch)
+        records.close()
+
+    def test_close_early_with_full_pipe(self):
+        # Pages larger than the pipe buffer block the workers' queue feeders
+        self.server.records = 200
+        self.server.record_type = "TXT"
+        self.server.content = "x" * 1000
+        fanout = AccountFanOut(max_workers=2, queue_size=64, mp_context=multiprocessing.get_context("fork"),
+                               secure=False, rate_limit=False, page_size=100)
+        records = fanout.iterate_records([("1", "key"), ("2", "key")])
+        self.assertEqual(len(next(records).records), 100)
+
+        closed = threading.Event()
+
+        def close():
+            records.close()
+            closed.set()
+
+        threading.Thread(target=close, daemon=True).start()
+        self.assertTrue(closed.wait(10))
+
+    def test_no_accounts(self):
+        self.assertEqual(list(self.fanout.iterate_records([])), [])
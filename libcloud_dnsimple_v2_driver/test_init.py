@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import libcloud_dnsimple_v2_driver
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def loaded_modules(code, modules):
+    """
+    Run ``code`` in a fresh interpreter and return which of ``modules`` it
+    imported.
+    """
+    script = "import sys\n{}\nprint(','.join(m for m in {!r} if m in sys.modules))".format(code, modules)
+    output = subprocess.check_output([sys.executable, "-c", script], cwd=ROOT)
+    return [module for module in output.decode("utf-8").strip().split(",") if module]
+
+
+class LazyImportTests(unittest.TestCase):
+
+    def test_package_import_is_lazy(self):
+        self.assertEqual(loaded_modules("import libcloud_dnsimple_v2_driver",
+                                        ("libcloud", "requests", "aiohttp", "libcloud_dnsimple_v2_driver.dnsimple")),
+                         [])
+
+    def test_requests_imported_on_first_request(self):
+        # Some libcloud versions import requests themselves
+        if loaded_modules("import libcloud.dns.base", ("requests",)):
+            self.skipTest("libcloud imports requests")
+        self.assertEqual(loaded_modules("import libcloud_dnsimple_v2_driver as p; p.DNSimpleV2DNSDriver('1', 'key')",
+                                        ("requests", "asyncio", "aiohttp")),
+                         [])
+
+    def test_exports(self):
+        from libcloud_dnsimple_v2_driver.dnsimple import DEFAULT_ZONE_TTL, DNSimpleV2DNSDriver
+
+        self.assertIs(libcloud_dnsimple_v2_driver.DNSimpleV2DNSDriver, DNSimpleV2DNSDriver)
+        self.assertEqual(libcloud_dnsimple_v2_driver.DEFAULT_ZONE_TTL, DEFAULT_ZONE_TTL)
+        self.assertIn("AsyncDNSimpleV2DNSDriver", dir(libcloud_dnsimple_v2_driver))
+        with self.assertRaises(AttributeError):
+            libcloud_dnsimple_v2_driver.Missing
+
+    def test_star_import_without_aiohttp(self):
+        script = ("import sys\nsys.modules['aiohttp'] = None\n"
+                  "from libcloud_dnsimple_v2_driver import *\nprint('AsyncDNSimpleV2DNSDriver' in dir())")
+        output = subprocess.check_output([sys.executable, "-c", script], cwd=ROOT)
+        self.assertEqual(output.decode("utf-8").strip(), "False")
+        self.assertIn("AsyncDNSimpleV2DNSDriver", libcloud_dnsimple_v2_driver.__all__)
@@ -0,0 +1,42 @@
+import unittest
+
+from libcloud_dnsimple_v2_driver.metrics import Histogram, MetricsCollector, RequestEvent, path_template
+
+
+class MetricsTests(unittest.TestCase):
+
+    def test_path_template(self):
+        self.assertEqual(path_template("/v2/1010/domains?per_page=100&page=2"), "/v2/{account}/domains")
+        self.assertEqual(path_template("/v2/1010/domains/example.com"), "/v2/{account}/domains/{zone}")
+        self.assertEqual(path_template("/v2/1010/zones/example.com/records/5"),
+                         "/v2/{account}/zones/{zone}/records/{record}")
+        self.assertEqual(path_template("/v2/1010/zones/example.com/file"), "/v2/{account}/zones/{zone}/file")
+
+    def test_histogram(self):
+        histogram = Histogram(buckets=(0.1, 1))
+        for value in (0.05, 0.1, 0.5, 3):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.count, 4)
+        self.assertEqual(histogram.to_dict(), {
+            "count": 4,
+            "sum": 3.65,
+            "buckets": [(0.1, 2), (1, 3), (float("inf"), 4)],
+        })
+
+    def test_collector(self):
+        collector = MetricsCollector(buckets=(1,))
+        collector(RequestEvent("GET", "/v2/{account}/domains", 200, 0.5, 100, 0, None))
+        collector(RequestEvent("GET", "/v2/{account}/domains", 429, 2.0, 10, 3, None))
+        collector(RequestEvent("GET", "/v2/{account}/domains", None, 0.1, None, None, OSError()))
+
+        metrics = collector.snapshot()["GET /v2/{account}/domains"]
+        self.assertEqual(metrics["count"], 3)
+        self.assertEqual(metrics["errors"], 2)
+        self.assertEqual(metrics["statuses"], {200: 1, 429: 1})
+        self.assertEqual(metrics["bytes"], 110)
+        self.assertEqual(metrics["retries"], 3)
+        self.assertEqual(metrics["latency"]["buckets"], [(1, 2), (float("inf"), 3)])
+
+        collector.reset()
+        self.assertEqual(collector.snapshot(), {})
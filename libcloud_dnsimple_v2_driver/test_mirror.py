@@ -0,0 +1,152 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import requests_mock
+
+from libcloud_dnsimple_v2_driver.dnsimple import DNSimpleV2DNSDriver
+from libcloud_dnsimple_v2_driver.mirror import DNSimpleV2Mirror
+from libcloud_dnsimple_v2_driver.test_dnsimple import get_fixture
+
+DNS_PARAMS_DNSIMPLE_V2 = ('user', 'key')
+
+
+@requests_mock.Mocker()
+class DNSimpleV2MirrorTests(unittest.TestCase):
+
+    def setUp(self):
+        self.driver = DNSimpleV2DNSDriver(*DNS_PARAMS_DNSIMPLE_V2)
+        self.mirror = DNSimpleV2Mirror(self.driver)
+
+    def tearDown(self):
+        self.mirror.close()
+
+    def set_mock_requests(self, m, domains=None):
+        domains = domains or get_fixture("list_domains")
+        m.get("https://api.dnsimple.com/v2/user/domains?per_page=100&page=1", json=domains)
+        for domain in domains["data"]:
+            m.get("https://api.dnsimple.com/v2/user/zones/{}/records?per_page=100&page=1".format(domain["name"]),
+                  json=get_fixture("list_records"))
+
+    def record_list_calls(self, m):
+        return len([request for request in m.request_history if "/records" in request.url])
+
+    def test_refresh(self, m):
+        self.set_mock_requests(m)
+
+        self.assertEqual(self.mirror.refresh(), {"zones": 2, "zones_refreshed": 2, "records": 10})
+        zones = self.mirror.list_zones()
+        self.assertEqual([zone.id for zone in zones], ["example-alpha.com", "example-beta.com"])
+        self.assertEqual(zones[0].extra["account_id"], 1010)
+        self.assertEqual(zones[0].driver, self.driver)
+
+        records = self.mirror.list_records(zones[0])
+        self.assertEqual([record.id for record in records], ["1", "69061", "2", "3", "4"])
+        self.assertEqual(records[0].extra["system_record"], True)
+        self.assertEqual(records[0].ttl, 3600)
+        self.assertEqual(len(self.mirror.list_all_records()), 10)
+
+    def test_reads_within_staleness_are_local(self, m):
+        self.set_mock_requests(m)
+
+        self.mirror.list_zones()
+        calls = m.call_count
+        zone = self.mirror.get_zone("example-alpha.com")
+        self.mirror.list_records(zone)
+        self.assertEqual(self.mirror.get_record("example-alpha.com", "69061").data, "ns1.dnsimple.com")
+        self.assertIsNone(self.mirror.get_record("example-alpha.com", "404"))
+        self.assertEqual(m.call_count, calls)
+
+    def test_incremental_refresh(self, m):
+        self.set_mock_requests(m)
+        self.mirror.refresh()
+
+        self.assertEqual(self.mirror.refresh(), {"zones": 2, "zones_refreshed": 0, "records": 0})
+        self.assertEqual(self.record_list_calls(m), 2)
+
+        domains = get_fixture("list_domains")
+        domains["data"][1]["updated_at"] = "2030-01-01T00:00:00Z"
+        self.set_mock_requests(m, domains)
+        self.assertEqual(self.mirror.refresh(), {"zones": 2, "zones_refreshed": 1, "records": 5})
+        self.assertEqual(self.record_list_calls(m), 3)
+
+    def test_refresh_removes_deleted_zones(self, m):
+        self.set_mock_requests(m)
+        self.mirror.refresh()
+
+        domains = get_fixture("list_domains")
+        domains["data"] = domains["data"][:1]
+        self.set_mock_requests(m, domains)
+        self.mirror.refresh()
+        self.assertIsNone(self.mirror.get_zone("example-beta.com"))
+        self.assertEqual(len(self.mirror.list_all_records()), 5)
+
+    def test_stale_reads_refresh(self, m):
+        self.set_mock_requests(m)
+        with mock.patch("libcloud_dnsimple_v2_driver.mirror.time.time", return_value=1000):
+            self.mirror.list_zones()
+        with mock.patch("libcloud_dnsimple_v2_driver.mirror.time.time", return_value=1000 + 301):
+            calls = m.call_count
+            self.mirror.list_zones()
+        self.assertEqual(m.call_count, calls + 1)
+
+    def test_record_change_without_updated_at(self, m):
+        self.set_mock_requests(m)
+        with mock.patch("libcloud_dnsimple_v2_driver.mirror.time.time", return_value=1000):
+            self.mirror.refresh()
+
+        records = get_fixture("list_records")
+        records["data"][1]["content"] = "ns9.dnsimple.com"
+        m.get("https://api.dnsimple.com/v2/user/zones/example-alpha.com/records?per_page=100&page=1", json=records)
+        # The zone list is refreshed but the records are younger than records_max_age
+        with mock.patch("libcloud_dnsimple_v2_driver.mirror.time.time", return_value=1000 + 301):
+            self.assertEqual(self.mirror.get_record("example-alpha.com", "69061").data, "ns1.dnsimple.com")
+        with mock.patch("libcloud_dnsimple_v2_driver.mirror.time.time", return_value=1000 + 3601):
+            self.assertEqual(self.mirror.get_record("example-alpha.com", "69061").data, "ns9.dnsimple.com")
+
+    def test_records_max_age_bounded_by_staleness(self, m):
+        self.set_mock_requests(m)
+        mirror = DNSimpleV2Mirror(self.driver, max_staleness=300, records_max_age=300)
+        with mock.patch("libcloud_dnsimple_v2_driver.mirror.time.time", return_value=1000):
+            mirror.refresh()
+
+        records = get_fixture("list_records")
+        records["data"][1]["content"] = "ns9.dnsimple.com"
+        m.get("https://api.dnsimple.com/v2/user/zones/example-alpha.com/records?per_page=100&page=1", json=records)
+        with mock.patch("libcloud_dnsimple_v2_driver.mirror.time.time", return_value=1000 + 301):
+            self.assertEqual(mirror.get_record("example-alpha.com", "69061").data, "ns9.dnsimple.com")
+        mirror.close()
+
+    def test_list_all_records_refreshes_once(self, m):
+        domains = get_fixture("list_domains")
+        domains["data"] = domains["data"][:1]
+        self.set_mock_requests(m, domains)
+        with mock.patch("libcloud_dnsimple_v2_driver.mirror.time.time", return_value=1000):
+            self.mirror.refresh()
+
+        # The mirror turns stale while the records are being read
+        self.set_mock_requests(m)
+        times = iter([1000 + 10])
+        with mock.patch("libcloud_dnsimple_v2_driver.mirror.time.time", side_effect=lambda: next(times, 1000 + 400)):
+            records = self.mirror.list_all_records()
+        self.assertEqual(len(records), 5)
+        self.assertEqual(set(record.zone.id for record in records), {"example-alpha.com"})
+
+    def test_persistent(self, m):
+        self.set_mock_requests(m)
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "mirror.sqlite")
+            mirror = DNSimpleV2Mirror(self.driver, path)
+            mirror.refresh()
+            mirror.close()
+
+            calls = m.call_count
+            mirror = DNSimpleV2Mirror(self.driver, path)
+            self.assertEqual(len(mirror.list_all_records()), 10)
+            self.assertEqual(m.call_count, calls)
+            mirror.close()
+        finally:
+            shutil.rmtree(directory)
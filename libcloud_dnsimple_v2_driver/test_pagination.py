@@ -0,0 +1,42 @@
+import unittest
+
+from libcloud_dnsimple_v2_driver.pagination import MAX_PAGE_SIZE, MIN_PAGE_SIZE, AdaptivePageSize
+
+
+class AdaptivePageSizeTests(unittest.TestCase):
+
+    def test_initial(self):
+        sizer = AdaptivePageSize(initial=50)
+        self.assertEqual(sizer.get("/v2/{account}/domains"), 50)
+
+    def test_latency(self):
+        sizer = AdaptivePageSize()
+        # 50ms round trip and 1ms per item: 450 items keep the round trip
+        # at 10% of the latency, which is more than the API allows
+        sizer.observe("records", 10, 0.05)
+        sizer.observe("records", 50, 0.1)
+        self.assertEqual(sizer.get("records"), MAX_PAGE_SIZE)
+
+        sizer = AdaptivePageSize()
+        sizer.observe("records", 10, 0.01)
+        sizer.observe("records", 100, 0.91)
+        self.assertEqual(sizer.get("records"), 10)
+
+    def test_max_page_bytes(self):
+        sizer = AdaptivePageSize(max_page_bytes=10000)
+        sizer.observe("records", 100, 0.05, size=40000)
+        self.assertEqual(sizer.get("records"), 25)
+
+        sizer.observe("records", 100, 0.05, size=400000)
+        self.assertEqual(sizer.get("records"), MIN_PAGE_SIZE)
+
+    def test_endpoints_are_separate(self):
+        sizer = AdaptivePageSize(max_page_bytes=10000)
+        sizer.observe("records", 100, 0.05, size=40000)
+        self.assertEqual(sizer.get("records"), 25)
+        self.assertEqual(sizer.get("domains"), MAX_PAGE_SIZE)
+
+    def test_empty_page(self):
+        sizer = AdaptivePageSize(initial=30)
+        sizer.observe("records", 0, 0.05, size=100)
+        self.assertEqual(sizer.get("records"), 30)
@@ -0,0 +1,120 @@
+import threading
+import unittest
+from unittest import mock
+
+import requests_mock
+
+from libcloud_dnsimple_v2_driver.connection import LibCloudRequest
+from libcloud_dnsimple_v2_driver.ratelimit import RateLimiter
+
+
+def rate_limit_headers(limit, remaining, reset):
+    return {
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(reset),
+    }
+
+
+@mock.patch("libcloud_dnsimple_v2_driver.ratelimit.time")
+class RateLimiterTests(unittest.TestCase):
+
+    def test_unknown_budget_does_not_wait(self, time_mock):
+        limiter = RateLimiter()
+
+        self.assertEqual(limiter.acquire(), 0)
+        time_mock.sleep.assert_not_called()
+
+    def test_takes_tokens(self, time_mock):
+        time_mock.time.return_value = 1000
+        limiter = RateLimiter()
+        limiter.update(rate_limit_headers(100, 2, 1060))
+
+        limiter.acquire()
+        limiter.acquire()
+        self.assertEqual(limiter.remaining, 0)
+        time_mock.sleep.assert_not_called()
+
+    def test_waits_for_reset_when_empty(self, time_mock):
+        time_mock.time.return_value = 1000
+        time_mock.sleep.side_effect = lambda delay: setattr(time_mock.time, "return_value", 1000 + delay)
+        limiter = RateLimiter()
+        limiter.update(rate_limit_headers(100, 0, 1060))
+
+        self.assertEqual(limiter.acquire(), 60)
+        self.assertEqual(limiter.remaining, 99)
+        self.assertEqual(limiter.stats["throttled"], 1)
+        self.assertEqual(limiter.stats["wait_time"], 60)
+
+    def test_paces_requests_over_window(self, time_mock):
+        time_mock.time.return_value = 1000
+        time_mock.sleep.side_effect = lambda delay: setattr(time_mock.time, "return_value",
+                                                            time_mock.time.return_value + delay)
+        limiter = RateLimiter()
+        limiter.update(rate_limit_headers(2400, 2400, 4600))
+
+        for _ in range(limiter.burst + 20):
+            limiter.acquire()
+        delays = [call[0][0] for call in time_mock.sleep.call_args_list]
+        self.assertEqual(len(delays), 20)
+        for delay in delays:
+            self.assertAlmostEqual(delay, 1.5, delta=0.01)
+        self.assertEqual(limiter.remaining, 2400 - limiter.burst - 20)
+
+    def test_update_keeps_lower_budget_within_window(self, time_mock):
+        time_mock.time.return_value = 1000
+        limiter = RateLimiter()
+        limiter.update(rate_limit_headers(100, 50, 1060))
+        limiter.update(rate_limit_headers(100, 70, 1060))
+        self.assertEqual(limiter.remaining, 50)
+
+        limiter.update(rate_limit_headers(100, 99, 4660))
+        self.assertEqual(limiter.remaining, 99)
+
+    def test_too_many_requests_empties_bucket(self, time_mock):
+        time_mock.time.return_value = 1000
+        limiter = RateLimiter()
+        limiter.update(rate_limit_headers(100, 10, 1060), status=429)
+        self.assertEqual(limiter.remaining, 0)
+
+        limiter.update({}, status=429)
+        time_mock.sleep.side_effect = lambda delay: setattr(time_mock.time, "return_value", 1000 + delay)
+        self.assertEqual(limiter.acquire(), limiter.fallback_delay)
+
+    def test_shared_per_account(self, time_mock):
+        limiter = RateLimiter.for_account("https://api.dnsimple.com", "token-a")
+
+        self.assertIs(RateLimiter.for_account("https://api.dnsimple.com", "token-a"), limiter)
+        self.assertIsNot(RateLimiter.for_account("https://api.dnsimple.com", "token-b"), limiter)
+
+    def test_concurrent_acquire_does_not_overdraw(self, time_mock):
+        time_mock.time.return_value = 1000
+        limiter = RateLimiter()
+        limiter.burst = 40
+        limiter.update(rate_limit_headers(100, 40, 1060))
+
+        threads = [threading.Thread(target=limiter.acquire) for _ in range(40)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(limiter.remaining, 0)
+        time_mock.sleep.assert_not_called()
+
+
+@requests_mock.Mocker()
+class ConnectionRateLimitTests(unittest.TestCase):
+
+    def test_connections_share_limiter(self, m):
+        m.get("https://api.example.com/json", json={}, headers=rate_limit_headers(2400, 2000, 4102444800))
+        connection = LibCloudRequest("user", "rate-limit-token", host="api.example.com")
+        other = LibCloudRequest("user", "rate-limit-token", host="api.example.com")
+
+        connection.request("/json")
+        self.assertIs(other.rate_limiter, connection.rate_limiter)
+        self.assertEqual(other.rate_limiter.stats["remaining"], 2000)
+        self.assertEqual(other.rate_limiter.stats["limit"], 2400)
+
+    def test_disabled(self, m):
+        connection = LibCloudRequest("user", "rate-limit-token", host="api.example.com", rate_limit=False)
+        self.assertIsNone(connection.rate_limiter)
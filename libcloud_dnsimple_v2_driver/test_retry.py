@@ -0,0 +1,95 @@
+import unittest
+from unittest import mock
+
+import requests
+import requests_mock
+
+from libcloud_dnsimple_v2_driver.connection import LibCloudRequest
+from libcloud_dnsimple_v2_driver.retry import RetryPolicy
+
+
+class RetryPolicyTests(unittest.TestCase):
+
+    def test_only_idempotent_methods(self):
+        policy = RetryPolicy(max_retries=2)
+
+        self.assertTrue(policy.can_retry("GET", 0))
+        self.assertTrue(policy.can_retry("put", 1))
+        self.assertTrue(policy.can_retry("DELETE", 1))
+        self.assertFalse(policy.can_retry("GET", 2))
+        self.assertFalse(policy.can_retry("POST", 0))
+        self.assertFalse(policy.can_retry("PATCH", 0))
+        self.assertFalse(policy.can_retry("POST", 0, 503))
+
+    def test_rate_limited_any_method(self):
+        policy = RetryPolicy(max_retries=2)
+
+        self.assertTrue(policy.can_retry("POST", 0, 429))
+        self.assertTrue(policy.can_retry("PATCH", 1, 429))
+        self.assertFalse(policy.can_retry("POST", 2, 429))
+
+    @mock.patch("libcloud_dnsimple_v2_driver.retry.random.uniform", side_effect=lambda low, high: high)
+    def test_exponential_delay(self, uniform):
+        policy = RetryPolicy(retry_delay=0.5, backoff=2)
+
+        self.assertEqual([policy.get_delay(attempt) for attempt in range(4)], [0.5, 1, 2, 4])
+        self.assertEqual(policy.get_delay(0, retry_after="10"), 10)
+        self.assertEqual(policy.get_delay(0, retry_after="Wed, 21 Oct 2015 07:28:00 GMT"), 0.5)
+
+    def test_jitter(self):
+        policy = RetryPolicy(retry_delay=1, backoff=2)
+
+        for _ in range(20):
+            self.assertTrue(0 <= policy.get_delay(2) <= 4)
+
+
+@requests_mock.Mocker()
+class ConnectionRetryTests(unittest.TestCase):
+    _test_url = "https://api.example.com/json"
+
+    def setUp(self):
+        self.connection = LibCloudRequest("user", "key", host="api.example.com", retry_delay=0, rate_limit=False)
+
+    def test_retries_server_errors(self, m):
+        m.get(self._test_url, [{"status_code": 502, "text": ""}, {"status_code": 500, "text": ""},
+                               {"json": {"ok": True}}])
+
+        response = self.connection.request("/json")
+        self.assertEqual(response.object, {"ok": True})
+        self.assertEqual(m.call_count, 3)
+        self.assertEqual(self.connection.retry_policy.stats["retries"], 2)
+
+    def test_retries_connection_errors(self, m):
+        m.delete(self._test_url, [{"exc": requests.ConnectionError}, {"status_code": 204}])
+
+        response = self.connection.request("/json", method="DELETE")
+        self.assertEqual(response.status, 204)
+
+    def test_gives_up(self, m):
+        m.get(self._test_url, status_code=503, text="")
+        self.connection.retry_policy.max_retries = 2
+
+        response = self.connection.request("/json")
+        self.assertEqual(response.status, 503)
+        self.assertEqual(m.call_count, 3)
+        self.assertEqual(self.connection.retry_policy.stats, {"retries": 2, "retried_requests": 1, "exhausted": 1})
+
+    def test_post_not_retried(self, m):
+        m.post(self._test_url, exc=requests.ConnectionError)
+
+        with self.assertRaises(requests.ConnectionError):
+            self.connection.request("/json", method="POST")
+        self.assertEqual(m.call_count, 1)
+
+    def test_rate_limited_post_retried(self, m):
+        m.post(self._test_url, [{"status_code": 429, "text": ""}, {"status_code": 201, "json": {"ok": True}}])
+
+        response = self.connection.request("/json", method="POST")
+        self.assertEqual(response.status, 201)
+        self.assertEqual(m.call_count, 2)
+
+    def test_client_errors_not_retried(self, m):
+        m.get(self._test_url, status_code=404, text="")
+
+        self.connection.request("/json")
+        self.assertEqual(m.call_count, 1)
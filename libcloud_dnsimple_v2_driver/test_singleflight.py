@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from libcloud_dnsimple_v2_driver.singleflight import AsyncSingleFlight, SingleFlight
+
+
+class SingleFlightTests(unittest.TestCase):
+
+    def _wait_for(self, single_flight, coalesced):
+        deadline = time.monotonic() + 5
+        while single_flight.coalesced < coalesced and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+    def test_concurrent_calls_share_result(self):
+        single_flight = SingleFlight()
+        calls = []
+
+        def func():
+            calls.append(threading.current_thread())
+            self._wait_for(single_flight, 3)
+            return object()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda _: single_flight.do("key", func), range(4)))
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(single_flight.stats, {"in_flight": 0, "coalesced": 3})
+
+    def test_concurrent_calls_share_error(self):
+        single_flight = SingleFlight()
+
+        def func():
+            self._wait_for(single_flight, 1)
+            raise ValueError("failed")
+
+        def call(_):
+            try:
+                single_flight.do("key", func)
+            except ValueError as error:
+                return error
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            errors = list(executor.map(call, range(2)))
+        self.assertIs(errors[0], errors[1])
+
+    def test_sequential_calls(self):
+        single_flight = SingleFlight()
+        self.assertEqual(single_flight.do("key", lambda: 1), 1)
+        self.assertEqual(single_flight.do("key", lambda: 2), 2)
+        self.assertEqual(single_flight.do("other", lambda: 3), 3)
+        self.assertEqual(single_flight.coalesced, 0)
+
+
+class AsyncSingleFlightTests(unittest.TestCase):
+
+    def test_concurrent_calls_share_result(self):
+        single_flight = AsyncSingleFlight()
+        calls = []
+
+        async def func():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return object()
+
+        async def run():
+            return await asyncio.gather(*[single_flight.do("key", func) for _ in range(3)])
+
+        results = asyncio.run(run())
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(single_flight.stats, {"in_flight": 0, "coalesced": 2})
+
+    def test_cancelled_waiter(self):
+        single_flight = AsyncSingleFlight()
+
+        async def func():
+            await asyncio.sleep(0.01)
+            return 1
+
+        async def run():
+            leader = asyncio.ensure_future(single_flight.do("key", func))
+            waiter = asyncio.ensure_future(single_flight.do("key", func))
+            await asyncio.sleep(0)
+            waiter.cancel()
+            return await leader
+
+        self.assertEqual(asyncio.run(run()), 1)
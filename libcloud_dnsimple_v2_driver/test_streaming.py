@@ -0,0 +1,96 @@
+import json
+import random
+import unittest
+
+from libcloud_dnsimple_v2_driver.streaming import StreamedPage
+
+
+def _chunks(body, size):
+    body = body.encode("utf-8")
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+class StreamedPageTests(unittest.TestCase):
+    document = {
+        "data": [{"id": i, "name": "wwww-{}".format(i), "content": "été ] , {"} for i in range(20)],
+        "pagination": {"current_page": 1, "total_pages": 2},
+    }
+
+    def test_items_and_tail(self):
+        body = json.dumps(self.document, indent=2)
+        for size in (1, 3, 7, 64, len(body)):
+            page = StreamedPage(_chunks(body, size))
+            self.assertEqual(list(page.get("data")), self.document["data"])
+            self.assertEqual(page.get("pagination"), self.document["pagination"])
+
+    def test_items_are_yielded_before_the_body_is_read(self):
+        chunks = iter(_chunks(json.dumps(self.document), 16))
+        page = StreamedPage(chunks)
+
+        self.assertEqual(next(page.get("data")), self.document["data"][0])
+        self.assertTrue(len(list(chunks)) > 0)
+
+    def test_tail_reads_remaining_items(self):
+        page = StreamedPage(_chunks(json.dumps(self.document), 10))
+        self.assertEqual(page.get("pagination"), self.document["pagination"])
+        self.assertEqual(page.get("missing", 1), 1)
+
+    def test_other_documents_are_parsed_whole(self):
+        document = {"pagination": {"current_page": 1}, "data": [1, 2]}
+        page = StreamedPage(_chunks(json.dumps(document), 4))
+        self.assertEqual(list(page.get("data")), [1, 2])
+        self.assertEqual(page.get("pagination"), {"current_page": 1})
+
+    def test_empty_data(self):
+        page = StreamedPage(_chunks('{"data": [], "pagination": null}', 5))
+        self.assertEqual(list(page.get("data")), [])
+        self.assertEqual(page.get("pagination"), None)
+
+    def test_scalars_split_between_chunks(self):
+        data = [12, -1.5e3, 0.25, 1E-2, True, False, None, "1.5", [1.5, 2], 300]
+        body = json.dumps({"data": data, "pagination": None})
+        for split in range(1, len(body)):
+            page = StreamedPage([body[:split].encode("utf-8"), body[split:].encode("utf-8")])
+            self.assertEqual(list(page.get("data")), data, split)
+
+    def test_random_chunks(self):
+        generator = random.Random(0)
+        for _ in range(200):
+            data = [
+                generator.choice([
+                    generator.randint(-10 ** 6, 10 ** 6),
+                    generator.uniform(-1e6, 1e6),
+                    generator.choice([True, False, None]),
+                    "x" * generator.randint(0, 5),
+                    {"id": generator.randint(0, 99)},
+                ])
+                for _ in range(generator.randint(0, 10))
+            ]
+            body = json.dumps({"data": data, "pagination": {"total_pages": 1}},
+                              indent=generator.choice([None, 1])).encode("utf-8")
+            chunks, position = [], 0
+            while position < len(body):
+                size = generator.randint(1, 8)
+                chunks.append(body[position:position + size])
+                position += size
+            page = StreamedPage(chunks)
+            self.assertEqual(list(page.get("data")), data, body)
+            self.assertEqual(page.get("pagination"), {"total_pages": 1})
+
+    def test_truncated_body(self):
+        page = StreamedPage(_chunks('{"data": [{"id": 1}, {"id"', 5))
+        with self.assertRaises(ValueError):
+            list(page.get("data"))
+
+    def test_on_close(self):
+        closed = []
+        page = StreamedPage(_chunks(json.dumps(self.document), 16), on_close=lambda: closed.append(True))
+        items = page.get("data")
+        next(items)
+        self.assertEqual(closed, [])
+        items.close()
+        self.assertEqual(closed, [True])
+
+        page = StreamedPage(_chunks(json.dumps(self.document), 16), on_close=lambda: closed.append(True))
+        list(page.get("data"))
+        self.assertEqual(closed, [True, True])
@@ -0,0 +1,49 @@
+import unittest
+
+from libcloud_dnsimple_v2_driver.zonefile import parse_ttl, parse_zone_file
+
+ZONE_FILE = """$ORIGIN example.com.
+$TTL 1h
+@   IN  SOA ns1.dnsimple.com. admin.dnsimple.com. (
+            1453132552 ; serial
+            86400 7200 604800 300 )
+    IN  NS  ns1.dnsimple.com.
+example.com. 3600 IN MX 10 mx
+www 600 IN A 192.0.2.1
+    IN 300 AAAA 2001:db8::1
+_sip._tcp IN SRV 10 60 5060 sip.example.com.
+txt IN TXT "v=spf1 -all; x" "and \\"more\\""
+$ORIGIN sub.example.com.
+api 1d CNAME www.example.com.
+other.org. 60 A 192.0.2.2
+"""
+
+
+class ZoneFileTests(unittest.TestCase):
+
+    def test_parse_ttl(self):
+        self.assertEqual(parse_ttl("300"), 300)
+        self.assertEqual(parse_ttl("1h30m"), 5400)
+        self.assertEqual(parse_ttl("1W"), 604800)
+        with self.assertRaises(ValueError):
+            parse_ttl("1x")
+
+    def test_parse_zone_file(self):
+        records = [(r["name"], r["type"], r["content"], r["ttl"], r["priority"])
+                   for r in parse_zone_file(ZONE_FILE, "example.com")]
+
+        self.assertEqual(records, [
+            ("", "SOA", "ns1.dnsimple.com admin.dnsimple.com 1453132552 86400 7200 604800 300", 3600, None),
+            ("", "NS", "ns1.dnsimple.com", 3600, None),
+            ("", "MX", "mx.example.com", 3600, 10),
+            ("www", "A", "192.0.2.1", 600, None),
+            ("www", "AAAA", "2001:db8::1", 300, None),
+            ("_sip._tcp", "SRV", "60 5060 sip.example.com", 3600, 10),
+            ("txt", "TXT", 'v=spf1 -all; xand "more"', 3600, None),
+            ("api.sub", "CNAME", "www.example.com", 86400, None),
+            ("other.org", "A", "192.0.2.2", 60, None),
+        ])
+
+    def test_record_without_type(self):
+        with self.assertRaises(ValueError):
+            list(parse_zone_file("www 300 IN\n", "example.com"))
@@ -0,0 +1,158 @@
+"""
+Parser for the BIND zone files returned by DNSimple's zone file endpoint.
+"""
+import re
+
+_TOKEN = re.compile(r'"(?:\\.|[^"\\])*"|;.*|[()]|[^\s();"]+')
+_TTL_UNIT = re.compile(r'(\d+)([smhdw]?)', re.IGNORECASE)
+_TTL_SECONDS = {'': 1, 's': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+CLASSES = ('IN', 'CH', 'HS', 'CS')
+
+# Types whose data is a single host name
+_HOST_TYPES = ('ALIAS', 'CNAME', 'NS', 'PTR')
+
+
+def parse_ttl(value):
+    """
+    Convert a TTL such as ``3600`` or ``1h30m`` to seconds.
+
+    :rtype: ``int``
+    """
+    if value.isdigit():
+        return int(value)
+    parts = _TTL_UNIT.findall(value)
+    if not parts or ''.join(number + unit for number, unit in parts) != value:
+        raise ValueError('Invalid TTL: {}'.format(value))
+    return sum(int(number) * _TTL_SECONDS[unit.lower()] for number, unit in parts)
+
+
+def _logical_lines(text):
+    """
+    Yield the tokens of every entry, joining lines wrapped in parentheses
+    and dropping comments. The flag tells whether the entry starts with
+    whitespace, i.e. repeats the previous owner name.
+    """
+    tokens = []
+    depth = 0
+    inherits_owner = False
+    for line in text.splitlines():
+        if depth == 0:
+            tokens = []
+            inherits_owner = line[:1] in (' ', '\t')
+        for token in _TOKEN.findall(line):
+            if token.startswith(';'):
+                break
+            if token == '(':
+                depth += 1
+            elif token == ')':
+                depth -= 1
+            else:
+                tokens.append(token)
+        if depth == 0 and tokens:
+            yield inherits_owner, tokens
+
+
+def _absolute(name, origin):
+    if name == '@':
+        return origin
+    if name.endswith('.'):
+        return name
+    return '{}.{}'.format(name, origin)
+
+
+def _unquote(token):
+    if len(token) > 1 and token.startswith('"') and token.endswith('"'):
+        return re.sub(r'\\(.)', r'\1', token[1:-1])
+    return token
+
+
+def parse_zone_file(text, origin):
+    """
+    Parse a BIND zone file into record ``dict`` items shaped like the ones
+    returned by the records API.
+
+    Names are made relative to ``origin`` (``''`` for the apex), host
+    names in the data lose their trailing dot and the priority of ``MX``
+    and ``SRV`` records is moved to ``priority``, as the API does. Zone
+    files carry no record IDs, so ``id`` is ``None``. ``$INCLUDE`` and
+    other directives besides ``$ORIGIN`` and ``$TTL`` are ignored.
+
+    :param text: Zone file contents.
+    :type text: ``str``
+
+    :param origin: Zone name.
+    :type origin: ``str``
+
+    :rtype: ``generator`` of ``dict``
+    """
+    zone = origin.rstrip('.') + '.'
+    origin = zone
+    default_ttl = None
+    owner = zone
+
+    for inherits_owner, tokens in _logical_lines(text):
+        directive = tokens[0].upper()
+        if directive == '$ORIGIN':
+            origin = _absolute(tokens[1], origin)
+            continue
+        if directive == '$TTL':
+            default_ttl = parse_ttl(tokens[1])
+            continue
+        if directive.startswith('$'):
+            continue
+
+        if not inherits_owner:
+            owner = _absolute(tokens.pop(0), origin)
+
+        # TTL and class may come in either order and are both optional
+        ttl = default_ttl
+        while tokens:
+            if tokens[0].upper() in CLASSES:
+                tokens.pop(0)
+            elif tokens[0][:1].isdigit():
+                ttl = parse_ttl(tokens.pop(0))
+            else:
+                break
+        if not tokens:
+            raise ValueError('Record without a type for {}'.format(owner))
+        type = tokens.pop(0).upper()
+        yield _to_data(owner, zone, origin, ttl, type, tokens)
+
+
+def _to_data(owner, zone, origin, ttl, type, rdata):
+    def host(name):
+        return _absolute(name, origin).rstrip('.')
+
+    if owner == zone:
+        name = ''
+    elif owner.endswith('.' + zone):
+        name = owner[:-len(zone) - 1]
+    else:
+        name = owner.rstrip('.')
+
+    priority = None
+    if type in _HOST_TYPES:
+        content = host(rdata[0])
+    elif type == 'MX':
+        priority = int(rdata[0])
+        content = host(rdata[1])
+    elif type == 'SRV':
+        priority = int(rdata[0])
+        content = ' '.join(rdata[1:3] + [host(rdata[3])])
+    elif type == 'SOA':
+        content = ' '.join([host(rdata[0]), host(rdata[1])] + rdata[2:])
+    elif type in ('TXT', 'SPF'):
+        content = ''.join(_unquote(token) for token in rdata)
+    else:
+        content = ' '.join(rdata)
+
+    return {
+        'id': None,
+        'zone_id': zone.rstrip('.'),
+        'name': name,
+        'type': type,
+        'content': content,
+        'ttl': ttl,
+        'priority': priority,
+    }
@@ -1,4 +1,4 @@
-from distutils.core import setup
+from setuptools import setup
 
 setup(
     name="libcloud-dnsimple-v2-driver",
@@ -9,7 +9,11 @@ setup(
     packages=["libcloud_dnsimple_v2_driver",],
     license="Apache License 2.0",
     long_description=open("README.md").read(),
+    python_requires=">=3.9",
     install_requires=[
         "apache-libcloud @ git+https://github.com/niteoweb/libcloud.git@niteoweb_internal_release",
     ],
+    extras_require={
+        "async": ["aiohttp"],
+    },
 )